@@ -1,7 +1,11 @@
 import numpy as np
-import random
 from typing import List, Tuple
-import matplotlib.pyplot as plt
+
+from graficos import nueva_figura, mostrar_o_guardar
+from instancia import InstanciaProblema
+from instrumentacion import SIN_INSTRUMENTACION
+from operadores import obtener_generador
+from restricciones import RESTRICCIONES_POR_DEFECTO, desviacion_conteos
 
 # ============================================
 # PARÁMETROS DEL PROBLEMA
@@ -10,6 +14,7 @@ import matplotlib.pyplot as plt
 NUM_ENFERMERAS = 10
 NUM_DIAS = 30  # Un mes
 NUM_TURNOS = 4  # 0=Libre, 1=Mañana, 2=Tarde, 3=Noche
+TIPO_GENES = np.uint8  # un byte por turno (empaquetar_genes los reduce a 2 bits)
 
 # Especialistas (índices de enfermeras con especialización)
 ESPECIALISTAS = [0, 1, 2]
@@ -22,6 +27,9 @@ PREFERENCIAS = {
     # ... puedes agregar más
 }
 
+# Instancia usada cuando no se indica otra (ejecución por consola)
+INSTANCIA_POR_DEFECTO = InstanciaProblema.crear(NUM_ENFERMERAS, NUM_DIAS, ESPECIALISTAS, PREFERENCIAS)
+
 # ============================================
 # CLASE CROMOSOMA (INDIVIDUO)
 # ============================================
@@ -29,20 +37,33 @@ PREFERENCIAS = {
 class Horario:
     """
     Representa un horario completo (cromosoma).
-    Matriz de [NUM_ENFERMERAS x NUM_DIAS] donde cada celda contiene el turno asignado.
+    Matriz de [num_enfermeras x num_dias] donde cada celda contiene el turno asignado.
+    Sin genes se inicializa al azar (con el generador `rng`) con las
+    dimensiones de `instancia`.
     """
-    def __init__(self, genes=None):
+    def __init__(self, genes=None, instancia: InstanciaProblema = None,
+                 rng: np.random.Generator = None):
         if genes is None:
             # Inicialización aleatoria
-            self.genes = np.random.randint(0, NUM_TURNOS, 
-                                          size=(NUM_ENFERMERAS, NUM_DIAS))
+            self.genes = obtener_generador(rng).integers(
+                0, NUM_TURNOS, size=(instancia.num_enfermeras, instancia.num_dias), dtype=TIPO_GENES
+            )
         else:
-            self.genes = genes.copy()
+            self.genes = np.array(genes, dtype=TIPO_GENES)
         
         self.aptitud = 0
         self.penalizacion_dura = 0
         self.penalizacion_blanda = 0
     
+    def empaquetar(self) -> bytes:
+        """Genes a 2 bits por turno (ver empaquetar_genes)"""
+        return empaquetar_genes(self.genes)
+    
+    @classmethod
+    def desempaquetar(cls, datos: bytes, forma: Tuple[int, int]) -> 'Horario':
+        """Reconstruye un horario (sin evaluar) a partir de Horario.empaquetar()"""
+        return cls(desempaquetar_genes(datos, forma))
+    
     def __str__(self):
         return f"Aptitud: {self.aptitud:.2f} (Duras: {self.penalizacion_dura}, Blandas: {self.penalizacion_blanda})"
 
@@ -51,11 +72,14 @@ class Horario:
 # FUNCIÓN DE APTITUD (FITNESS)
 # ============================================
 
-def calcular_aptitud(horario: Horario, guardar_detalles: bool = False) -> float:
+def calcular_aptitud(horario: Horario, instancia: InstanciaProblema,
+                     guardar_detalles: bool = False, instrumentacion=None) -> float:
     """
     Evalúa qué tan bueno es un horario.
     Menor penalización = mejor aptitud.
+    Con `instrumentacion` (ver instrumentacion.py) mide el tiempo de cada restricción.
     """
+    medir = (instrumentacion or SIN_INSTRUMENTACION).restriccion
     penalizacion_dura = 0
     penalizacion_blanda = 0
     
@@ -66,25 +90,29 @@ def calcular_aptitud(horario: Horario, guardar_detalles: bool = False) -> float:
     # --- RESTRICCIONES DURAS ---
     
     # 1. No trabajar Noche seguido de Mañana
-    pen, detalle = verificar_noche_manana(horario.genes, guardar_detalles)
+    with medir('noche_manana'):
+        pen, detalle = verificar_noche_manana(horario.genes, instancia, guardar_detalles)
     penalizacion_dura += pen
     if guardar_detalles and detalle:
         violaciones_duras['noche_manana'] = detalle
     
     # 2. No más de 6 días consecutivos trabajando
-    pen, detalle = verificar_dias_consecutivos(horario.genes, guardar_detalles)
+    with medir('dias_consecutivos'):
+        pen, detalle = verificar_dias_consecutivos(horario.genes, instancia, guardar_detalles)
     penalizacion_dura += pen
     if guardar_detalles and detalle:
         violaciones_duras['dias_consecutivos'] = detalle
     
     # 3. Mínimo 1 especialista por turno (excepto Libre)
-    pen, detalle = verificar_especialistas_por_turno(horario.genes, guardar_detalles)
+    with medir('especialistas'):
+        pen, detalle = verificar_especialistas_por_turno(horario.genes, instancia, guardar_detalles)
     penalizacion_dura += pen
     if guardar_detalles and detalle:
         violaciones_duras['especialistas'] = detalle
     
     # 4. Cobertura mínima por turno
-    pen, detalle = verificar_cobertura_minima(horario.genes, guardar_detalles)
+    with medir('cobertura'):
+        pen, detalle = verificar_cobertura_minima(horario.genes, instancia, guardar_detalles)
     penalizacion_dura += pen
     if guardar_detalles and detalle:
         violaciones_duras['cobertura'] = detalle
@@ -92,19 +120,22 @@ def calcular_aptitud(horario: Horario, guardar_detalles: bool = False) -> float:
     # --- RESTRICCIONES BLANDAS ---
     
     # 1. Preferencias personales
-    pen, detalle = verificar_preferencias(horario.genes, guardar_detalles)
+    with medir('preferencias'):
+        pen, detalle = verificar_preferencias(horario.genes, instancia, guardar_detalles)
     penalizacion_blanda += pen
     if guardar_detalles and detalle:
         violaciones_blandas['preferencias'] = detalle
     
     # 2. Equidad en la carga de trabajo
-    pen, detalle = verificar_equidad_turnos(horario.genes, guardar_detalles)
+    with medir('equidad'):
+        pen, detalle = verificar_equidad_turnos(horario.genes, instancia, guardar_detalles)
     penalizacion_blanda += pen
     if guardar_detalles and detalle:
         violaciones_blandas['equidad'] = detalle
     
     # 3. Distribución equilibrada de turnos nocturnos
-    pen, detalle = verificar_distribucion_noches(horario.genes, guardar_detalles)
+    with medir('noches'):
+        pen, detalle = verificar_distribucion_noches(horario.genes, instancia, guardar_detalles)
     penalizacion_blanda += pen
     if guardar_detalles and detalle:
         violaciones_blandas['noches'] = detalle
@@ -127,12 +158,13 @@ def calcular_aptitud(horario: Horario, guardar_detalles: bool = False) -> float:
 # FUNCIONES DE VERIFICACIÓN DE RESTRICCIONES
 # ============================================
 
-def verificar_noche_manana(genes: np.ndarray, guardar_detalles: bool = False):
+def verificar_noche_manana(genes: np.ndarray, instancia: InstanciaProblema,
+                           guardar_detalles: bool = False):
     """Penaliza si una enfermera trabaja Noche y al día siguiente Mañana."""
     penalizacion = 0
     violaciones = []
-    for enfermera in range(NUM_ENFERMERAS):
-        for dia in range(NUM_DIAS - 1):
+    for enfermera in range(instancia.num_enfermeras):
+        for dia in range(instancia.num_dias - 1):
             if genes[enfermera, dia] == 3 and genes[enfermera, dia + 1] == 1:
                 penalizacion += 50  # Penalización alta
                 if guardar_detalles:
@@ -140,14 +172,15 @@ def verificar_noche_manana(genes: np.ndarray, guardar_detalles: bool = False):
     return penalizacion, violaciones if guardar_detalles else None
 
 
-def verificar_dias_consecutivos(genes: np.ndarray, guardar_detalles: bool = False):
+def verificar_dias_consecutivos(genes: np.ndarray, instancia: InstanciaProblema,
+                                guardar_detalles: bool = False):
     """Penaliza si trabaja más de 6 días seguidos."""
     penalizacion = 0
     violaciones = []
-    for enfermera in range(NUM_ENFERMERAS):
+    for enfermera in range(instancia.num_enfermeras):
         dias_trabajados = 0
         max_consecutivos = 0
-        for dia in range(NUM_DIAS):
+        for dia in range(instancia.num_dias):
             if genes[enfermera, dia] != 0:  # No es día libre
                 dias_trabajados += 1
                 max_consecutivos = max(max_consecutivos, dias_trabajados)
@@ -160,15 +193,16 @@ def verificar_dias_consecutivos(genes: np.ndarray, guardar_detalles: bool = Fals
     return penalizacion, violaciones if guardar_detalles else None
 
 
-def verificar_especialistas_por_turno(genes: np.ndarray, guardar_detalles: bool = False):
+def verificar_especialistas_por_turno(genes: np.ndarray, instancia: InstanciaProblema,
+                                      guardar_detalles: bool = False):
     """Verifica que haya al menos 1 especialista en cada turno (Mañana, Tarde, Noche)."""
     penalizacion = 0
     violaciones = []
     turnos_nombres = {1: 'Mañana', 2: 'Tarde', 3: 'Noche'}
-    for dia in range(NUM_DIAS):
+    for dia in range(instancia.num_dias):
         for turno in [1, 2, 3]:  # Mañana, Tarde, Noche
             especialistas_en_turno = 0
-            for especialista in ESPECIALISTAS:
+            for especialista in instancia.especialistas:
                 if genes[especialista, dia] == turno:
                     especialistas_en_turno += 1
             
@@ -179,14 +213,15 @@ def verificar_especialistas_por_turno(genes: np.ndarray, guardar_detalles: bool
     return penalizacion, violaciones if guardar_detalles else None
 
 
-def verificar_cobertura_minima(genes: np.ndarray, guardar_detalles: bool = False):
+def verificar_cobertura_minima(genes: np.ndarray, instancia: InstanciaProblema,
+                               guardar_detalles: bool = False):
     """Asegura que cada turno tenga al menos 2 personas (excepto Libre)."""
     penalizacion = 0
     cobertura_minima = 2
     violaciones = []
     turnos_nombres = {1: 'Mañana', 2: 'Tarde', 3: 'Noche'}
     
-    for dia in range(NUM_DIAS):
+    for dia in range(instancia.num_dias):
         for turno in [1, 2, 3]:
             personal_en_turno = np.sum(genes[:, dia] == turno)
             if personal_en_turno < cobertura_minima:
@@ -197,11 +232,12 @@ def verificar_cobertura_minima(genes: np.ndarray, guardar_detalles: bool = False
     return penalizacion, violaciones if guardar_detalles else None
 
 
-def verificar_preferencias(genes: np.ndarray, guardar_detalles: bool = False):
+def verificar_preferencias(genes: np.ndarray, instancia: InstanciaProblema,
+                           guardar_detalles: bool = False):
     """Penaliza ligeramente si no se respetan preferencias personales."""
     penalizacion = 0
     violaciones = []
-    for enfermera, dias_preferidos in PREFERENCIAS.items():
+    for enfermera, dias_preferidos in instancia.preferencias:
         for dia in dias_preferidos:
             if genes[enfermera, dia] != 0:  # No está libre
                 penalizacion += 5
@@ -210,14 +246,15 @@ def verificar_preferencias(genes: np.ndarray, guardar_detalles: bool = False):
     return penalizacion, violaciones if guardar_detalles else None
 
 
-def verificar_equidad_turnos(genes: np.ndarray, guardar_detalles: bool = False):
+def verificar_equidad_turnos(genes: np.ndarray, instancia: InstanciaProblema,
+                             guardar_detalles: bool = False):
     """Penaliza si hay desequilibrio en días trabajados entre enfermeras."""
     dias_trabajados = []
-    for enfermera in range(NUM_ENFERMERAS):
+    for enfermera in range(instancia.num_enfermeras):
         dias = np.sum(genes[enfermera, :] != 0)
         dias_trabajados.append(dias)
     
-    desviacion_estandar = np.std(dias_trabajados)
+    desviacion_estandar = desviacion_conteos(dias_trabajados)
     penalizacion = int(desviacion_estandar * 3)
     
     detalle = None
@@ -230,15 +267,16 @@ def verificar_equidad_turnos(genes: np.ndarray, guardar_detalles: bool = False):
     return penalizacion, detalle
 
 
-def verificar_distribucion_noches(genes: np.ndarray, guardar_detalles: bool = False):
+def verificar_distribucion_noches(genes: np.ndarray, instancia: InstanciaProblema,
+                                  guardar_detalles: bool = False):
     """Verifica que los turnos nocturnos estén bien distribuidos."""
     noches_por_enfermera = []
     
-    for enfermera in range(NUM_ENFERMERAS):
+    for enfermera in range(instancia.num_enfermeras):
         noches = np.sum(genes[enfermera, :] == 3)
         noches_por_enfermera.append(noches)
     
-    desviacion = np.std(noches_por_enfermera)
+    desviacion = desviacion_conteos(noches_por_enfermera)
     penalizacion = int(desviacion * 5)
     
     detalle = None
@@ -252,68 +290,96 @@ def verificar_distribucion_noches(genes: np.ndarray, guardar_detalles: bool = Fa
 
 
 # ============================================
-# OPERADORES GENÉTICOS
+# REPRESENTACIÓN COMPACTA (2 BITS POR TURNO)
 # ============================================
 
-def crear_poblacion_inicial(tamanio: int) -> List[Horario]:
-    """Crea población inicial de horarios aleatorios."""
-    return [Horario() for _ in range(tamanio)]
-
-
-def seleccion_torneo(poblacion: List[Horario], k: int = 3) -> Horario:
+def empaquetar_genes(genes: np.ndarray) -> bytes:
     """
-    Selección por torneo: elige k individuos al azar y retorna el mejor.
+    Empaqueta una matriz de turnos (valores 0-3) a 2 bits por celda,
+    4 celdas por byte. La forma no se guarda: hay que conservarla aparte.
     """
-    torneo = random.sample(poblacion, k)
-    return max(torneo, key=lambda x: x.aptitud)
+    return empaquetar_poblacion(np.asarray(genes)[np.newaxis])[0].tobytes()
 
 
-def cruce_uniforme(padre1: Horario, padre2: Horario) -> Tuple[Horario, Horario]:
+def desempaquetar_genes(datos: bytes, forma: Tuple[int, ...]) -> np.ndarray:
+    """Inverso de empaquetar_genes: retorna una matriz uint8 con la forma indicada."""
+    return desempaquetar_poblacion(np.frombuffer(datos, dtype=np.uint8)[np.newaxis], forma)[0]
+
+
+def empaquetar_poblacion(genes: np.ndarray) -> np.ndarray:
     """
-    Cruce uniforme: cada gen tiene 50% de probabilidad de venir de cada padre.
+    Empaqueta cada horario de una población por separado:
+    (P, num_enfermeras, num_dias) -> (P, ceil(num_enfermeras * num_dias / 4)) uint8.
+    La fila i tiene los mismos bytes que empaquetar_genes(genes[i]).
     """
-    mascara = np.random.rand(NUM_ENFERMERAS, NUM_DIAS) > 0.5
-    
-    genes_hijo1 = np.where(mascara, padre1.genes, padre2.genes)
-    genes_hijo2 = np.where(mascara, padre2.genes, padre1.genes)
-    
-    return Horario(genes_hijo1), Horario(genes_hijo2)
+    planos = np.asarray(genes).reshape(len(genes), -1).astype(np.uint8, copy=False)
+    relleno = (-planos.shape[1]) % 4
+    if relleno:
+        planos = np.pad(planos, ((0, 0), (0, relleno)))
+    grupos = planos.reshape(len(planos), -1, 4)
+    return grupos[..., 0] | grupos[..., 1] << 2 | grupos[..., 2] << 4 | grupos[..., 3] << 6
 
 
-def cruce_un_punto(padre1: Horario, padre2: Horario) -> Tuple[Horario, Horario]:
-    """
-    Cruce de un punto: divide por una enfermera y combina.
+def desempaquetar_poblacion(empaquetado: np.ndarray, forma: Tuple[int, int]) -> np.ndarray:
+    """Inverso de empaquetar_poblacion: retorna (P, *forma) uint8."""
+    planos = np.stack([(empaquetado >> desplazamiento) & 0b11
+                       for desplazamiento in (0, 2, 4, 6)], axis=-1).reshape(len(empaquetado), -1)
+    return planos[:, :int(np.prod(forma))].reshape((len(empaquetado),) + tuple(forma))
+
+
+# ============================================
+# APTITUD VECTORIZADA (POBLACIÓN COMPLETA)
+# ============================================
+
+def calcular_penalizaciones_poblacion(genes: np.ndarray, instancia: InstanciaProblema,
+                                      instrumentacion=None) -> Tuple[np.ndarray, np.ndarray]:
     """
-    punto_corte = random.randint(1, NUM_ENFERMERAS - 1)
+    Evalúa toda la población en una sola pasada de NumPy.
     
-    genes_hijo1 = np.vstack([padre1.genes[:punto_corte], 
-                             padre2.genes[punto_corte:]])
-    genes_hijo2 = np.vstack([padre2.genes[:punto_corte], 
-                             padre1.genes[punto_corte:]])
+    Args:
+        genes: Arreglo (P, num_enfermeras, num_dias) con los turnos de cada
+            horario (también acepta un único horario 2D)
+        instancia: Problema al que pertenecen los horarios
+        instrumentacion: Si se indica, mide el tiempo de cada restricción
     
-    return Horario(genes_hijo1), Horario(genes_hijo2)
+    Returns:
+        Vectores (P,) de penalizaciones duras y blandas, idénticos a los que
+        produce calcular_aptitud horario por horario (las restricciones están
+        declaradas en restricciones.RESTRICCIONES_POR_DEFECTO)
+    """
+    return RESTRICCIONES_POR_DEFECTO(genes, instancia, instrumentacion)
 
 
-def mutacion(horario: Horario, prob_mutacion: float = 0.01):
-    """
-    Mutación: cambia aleatoriamente algunos turnos.
-    """
-    for enfermera in range(NUM_ENFERMERAS):
-        for dia in range(NUM_DIAS):
-            if random.random() < prob_mutacion:
-                horario.genes[enfermera, dia] = random.randint(0, NUM_TURNOS - 1)
+def aptitud_desde_penalizaciones(duras, blandas):
+    """Aptitud a partir de las penalizaciones (mayor es mejor), como en calcular_aptitud."""
+    return -(duras * 100 + blandas)
 
 
-def mutacion_inteligente(horario: Horario, prob_mutacion: float = 0.05):
+def evaluar_poblacion(poblacion: List[Horario], instancia: InstanciaProblema,
+                      evaluador=None) -> np.ndarray:
     """
-    Mutación que intenta mejorar violaciones específicas.
+    Calcula la aptitud de todos los horarios con el evaluador vectorizado y
+    la guarda en cada Horario, igual que calcular_aptitud.
+    
+    Args:
+        poblacion: Horarios a evaluar
+        instancia: Problema al que pertenecen los horarios
+        evaluador: Función (genes, instancia) -> (duras, blandas); por defecto
+            calcular_penalizaciones_poblacion (p. ej. un EvaluadorParalelo)
     """
-    if random.random() < prob_mutacion:
-        # Intenta arreglar turno Noche-Mañana
-        for enfermera in range(NUM_ENFERMERAS):
-            for dia in range(NUM_DIAS - 1):
-                if horario.genes[enfermera, dia] == 3 and horario.genes[enfermera, dia + 1] == 1:
-                    horario.genes[enfermera, dia + 1] = random.choice([0, 2, 3])
+    if not poblacion:
+        return np.empty(0)
+    
+    evaluador = evaluador or calcular_penalizaciones_poblacion
+    duras, blandas = evaluador(np.stack([h.genes for h in poblacion]), instancia)
+    aptitudes = aptitud_desde_penalizaciones(duras, blandas)
+    
+    for horario, dura, blanda, aptitud in zip(poblacion, duras, blandas, aptitudes):
+        horario.penalizacion_dura = int(dura)
+        horario.penalizacion_blanda = int(blanda)
+        horario.aptitud = int(aptitud)
+    
+    return aptitudes
 
 
 # ============================================
@@ -324,91 +390,159 @@ def algoritmo_genetico(
     tamanio_poblacion: int = 100,
     num_generaciones: int = 500,
     prob_mutacion: float = 0.02,
-    elitismo: int = 2
+    elitismo: int = 2,
+    num_procesos: int = 1,
+    instancia: InstanciaProblema = None,
+    tamanio_cache: int = 0,
+    semilla: int = None,
+    evaluador=None,
+    mostrar_progreso: bool = True,
+    instrumentacion=None,
+    fraccion_voraz: float = 0.0,
+    busqueda_local: int = 0,
+    tiempo_maximo: float = None,
+    max_evaluaciones: int = None,
+    paciencia: int = None,
+    graficar: bool = None,
+    archivo_grafico: str = None,
+    dias_ventana: int = None,
+    solape: int = 7
 ) -> Horario:
     """
-    Ejecuta el algoritmo genético para encontrar el mejor horario.
+    Ejecuta el algoritmo genético para encontrar el mejor horario
+    (con solucionador.Solucionador y las restricciones por defecto).
     
     Args:
         tamanio_poblacion: Número de individuos por generación
         num_generaciones: Número de iteraciones
         prob_mutacion: Probabilidad de mutación por gen
         elitismo: Número de mejores individuos que pasan directamente
+        num_procesos: Procesos para evaluar la aptitud en paralelo (1 = serial)
+        instancia: Problema a resolver (por defecto INSTANCIA_POR_DEFECTO)
+        tamanio_cache: Horarios cuya aptitud se recuerda para no reevaluar
+            copias idénticas (0 = sin caché)
+        semilla: Semilla del generador de la ejecución; con la misma semilla
+            y parámetros el resultado es idéntico (None = al azar)
+        evaluador: Función (genes, instancia) -> (duras, blandas) que
+            reemplaza al evaluador vectorizado (p. ej. para medir); con
+            num_procesos > 1 se reparte entre los procesos
+        mostrar_progreso: Imprimir el avance
+        instrumentacion: Instrumentacion donde registrar el tiempo de cada
+            fase y restricción (ver instrumentacion.py); None = sin medir
+        fraccion_voraz: Fracción de la población inicial construida de forma
+            voraz respetando las restricciones (0 = toda al azar)
+        busqueda_local: Mejores individuos que se mejoran con búsqueda local
+            en cada generación (0 = AG sin etapa memética)
+        tiempo_maximo: Segundos tras los que se termina (None = sin límite)
+        max_evaluaciones: Horarios evaluados tras los que se termina
+        paciencia: Generaciones seguidas sin mejora tras las que se termina
+        graficar: Graficar la evolución (None = si mostrar_progreso o si se
+            indica archivo_grafico)
+        archivo_grafico: Guardar el gráfico en este archivo (.png, .svg, ...)
+            en lugar de mostrarlo en una ventana
+        dias_ventana: Resolver el horizonte por ventanas de estos días que se
+            solapan `solape` días (ver horizonte.py; None = todo junto).
+            Cada ventana usa num_generaciones y los criterios de parada; no
+            usa num_procesos, tamanio_cache ni evaluador, ni grafica
+        solape: Días que se vuelven a optimizar en la ventana siguiente
     
     Returns:
-        Mejor horario encontrado
+        Mejor horario encontrado, con el motivo de parada en `motivo_parada`
     """
-    # Crear población inicial
-    poblacion = crear_poblacion_inicial(tamanio_poblacion)
-    
-    # Evaluar población inicial
-    for individuo in poblacion:
-        calcular_aptitud(individuo)
+    # Import local: solucionador depende de este módulo
+    from solucionador import Solucionador, EstrategiaGenetica, BusquedaLocal, CriteriosParada
     
-    # Estadísticas para graficar
-    mejor_aptitud_por_gen = []
-    promedio_aptitud_por_gen = []
+    instancia = instancia or INSTANCIA_POR_DEFECTO
+    estrategia = EstrategiaGenetica(prob_mutacion=prob_mutacion, elitismo=elitismo,
+                                    fraccion_voraz=fraccion_voraz)
     
-    print("Generación | Mejor Aptitud | Pen. Duras | Pen. Blandas")
-    print("-" * 60)
+    if dias_ventana is not None:
+        return _algoritmo_por_ventanas(instancia, estrategia, dias_ventana, solape, tamanio_poblacion,
+                                       num_generaciones, semilla, mostrar_progreso, instrumentacion,
+                                       BusquedaLocal(mejores=busqueda_local) if busqueda_local > 0 else None,
+                                       CriteriosParada(tiempo_maximo, max_evaluaciones, paciencia))
     
-    for generacion in range(num_generaciones):
-        # Ordenar por aptitud
-        poblacion.sort(key=lambda x: x.aptitud, reverse=True)
-        
-        mejor = poblacion[0]
-        promedio = np.mean([ind.aptitud for ind in poblacion])
-        
-        mejor_aptitud_por_gen.append(mejor.aptitud)
-        promedio_aptitud_por_gen.append(promedio)
-        
+    def mostrar(generacion, genes, duras, blandas, aptitudes):
         # Mostrar progreso cada 50 generaciones
         if generacion % 50 == 0:
-            print(f"{generacion:10d} | {mejor.aptitud:13.2f} | {mejor.penalizacion_dura:10d} | {mejor.penalizacion_blanda:12d}")
-        
-        # Condición de parada: solución perfecta (sin penalizaciones duras)
-        if mejor.penalizacion_dura == 0 and mejor.penalizacion_blanda < 20:
-            print(f"\n¡Solución óptima encontrada en generación {generacion}!")
-            break
+            print(f"{generacion:10d} | {aptitudes[0]:13.2f} | {duras[0]:10d} | {blandas[0]:12d}")
+    
+    if mostrar_progreso:
+        print("Generación | Mejor Aptitud | Pen. Duras | Pen. Blandas")
+        print("-" * 60)
+    
+    with Solucionador(instancia, estrategia=estrategia, num_procesos=num_procesos,
+                      tamanio_cache=tamanio_cache, evaluador=evaluador,
+                      instrumentacion=instrumentacion,
+                      busqueda_local=BusquedaLocal(mejores=busqueda_local) if busqueda_local > 0 else None
+                      ) as solucionador:
+        resultado = solucionador.resolver(tamanio_poblacion, num_generaciones,
+                                          np.random.default_rng(semilla),
+                                          al_generar=mostrar if mostrar_progreso else None,
+                                          parada=CriteriosParada(tiempo_maximo, max_evaluaciones, paciencia))
+    
+    # Resultado final (la población viene ordenada: la mejor primero)
+    mejor_solucion = Horario(resultado.genes[0])
+    mejor_solucion.penalizacion_dura = int(resultado.duras[0])
+    mejor_solucion.penalizacion_blanda = int(resultado.blandas[0])
+    mejor_solucion.aptitud = int(resultado.aptitudes[0])
+    mejor_solucion.motivo_parada = resultado.motivo_parada
+    
+    if mostrar_progreso:
+        if resultado.motivo_parada == 'solucion_optima':
+            print(f"\n¡Solución óptima encontrada en generación {resultado.generaciones - 1}!")
+        elif resultado.motivo_parada != 'generaciones':
+            print(f"\nDetenido en generación {resultado.generaciones - 1} ({resultado.motivo_parada}): "
+                  f"{resultado.evaluaciones} evaluaciones en {resultado.segundos:.1f} s")
         
-        # Nueva generación
-        nueva_poblacion = poblacion[:elitismo]  # Elitismo
+        if solucionador.cache is not None:
+            metricas = solucionador.cache.metricas()
+            print(f"Caché de aptitud: {metricas['aciertos']} aciertos, {metricas['fallos']} fallos "
+                  f"({metricas['tasa_aciertos']:.1%}), {metricas['expulsiones_lru']} expulsiones")
         
-        while len(nueva_poblacion) < tamanio_poblacion:
-            # Selección
-            padre1 = seleccion_torneo(poblacion)
-            padre2 = seleccion_torneo(poblacion)
-            
-            # Cruce
-            if random.random() < 0.8:  # 80% probabilidad de cruce
-                hijo1, hijo2 = cruce_uniforme(padre1, padre2)
-            else:
-                hijo1, hijo2 = Horario(padre1.genes), Horario(padre2.genes)
-            
-            # Mutación
-            mutacion(hijo1, prob_mutacion)
-            mutacion_inteligente(hijo1, 0.05)
-            mutacion(hijo2, prob_mutacion)
-            mutacion_inteligente(hijo2, 0.05)
-            
-            # Evaluar hijos
-            calcular_aptitud(hijo1)
-            calcular_aptitud(hijo2)
-            
-            nueva_poblacion.extend([hijo1, hijo2])
-        
-        poblacion = nueva_poblacion[:tamanio_poblacion]
-    
-    # Resultado final
-    poblacion.sort(key=lambda x: x.aptitud, reverse=True)
-    mejor_solucion = poblacion[0]
-    
-    print("\n" + "=" * 60)
-    print("MEJOR SOLUCIÓN ENCONTRADA:")
-    print(mejor_solucion)
+        print("\n" + "=" * 60)
+        print("MEJOR SOLUCIÓN ENCONTRADA:")
+        print(mejor_solucion)
     
     # Graficar evolución
-    graficar_evolucion(mejor_aptitud_por_gen, promedio_aptitud_por_gen)
+    if graficar is None:
+        graficar = mostrar_progreso or archivo_grafico is not None
+    if graficar:
+        graficar_evolucion(resultado.mejor_aptitud_por_gen, resultado.promedio_aptitud_por_gen,
+                           archivo_grafico)
+    
+    return mejor_solucion
+
+
+def _algoritmo_por_ventanas(instancia, estrategia, dias_ventana, solape, tamanio_poblacion,
+                            num_generaciones, semilla, mostrar_progreso, instrumentacion,
+                            busqueda_local, parada) -> Horario:
+    """algoritmo_genetico con horizonte rodante (horizonte.resolver_por_ventanas)"""
+    # Import local: horizonte depende de solucionador, que depende de este módulo
+    from horizonte import resolver_por_ventanas
+    
+    def mostrar(ventana):
+        print(f"Días {ventana['inicio'] + 1:4d}-{ventana['fin']:<4d} | {ventana['generaciones']:5d} gen "
+              f"| Pen. Duras {ventana['penalizacion_dura']:8.0f} | Pen. Blandas {ventana['penalizacion_blanda']:8.0f} "
+              f"| {ventana['segundos']:.2f}s")
+    
+    resultado = resolver_por_ventanas(instancia, estrategia=estrategia, dias_ventana=dias_ventana,
+                                      solape=solape, tamanio_poblacion=tamanio_poblacion,
+                                      num_generaciones=num_generaciones, rng=np.random.default_rng(semilla),
+                                      busqueda_local=busqueda_local, parada=parada,
+                                      instrumentacion=instrumentacion,
+                                      al_terminar_ventana=mostrar if mostrar_progreso else None)
+    
+    mejor_solucion = Horario(resultado.genes)
+    mejor_solucion.penalizacion_dura = int(resultado.dura)
+    mejor_solucion.penalizacion_blanda = int(resultado.blanda)
+    mejor_solucion.aptitud = int(resultado.aptitud)
+    mejor_solucion.motivo_parada = resultado.motivo_parada
+    
+    if mostrar_progreso:
+        print("\n" + "=" * 60)
+        print(f"MEJOR SOLUCIÓN ENCONTRADA ({len(resultado.ventanas)} ventanas):")
+        print(mejor_solucion)
     
     return mejor_solucion
 
@@ -417,33 +551,35 @@ def algoritmo_genetico(
 # VISUALIZACIÓN
 # ============================================
 
-def graficar_evolucion(mejor_aptitud: List[float], promedio_aptitud: List[float]):
-    """Grafica la evolución de la aptitud."""
-    plt.figure(figsize=(10, 6))
-    plt.plot(mejor_aptitud, label='Mejor Aptitud', linewidth=2)
-    plt.plot(promedio_aptitud, label='Aptitud Promedio', alpha=0.7)
-    plt.xlabel('Generación')
-    plt.ylabel('Aptitud')
-    plt.title('Evolución del Algoritmo Genético')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.show()
+def graficar_evolucion(mejor_aptitud: List[float], promedio_aptitud: List[float],
+                       archivo: str = None):
+    """Grafica la evolución de la aptitud (en `archivo` si se indica)."""
+    figura, ejes = nueva_figura(archivo)
+    ejes.plot(mejor_aptitud, label='Mejor Aptitud', linewidth=2)
+    ejes.plot(promedio_aptitud, label='Aptitud Promedio', alpha=0.7)
+    ejes.set_xlabel('Generación')
+    ejes.set_ylabel('Aptitud')
+    ejes.set_title('Evolución del Algoritmo Genético')
+    ejes.legend()
+    ejes.grid(True, alpha=0.3)
+    mostrar_o_guardar(figura, archivo)
 
 
 def mostrar_horario(horario: Horario):
     """Muestra el horario en formato legible."""
     turnos_nombres = {0: 'Libre', 1: 'Mañana', 2: 'Tarde', 3: 'Noche'}
+    num_enfermeras, num_dias = horario.genes.shape
     
     print("\nHORARIO GENERADO:")
     print("Enfermera | ", end="")
-    for dia in range(min(14, NUM_DIAS)):  # Mostrar solo 2 semanas
+    for dia in range(min(14, num_dias)):  # Mostrar solo 2 semanas
         print(f"D{dia+1:2d} ", end="")
     print()
     print("-" * 80)
     
-    for enfermera in range(NUM_ENFERMERAS):
+    for enfermera in range(num_enfermeras):
         print(f"E{enfermera+1:2d}      | ", end="")
-        for dia in range(min(14, NUM_DIAS)):
+        for dia in range(min(14, num_dias)):
             turno = horario.genes[enfermera, dia]
             print(f"{turnos_nombres[turno][0]:3s} ", end="")
         print()
@@ -0,0 +1,243 @@
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict
+
+import numpy as np
+
+from algoritmo_genetico import empaquetar_genes, desempaquetar_genes
+
+# ============================================
+# ALMACENES CON EXPIRACIÓN (LRU + TTL)
+# ============================================
+
+_AUSENTE = object()
+
+
+class Almacen(ABC):
+    """
+    Interfaz común de los almacenes: guardar/obtener/eliminar/metricas más
+    acceso tipo diccionario. Tienen un tamaño máximo (descartan lo usado hace
+    más tiempo) y expiración por inactividad: cada lectura o escritura renueva
+    el plazo de `ttl` segundos.
+    """
+
+    def __init__(self, max_elementos: int, ttl: float):
+        self.max_elementos = max_elementos
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._contadores = {'aciertos': 0, 'fallos': 0, 'expulsiones_lru': 0, 'expulsiones_ttl': 0}
+
+    @abstractmethod
+    def guardar(self, clave: str, valor: Any):
+        ...
+
+    @abstractmethod
+    def obtener(self, clave: str, defecto: Any = None) -> Any:
+        ...
+
+    @abstractmethod
+    def eliminar(self, clave: str):
+        ...
+
+    @abstractmethod
+    def metricas(self) -> Dict[str, int]:
+        ...
+
+    def get(self, clave: str, defecto: Any = None) -> Any:
+        return self.obtener(clave, defecto)
+
+    def __getitem__(self, clave: str) -> Any:
+        valor = self.obtener(clave, _AUSENTE)
+        if valor is _AUSENTE:
+            raise KeyError(clave)
+        return valor
+
+    def __setitem__(self, clave: str, valor: Any):
+        self.guardar(clave, valor)
+
+    def __delitem__(self, clave: str):
+        self.eliminar(clave)
+
+
+class AlmacenMemoria(Almacen):
+    """Almacén en memoria (OrderedDict), seguro para usar desde varios hilos."""
+
+    def __init__(self, max_elementos: int = 1000, ttl: float = 3600):
+        super().__init__(max_elementos, ttl)
+        self._datos = OrderedDict()  # clave -> (valor, ultimo_acceso)
+
+    def guardar(self, clave: str, valor: Any):
+        with self._lock:
+            self._datos[clave] = (valor, time.monotonic())
+            self._datos.move_to_end(clave)
+            self._purgar()
+
+    def obtener(self, clave: str, defecto: Any = None) -> Any:
+        with self._lock:
+            self._purgar()
+            if clave not in self._datos:
+                self._contadores['fallos'] += 1
+                return defecto
+            valor, _ = self._datos[clave]
+            self._datos[clave] = (valor, time.monotonic())
+            self._datos.move_to_end(clave)
+            self._contadores['aciertos'] += 1
+            return valor
+
+    def eliminar(self, clave: str):
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def metricas(self) -> Dict[str, int]:
+        with self._lock:
+            self._purgar()
+            return dict(self._contadores, elementos=len(self._datos))
+
+    def _purgar(self):
+        """Descarta lo expirado y lo que exceda el tamaño máximo (con el lock tomado)."""
+        limite = time.monotonic() - self.ttl
+        # El OrderedDict está ordenado por último acceso: los expirados van primero
+        while self._datos:
+            clave, (_, ultimo_acceso) = next(iter(self._datos.items()))
+            if ultimo_acceso >= limite:
+                break
+            del self._datos[clave]
+            self._contadores['expulsiones_ttl'] += 1
+        while len(self._datos) > self.max_elementos:
+            self._datos.popitem(last=False)
+            self._contadores['expulsiones_lru'] += 1
+
+    def __contains__(self, clave: str) -> bool:
+        with self._lock:
+            self._purgar()
+            return clave in self._datos
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._purgar()
+            return len(self._datos)
+
+
+class AlmacenSQLite(Almacen):
+    """
+    Almacén persistido en un archivo SQLite, de modo que los datos
+    sobreviven a un reinicio del servidor. Los valores se serializan con
+    pickle (el archivo es local y solo lo escribe el servidor).
+    """
+
+    def __init__(self, ruta: str, max_elementos: int = 10000, ttl: float = 24 * 3600):
+        super().__init__(max_elementos, ttl)
+        self.ruta = ruta
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        with self._conexion:
+            self._conexion.execute(
+                'CREATE TABLE IF NOT EXISTS almacen ('
+                'clave TEXT PRIMARY KEY, valor BLOB NOT NULL, ultimo_acceso REAL NOT NULL)'
+            )
+            self._conexion.execute(
+                'CREATE INDEX IF NOT EXISTS almacen_acceso ON almacen (ultimo_acceso)'
+            )
+
+    def guardar(self, clave: str, valor: Any):
+        datos = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._conexion:
+            self._conexion.execute(
+                'INSERT OR REPLACE INTO almacen (clave, valor, ultimo_acceso) VALUES (?, ?, ?)',
+                (clave, datos, time.time())
+            )
+            self._purgar()
+
+    def obtener(self, clave: str, defecto: Any = None) -> Any:
+        with self._lock, self._conexion:
+            self._purgar()
+            fila = self._conexion.execute(
+                'SELECT valor FROM almacen WHERE clave = ?', (clave,)
+            ).fetchone()
+            if fila is None:
+                self._contadores['fallos'] += 1
+                return defecto
+            self._conexion.execute(
+                'UPDATE almacen SET ultimo_acceso = ? WHERE clave = ?', (time.time(), clave)
+            )
+            self._contadores['aciertos'] += 1
+        return pickle.loads(fila[0])
+
+    def eliminar(self, clave: str):
+        with self._lock, self._conexion:
+            self._conexion.execute('DELETE FROM almacen WHERE clave = ?', (clave,))
+
+    def metricas(self) -> Dict[str, int]:
+        with self._lock, self._conexion:
+            self._purgar()
+            return dict(self._contadores, elementos=self._contar())
+
+    def _contar(self) -> int:
+        return self._conexion.execute('SELECT COUNT(*) FROM almacen').fetchone()[0]
+
+    def _purgar(self):
+        cursor = self._conexion.execute(
+            'DELETE FROM almacen WHERE ultimo_acceso < ?', (time.time() - self.ttl,)
+        )
+        self._contadores['expulsiones_ttl'] += cursor.rowcount
+        exceso = self._contar() - self.max_elementos
+        if exceso > 0:
+            self._conexion.execute(
+                'DELETE FROM almacen WHERE clave IN '
+                '(SELECT clave FROM almacen ORDER BY ultimo_acceso LIMIT ?)', (exceso,)
+            )
+            self._contadores['expulsiones_lru'] += exceso
+
+    def __contains__(self, clave: str) -> bool:
+        with self._lock, self._conexion:
+            self._purgar()
+            return self._conexion.execute(
+                'SELECT 1 FROM almacen WHERE clave = ?', (clave,)
+            ).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock, self._conexion:
+            self._purgar()
+            return self._contar()
+
+
+def crear_almacen(configuracion: str, max_elementos: int, ttl: float) -> Almacen:
+    """
+    Crea un almacén a partir de una cadena de configuración:
+    'memoria' (por defecto) o 'sqlite:<ruta del archivo>'.
+    """
+    if configuracion.startswith('sqlite:'):
+        return AlmacenSQLite(configuracion[len('sqlite:'):], max_elementos, ttl)
+    if configuracion not in ('', 'memoria'):
+        raise ValueError(f"Almacén desconocido: {configuracion}")
+    return AlmacenMemoria(max_elementos, ttl)
+
+
+# ============================================
+# FORMATO COMPACTO DE RESULTADOS
+# ============================================
+
+def compactar_resultado(resultado: Dict) -> Dict:
+    """
+    Reduce el tamaño de un resultado del AG para almacenarlo: el horario se
+    empaqueta a 2 bits por turno y la evolución de la aptitud pasa a un arreglo.
+    """
+    compacto = dict(resultado)
+    horario = np.asarray(compacto.pop('horario'), dtype=np.uint8)
+    compacto['horario_empaquetado'] = empaquetar_genes(horario)
+    compacto['forma_horario'] = horario.shape
+    compacto['evoluciones'] = np.asarray(resultado['evoluciones'], dtype=np.float64)
+    return compacto
+
+
+def expandir_resultado(compacto: Dict) -> Dict:
+    """Inverso de compactar_resultado."""
+    resultado = dict(compacto)
+    resultado['horario'] = desempaquetar_genes(
+        resultado.pop('horario_empaquetado'), resultado.pop('forma_horario')
+    ).tolist()
+    resultado['evoluciones'] = resultado['evoluciones'].tolist()
+    return resultado
@@ -1,5 +1,15 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, render_template, request, jsonify, session, stream_with_context
 from algoritmo_genetico import *
+from instrumentacion import Instrumentacion, RegistroMetricas
+from solucionador import Solucionador, BusquedaLocal, CriteriosParada, MOTORES
+from replanificacion import congelar, replanificar
+from exacto import resolver_exacto, es_instancia_pequena, sembrar_poblacion, cpsat_disponible
+from planificador import PlanificadorTrabajos, ColaLlena, ERROR_CANCELADO
+from almacen import AlmacenMemoria, crear_almacen, compactar_resultado, expandir_resultado
+import json
+import math
+import os
+from dataclasses import replace
 import threading
 import uuid
 import time
@@ -7,14 +17,52 @@ import time
 app = Flask(__name__)
 app.secret_key = 'tu_clave_secreta_aqui_12345'
 
-# Diccionario para almacenar el progreso de cada sesión
-progreso_sesiones = {}
-resultados_sesiones = {}
+# Límites del planificador de ejecuciones
+MAX_PROCESOS_AG = int(os.environ.get('AG_MAX_PROCESOS', os.cpu_count() or 2))
+# Procesos de evaluación (y trabajadores de CP-SAT) por ejecución: por defecto se reparten
+# los núcleos entre las ejecuciones simultáneas para no lanzar MAX_PROCESOS_AG² procesos
+MAX_PROCESOS_POR_TRABAJO = int(os.environ.get('AG_PROCESOS_POR_TRABAJO',
+                                              max(1, (os.cpu_count() or 2) // MAX_PROCESOS_AG)))
+MAX_EN_COLA_AG = int(os.environ.get('AG_MAX_EN_COLA', 16))
+TIEMPO_LIMITE_AG = float(os.environ.get('AG_TIEMPO_LIMITE', 300))  # segundos por ejecución
+# Motivos de parada (de debe_detenerse) con que una ejecución termina como 'cancelado'
+MOTIVOS_CANCELACION = ('cancelado', 'tiempo_limite')
+
+# Progreso en vivo (Server-Sent Events)
+INTERVALO_REPORTE = 0.25      # segundos máximos sin informar si la mejor solución no cambia
+INTERVALO_MIN_EVENTOS = 0.1   # segundos mínimos entre eventos enviados al navegador
+INTERVALO_LATIDO = 15         # segundos entre comentarios que mantienen viva la conexión
+
+# Almacenes de progreso y resultados de cada sesión (con expiración)
+# AG_ALMACEN: 'memoria' o 'sqlite:<archivo>' para que los resultados sobrevivan a un reinicio
+progreso_sesiones = AlmacenMemoria(
+    max_elementos=int(os.environ.get('AG_MAX_SESIONES', 1000)),
+    ttl=float(os.environ.get('AG_TTL_PROGRESO', 3600))
+)
+resultados_sesiones = crear_almacen(
+    os.environ.get('AG_ALMACEN', 'memoria'),
+    max_elementos=int(os.environ.get('AG_MAX_RESULTADOS', 1000)),
+    ttl=float(os.environ.get('AG_TTL_RESULTADOS', 24 * 3600))
+)
+
+# Métricas acumuladas del servidor, exportadas en /metricas (formato Prometheus)
+metricas = RegistroMetricas()
+metricas.definir('ag_ejecuciones_total', 'counter', 'Ejecuciones terminadas, por motivo de parada')
+metricas.definir('ag_generaciones_total', 'counter', 'Generaciones ejecutadas')
+metricas.definir('ag_evaluaciones_total', 'counter', 'Horarios evaluados')
+metricas.definir('ag_fase_segundos_total', 'counter', 'Segundos en cada fase del AG')
+metricas.definir('ag_restriccion_segundos_total', 'counter', 'Segundos evaluando cada restricción')
+metricas.definir('ag_trabajos', 'gauge', 'Trabajos del planificador, por estado')
+metricas.definir('ag_almacen_elementos', 'gauge', 'Elementos guardados en cada almacén')
+metricas.definir('ag_almacen_operaciones_total', 'counter', 'Aciertos, fallos y expulsiones de cada almacén')
+_operaciones_informadas = {}  # (almacen, operacion) -> cantidad ya sumada al contador
+_lock_metricas = threading.Lock()
 
 class ProgresoAG:
     """Clase para trackear el progreso del AG"""
     def __init__(self, session_id):
         self.session_id = session_id
+        self.estado = 'en_cola'  # en_cola, ejecutando, completado, cancelado, error
         self.generacion_actual = 0
         self.total_generaciones = 0
         self.mejor_aptitud = 0
@@ -22,104 +70,266 @@ class ProgresoAG:
         self.penalizacion_blanda = 0
         self.completado = False
         self.error = None
+        self.evoluciones = []  # mejor aptitud de cada generación recibida
+        self.version = 0       # aumenta con cada cambio
+        self._condicion = threading.Condition()
+    
+    def actualizar(self, **campos):
+        """Aplica cambios y despierta a quienes esperan (los flujos SSE)"""
+        with self._condicion:
+            self.evoluciones.extend(campos.pop('evoluciones', ()))
+            for campo, valor in campos.items():
+                setattr(self, campo, valor)
+            self.version += 1
+            self._condicion.notify_all()
+    
+    def esperar_cambio(self, version, tiempo_espera):
+        """Espera hasta que la versión sea distinta de `version` o se agote el tiempo"""
+        with self._condicion:
+            self._condicion.wait_for(lambda: self.version != version, tiempo_espera)
+            return self.version
+    
+    def como_dict(self, posicion_cola=None):
+        """Estado actual en el formato de /obtener_progreso"""
+        with self._condicion:
+            return {
+                'estado': self.estado,
+                'posicion_cola': posicion_cola,
+                'generacion_actual': int(self.generacion_actual),
+                'total_generaciones': int(self.total_generaciones),
+                'porcentaje': float((self.generacion_actual / self.total_generaciones * 100) if self.total_generaciones > 0 else 0),
+                'mejor_aptitud': float(self.mejor_aptitud),
+                'penalizacion_dura': int(self.penalizacion_dura),
+                'penalizacion_blanda': int(self.penalizacion_blanda),
+                'completado': self.completado,
+                'error': self.error
+            }
 
 # Modificar la función algoritmo_genetico para reportar progreso
 def algoritmo_genetico_con_progreso(
-    session_id,
+    instancia,
     tamanio_poblacion=100,
     num_generaciones=500,
     prob_mutacion=0.02,
     elitismo=2,
-    num_enfermeras=10,
-    num_dias=30
+    num_procesos=1,
+    tamanio_cache=0,
+    semilla=None,
+    motor='ag',
+    fraccion_voraz=0.0,
+    busqueda_local=0,
+    tiempo_maximo=None,
+    max_evaluaciones=None,
+    paciencia=None,
+    metodo='ag',
+    metodo_exacto='auto',
+    tiempo_exacto=5.0,
+    replanificacion=None,
+    reportar=None,
+    debe_detenerse=None
 ):
-    """Versión del AG que reporta progreso"""
-    global progreso_sesiones, resultados_sesiones
+    """
+    Versión del AG que reporta progreso.
     
-    # Actualizar variables globales
-    global NUM_ENFERMERAS, NUM_DIAS
-    NUM_ENFERMERAS = num_enfermeras
-    NUM_DIAS = num_dias
+    Se ejecuta en un proceso del planificador: informa el progreso con
+    `reportar(datos)` cuando cambia la mejor solución (o cada
+    INTERVALO_REPORTE segundos) junto con las aptitudes de las generaciones
+    nuevas, se detiene si `debe_detenerse()` retorna un motivo y retorna el
+    resultado listo para guardar. `motor` elige las restricciones y
+    operadores (ver solucionador.MOTORES), `fraccion_voraz` la parte de la
+    población inicial construida de forma voraz y `busqueda_local` cuántos
+    de los mejores se mejoran con búsqueda local en cada generación.
+    `tiempo_maximo`, `max_evaluaciones` y `paciencia` terminan la ejecución
+    antes y retornan la mejor solución encontrada (ver CriteriosParada).
+    Con `replanificacion` (argumentos de replanificacion.congelar) se
+    ejecuta replanificacion.replanificar: la población se siembra con ese
+    horario y solo cambia la ventana indicada.
+    `metodo` 'hibrido' busca primero hasta `tiempo_exacto` segundos un
+    horario sin penalizaciones duras con exacto.resolver_exacto (con
+    `metodo_exacto`) y el AG sigue sembrado con lo que encontró; 'auto' lo
+    hace solo con instancias pequeñas y 'ag' nunca.
+    """
+    reportar = reportar or (lambda datos: None)
+    instrumentacion = Instrumentacion()
+    restricciones, estrategia = MOTORES[motor]
+    estrategia = replace(estrategia, prob_mutacion=prob_mutacion, elitismo=elitismo,
+                         fraccion_voraz=fraccion_voraz)
     
-    progreso = ProgresoAG(session_id)
-    progreso.total_generaciones = num_generaciones
-    progreso_sesiones[session_id] = progreso
+    mejor_aptitud_por_gen = []
+    enviadas = 0
+    ultimo_reportado = None
+    ultimo_envio = time.monotonic()
     
-    try:
-        # Crear población inicial
-        poblacion = crear_poblacion_inicial(tamanio_poblacion)
-        
-        # Evaluar población inicial
-        for individuo in poblacion:
-            calcular_aptitud(individuo)
-        
-        mejor_aptitud_por_gen = []
-        
-        for generacion in range(num_generaciones):
-            # Ordenar por aptitud
-            poblacion.sort(key=lambda x: x.aptitud, reverse=True)
-            
-            mejor = poblacion[0]
-            mejor_aptitud_por_gen.append(mejor.aptitud)
-            
-            # Actualizar progreso
-            progreso.generacion_actual = generacion + 1
-            progreso.mejor_aptitud = float(mejor.aptitud)
-            progreso.penalizacion_dura = int(mejor.penalizacion_dura)
-            progreso.penalizacion_blanda = int(mejor.penalizacion_blanda)
-            
-            # Condición de parada
-            if mejor.penalizacion_dura == 0 and mejor.penalizacion_blanda < 20:
-                progreso.completado = True
-                break
-            
-            # Nueva generación
-            nueva_poblacion = poblacion[:elitismo]
-            
-            while len(nueva_poblacion) < tamanio_poblacion:
-                padre1 = seleccion_torneo(poblacion)
-                padre2 = seleccion_torneo(poblacion)
-                
-                if random.random() < 0.8:
-                    hijo1, hijo2 = cruce_uniforme(padre1, padre2)
-                else:
-                    hijo1, hijo2 = Horario(padre1.genes), Horario(padre2.genes)
-                
-                mutacion(hijo1, prob_mutacion)
-                mutacion_inteligente(hijo1, 0.05)
-                mutacion(hijo2, prob_mutacion)
-                mutacion_inteligente(hijo2, 0.05)
-                
-                calcular_aptitud(hijo1)
-                calcular_aptitud(hijo2)
-                
-                nueva_poblacion.extend([hijo1, hijo2])
-            
-            poblacion = nueva_poblacion[:tamanio_poblacion]
-        
-        # Resultado final
-        poblacion.sort(key=lambda x: x.aptitud, reverse=True)
-        mejor_solucion = poblacion[0]
-        
-        # Calcular aptitud con detalles para obtener violaciones
-        calcular_aptitud(mejor_solucion, guardar_detalles=True)
-        
-        progreso.completado = True
-        
-        # Guardar resultado
-        resultados_sesiones[session_id] = {
-            'horario': mejor_solucion.genes.tolist(),
-            'aptitud': float(mejor_solucion.aptitud),
-            'penalizacion_dura': int(mejor_solucion.penalizacion_dura),
-            'penalizacion_blanda': int(mejor_solucion.penalizacion_blanda),
-            'evoluciones': mejor_aptitud_por_gen,
-            'violaciones_duras': mejor_solucion.violaciones_duras if hasattr(mejor_solucion, 'violaciones_duras') else {},
-            'violaciones_blandas': mejor_solucion.violaciones_blandas if hasattr(mejor_solucion, 'violaciones_blandas') else {}
-        }
+    def informar(generacion, aptitud, dura, blanda):
+        nonlocal enviadas, ultimo_envio
+        reportar({
+            'generacion_actual': generacion + 1,
+            'mejor_aptitud': float(aptitud),
+            'penalizacion_dura': int(dura),
+            'penalizacion_blanda': int(blanda),
+            'evoluciones': [float(x) for x in mejor_aptitud_por_gen[enviadas:]]
+        })
+        enviadas = len(mejor_aptitud_por_gen)
+        ultimo_envio = time.monotonic()
+    
+    def al_generar(generacion, genes, duras, blandas, aptitudes):
+        nonlocal ultimo_reportado
+        mejor_aptitud_por_gen.append(aptitudes[0].item())
         
-    except Exception as e:
-        progreso.error = str(e)
-        progreso.completado = True
+        # Informar progreso solo si cambió la mejor solución (o pasó el intervalo)
+        estado_mejor = (aptitudes[0].item(), duras[0].item(), blandas[0].item())
+        if estado_mejor != ultimo_reportado or time.monotonic() - ultimo_envio >= INTERVALO_REPORTE:
+            informar(generacion, *estado_mejor)
+            ultimo_reportado = estado_mejor
+    
+    fijas = congelar(**replanificacion) if replanificacion is not None else None
+    
+    # Método exacto antes del AG (no con replanificación: no conoce las celdas fijas)
+    # (acotado al presupuesto de la ejecución y detenido con `debe_detenerse`)
+    exacto = None
+    if fijas is None and (metodo == 'hibrido' or (metodo == 'auto' and es_instancia_pequena(instancia))):
+        if tiempo_maximo is not None:
+            tiempo_exacto = min(tiempo_exacto, tiempo_maximo)
+        exacto = resolver_exacto(instancia, restricciones, tiempo_maximo=tiempo_exacto, metodo=metodo_exacto,
+                                 semilla=semilla, num_trabajadores=num_procesos,
+                                 debe_detenerse=debe_detenerse)
+        if tiempo_maximo is not None:
+            tiempo_maximo = max(0.0, tiempo_maximo - exacto.segundos)
+    
+    parada = CriteriosParada(tiempo_maximo, max_evaluaciones, paciencia)
+    estadisticas = {}
+    if fijas is not None:
+        resultado = replanificar(instancia=instancia, motor=motor, estrategia=estrategia,
+                                 tamanio_poblacion=tamanio_poblacion, num_generaciones=num_generaciones,
+                                 busqueda_local=busqueda_local, semilla=semilla, al_generar=al_generar,
+                                 debe_detenerse=debe_detenerse, parada=parada, num_procesos=num_procesos,
+                                 tamanio_cache=tamanio_cache, instrumentacion=instrumentacion,
+                                 **replanificacion)
+    else:
+        rng = np.random.default_rng(semilla)
+        with Solucionador(instancia, restricciones, estrategia, num_procesos=num_procesos,
+                          tamanio_cache=tamanio_cache, instrumentacion=instrumentacion,
+                          busqueda_local=BusquedaLocal(mejores=busqueda_local) if busqueda_local > 0 else None
+                          ) as solucionador:
+            poblacion = None
+            if exacto is not None:
+                genes = sembrar_poblacion(estrategia.crear_poblacion(tamanio_poblacion, instancia, restricciones, rng),
+                                          exacto, rng=rng)
+                poblacion = (genes, *solucionador.evaluar(genes))
+            resultado = solucionador.resolver(tamanio_poblacion, num_generaciones, rng, poblacion=poblacion,
+                                              al_generar=al_generar, debe_detenerse=debe_detenerse,
+                                              parada=parada)
+            if solucionador.cache:
+                estadisticas['cache'] = solucionador.cache.metricas()
+    
+    # Resultado final (la población viene ordenada: la mejor primero)
+    if enviadas < len(mejor_aptitud_por_gen):
+        informar(len(mejor_aptitud_por_gen) - 1, resultado.aptitudes[0],
+                 resultado.duras[0], resultado.blandas[0])
+    
+    mejor_solucion = Horario(resultado.genes[0])
+    violaciones_duras, violaciones_blandas = {}, {}
+    if motor == 'ag':
+        # Calcular aptitud con detalles para obtener violaciones (solo las restricciones de calcular_aptitud)
+        calcular_aptitud(mejor_solucion, instancia, guardar_detalles=True)
+        violaciones_duras = mejor_solucion.violaciones_duras
+        violaciones_blandas = mejor_solucion.violaciones_blandas
+    
+    return {
+        'horario': mejor_solucion.genes.tolist(),
+        'aptitud': float(resultado.aptitudes[0]),
+        'penalizacion_dura': int(resultado.duras[0]),
+        'penalizacion_blanda': int(resultado.blandas[0]),
+        'evoluciones': mejor_aptitud_por_gen,
+        'violaciones_duras': violaciones_duras,
+        'violaciones_blandas': violaciones_blandas,
+        'especialistas': list(instancia.especialistas),
+        # Para poder replanificar desde este resultado
+        'preferencias': [[enfermera, list(dias)] for enfermera, dias in instancia.preferencias],
+        'celdas_replanificadas': fijas.libres if fijas is not None else None,
+        'motor': motor,
+        'metodo': 'hibrido' if exacto is not None else 'ag',
+        'exacto': exacto.como_dict() if exacto is not None else None,
+        'motivo_parada': resultado.motivo_parada,
+        'evaluaciones': resultado.evaluaciones,
+        'segundos': round(resultado.segundos, 3),
+        'semilla': semilla,
+        'estadisticas': dict(estadisticas, instrumentacion=instrumentacion.resumen())
+    }
+
+
+# ============================================
+# PLANIFICADOR DE EJECUCIONES
+# ============================================
+
+def _registrar_progreso(session_id, datos):
+    """Callback del planificador: actualiza el progreso de una sesión"""
+    progreso = progreso_sesiones.get(session_id)
+    if progreso is None:
+        return
+    progreso.actualizar(**datos)
+
+
+def _estado_final(resultado, error=None):
+    """'cancelado' si la ejecución se detuvo con /cancelar o por el límite del planificador"""
+    if error == ERROR_CANCELADO:
+        return 'cancelado'
+    if error:
+        return 'error'
+    if resultado.get('motivo_parada') in MOTIVOS_CANCELACION:
+        return 'cancelado'
+    return 'completado'
+
+
+def _registrar_resultado(session_id, resultado, error):
+    """Callback del planificador: guarda el resultado al terminar una sesión"""
+    estado = _estado_final(resultado, error)
+    if resultado is not None:
+        resultados_sesiones[session_id] = compactar_resultado(resultado)
+        _acumular_metricas(resultado)
+    else:
+        metricas.sumar('ag_ejecuciones_total', motivo=estado)
+    
+    progreso = progreso_sesiones.get(session_id)
+    if progreso is not None:
+        progreso.actualizar(
+            error=error,
+            estado=estado,
+            completado=True
+        )
+
+
+def _acumular_metricas(resultado):
+    """Suma los tiempos por fase y restricción de una ejecución a las métricas del servidor"""
+    metricas.sumar('ag_ejecuciones_total', motivo=resultado.get('motivo_parada'))
+    resumen = resultado.get('estadisticas', {}).get('instrumentacion')
+    if not resumen:
+        return
+    metricas.sumar('ag_generaciones_total', resumen['generaciones'])
+    metricas.sumar('ag_evaluaciones_total', resumen['evaluaciones'])
+    for fase, segundos in resumen['fases_segundos'].items():
+        metricas.sumar('ag_fase_segundos_total', segundos, fase=fase)
+    for restriccion, segundos in resumen['restricciones_segundos'].items():
+        metricas.sumar('ag_restriccion_segundos_total', segundos, restriccion=restriccion)
+
+
+_planificador = None
+_lock_planificador = threading.Lock()
+
+def obtener_planificador():
+    """Crea el planificador la primera vez que se usa (no al importar el módulo)"""
+    global _planificador
+    with _lock_planificador:
+        if _planificador is None:
+            _planificador = PlanificadorTrabajos(
+                algoritmo_genetico_con_progreso,
+                num_procesos=MAX_PROCESOS_AG,
+                max_en_cola=MAX_EN_COLA_AG,
+                tiempo_limite=TIEMPO_LIMITE_AG,
+                al_progreso=_registrar_progreso,
+                al_terminar=_registrar_resultado
+            )
+        return _planificador
 
 
 @app.route('/')
@@ -128,86 +338,352 @@ def index():
     return render_template('index.html')
 
 
-@app.route('/iniciar_ag', methods=['POST'])
-def iniciar_ag():
-    """Inicia la ejecución del algoritmo genético"""
-    datos = request.get_json()
-    
-    # Crear ID de sesión único
-    session_id = str(uuid.uuid4())
-    
-    # Actualizar preferencias y especialistas globales si se proporcionan
+def _instancia_desde_datos(datos, num_enfermeras=None, num_dias=None):
+    """InstanciaProblema de una petición (tamaño, preferencias y especialistas del formulario)"""
+    # Preferencias y especialistas de esta ejecución (sin tocar los valores por defecto)
+    preferencias = PREFERENCIAS
+    especialistas = ESPECIALISTAS
     if 'preferencias' in datos:
-        global PREFERENCIAS, ESPECIALISTAS
-        PREFERENCIAS.clear()
+        preferencias = {}
         especialistas_temp = []
         
         for pref in datos['preferencias']:
             enfermera = int(pref['enfermera'])
             dias = [int(d) for d in pref['dias']]
-            PREFERENCIAS[enfermera] = dias
+            preferencias[enfermera] = dias
             
             # Si es especialista, agregarlo a la lista
             if pref.get('esEspecialista', False):
                 especialistas_temp.append(enfermera)
         
-        # Actualizar lista de especialistas solo si se proporcionaron
-        if especialistas_temp:
-            ESPECIALISTAS = especialistas_temp
-        else:
-            # Si no hay especialistas definidos, usar los primeros 3
-            ESPECIALISTAS = [0, 1, 2]
-    
-    # Extraer parámetros
-    params = {
-        'session_id': session_id,
-        'tamanio_poblacion': int(datos.get('poblacion', 150)),
-        'num_generaciones': int(datos.get('generaciones', 300)),
-        'prob_mutacion': float(datos.get('mutacion', 0.03)),
-        'num_enfermeras': int(datos.get('enfermeras', 10)),
-        'num_dias': int(datos.get('dias', 30))
-    }
+        # Si no hay especialistas definidos, usar los primeros 3
+        especialistas = especialistas_temp or [0, 1, 2]
     
-    # Ejecutar en thread separado para no bloquear Flask
-    thread = threading.Thread(
-        target=algoritmo_genetico_con_progreso,
-        kwargs=params
+    return InstanciaProblema.crear(
+        num_enfermeras=num_enfermeras or _numero(datos, 'enfermeras', int, 10, minimo=1),
+        num_dias=num_dias or _numero(datos, 'dias', int, 30, minimo=1),
+        especialistas=especialistas,
+        preferencias=preferencias
     )
-    thread.start()
+
+
+def _numero(datos, campo, tipo=int, defecto=None, minimo=None, maximo=None, mayor_que=None):
+    """
+    Campo numérico de la solicitud (`tipo` int o float); ausente o vacío
+    retorna `defecto`. Lanza ValueError con el nombre del campo si no es un
+    número o queda fuera de los límites.
+    """
+    valor = datos.get(campo)
+    if valor is None or valor == '':
+        return defecto
+    
+    limites = [texto for limite, texto in ((minimo, f"mayor o igual a {minimo}"),
+                                           (mayor_que, f"mayor que {mayor_que}"),
+                                           (maximo, f"menor o igual a {maximo}")) if limite is not None]
+    error = ValueError(f"'{campo}' debe ser {'un entero' if tipo is int else 'un número'}"
+                       + (f" {' y '.join(limites)}" if limites else ''))
+    if isinstance(valor, bool) or (tipo is int and isinstance(valor, float) and not valor.is_integer()):
+        raise error
+    try:
+        numero = tipo(valor)
+    except (TypeError, ValueError, OverflowError):
+        raise error from None
+    if (not math.isfinite(numero) or (minimo is not None and numero < minimo)
+            or (mayor_que is not None and numero <= mayor_que) or (maximo is not None and numero > maximo)):
+        raise error
+    return numero
+
+
+def _semilla(datos):
+    # Sin semilla se sortea una y se informa, para poder repetir la ejecución
+    semilla = _numero(datos, 'semilla', int, minimo=0)
+    return semilla if semilla is not None else int(np.random.SeedSequence().generate_state(1)[0])
+
+
+def _encolar(params, tiempo_limite):
+    """Crea la sesión y encola la ejecución; retorna la respuesta de /iniciar_ag"""
+    session_id = str(uuid.uuid4())
+    progreso = ProgresoAG(session_id)
+    progreso.total_generaciones = params['num_generaciones']
+    progreso_sesiones[session_id] = progreso
+    
+    # La fase exacta no puede durar más que el límite del planificador
+    limite = min(tiempo_limite or TIEMPO_LIMITE_AG, TIEMPO_LIMITE_AG)
+    if 'tiempo_exacto' in params:
+        params['tiempo_exacto'] = min(params['tiempo_exacto'], limite)
+    
+    # Encolar en el pool de procesos para no bloquear Flask
+    try:
+        posicion = obtener_planificador().enviar(session_id, params, tiempo_limite)
+    except ColaLlena:
+        del progreso_sesiones[session_id]
+        respuesta = jsonify({
+            'success': False,
+            'error': 'El servidor está ocupado, intenta nuevamente en unos segundos'
+        })
+        respuesta.headers['Retry-After'] = '5'
+        return respuesta, 429
     
     return jsonify({
         'success': True,
-        'session_id': session_id
+        'session_id': session_id,
+        'posicion_cola': posicion,
+        'semilla': params['semilla']
     })
 
 
+@app.route('/iniciar_ag', methods=['POST'])
+def iniciar_ag():
+    """Inicia la ejecución del algoritmo genético"""
+    datos = request.get_json()
+    
+    motor = datos.get('motor') or 'ag'
+    if motor not in MOTORES:
+        return jsonify({'success': False, 'error': f"Motor desconocido: {motor}"}), 400
+    
+    # 'ag', 'hibrido' (método exacto y luego el AG) o 'auto' (híbrido solo con instancias pequeñas)
+    metodo = datos.get('metodo') or 'ag'
+    if metodo not in ('ag', 'hibrido', 'auto'):
+        return jsonify({'success': False, 'error': f"Método desconocido: {metodo}"}), 400
+    metodo_exacto = datos.get('metodo_exacto') or 'auto'
+    if metodo_exacto not in ('auto', 'ramificacion', 'cpsat'):
+        return jsonify({'success': False, 'error': f"Método exacto desconocido: {metodo_exacto}"}), 400
+    if metodo_exacto == 'cpsat' and not cpsat_disponible():
+        return jsonify({'success': False, 'error': "El método exacto 'cpsat' necesita OR-Tools instalado"}), 400
+    
+    # Extraer parámetros
+    try:
+        params = {
+            'instancia': _instancia_desde_datos(datos),
+            'tamanio_poblacion': _numero(datos, 'poblacion', int, 150, minimo=3),
+            'num_generaciones': _numero(datos, 'generaciones', int, 300, minimo=1),
+            'prob_mutacion': _numero(datos, 'mutacion', float, 0.03, minimo=0, maximo=1),
+            # Procesos de evaluación de la ejecución: no más que los del planificador
+            'num_procesos': _numero(datos, 'procesos', int, 1, minimo=1, maximo=MAX_PROCESOS_POR_TRABAJO),
+            'tamanio_cache': _numero(datos, 'cache', int, 0, minimo=0),
+            'motor': motor,
+            'fraccion_voraz': _numero(datos, 'voraz', float, 0.0, minimo=0, maximo=1),
+            'busqueda_local': _numero(datos, 'busqueda_local', int, 0, minimo=0),
+            # Presupuestos: se retorna la mejor solución encontrada al agotarse
+            'tiempo_maximo': _numero(datos, 'tiempo_maximo', float, mayor_que=0),
+            'max_evaluaciones': _numero(datos, 'max_evaluaciones', int, minimo=1),
+            'paciencia': _numero(datos, 'paciencia', int, minimo=1),
+            'metodo': metodo,
+            'metodo_exacto': metodo_exacto,
+            'tiempo_exacto': _numero(datos, 'tiempo_exacto', float, 5.0, mayor_que=0),
+            'semilla': _semilla(datos)
+        }
+        tiempo_limite = _numero(datos, 'tiempo_limite', float, mayor_que=0)
+    except (ValueError, TypeError) as error:
+        return jsonify({'success': False, 'error': str(error)}), 400
+    
+    return _encolar(params, tiempo_limite)
+
+
+@app.route('/replanificar', methods=['POST'])
+def replanificar_horario():
+    """
+    Replanifica un horario existente: el resultado de otra sesión
+    (`session_id`) o uno enviado (`horario`, matriz de turnos 0-3 con las
+    preferencias del formulario).
+    
+    Solo cambian los días [desde_dia, hasta_dia); las celdas `bloqueadas`
+    ([[enfermera, dia], ...]) conservan su turno y las `ausencias`
+    ({enfermera: [dias]}) quedan libres. Por defecto la ejecución dura a lo
+    sumo `tiempo_maximo` = 1 segundo. Se consulta como las de /iniciar_ag.
+    """
+    datos = request.get_json()
+    
+    if datos.get('session_id'):
+        compacto = resultados_sesiones.get(datos['session_id'])
+        if compacto is None:
+            return jsonify({'success': False, 'error': 'Resultado no disponible'}), 404
+        base = expandir_resultado(compacto)
+        horario = base['horario']
+        motor = datos.get('motor') or base.get('motor', 'ag')
+        instancia = InstanciaProblema.crear(len(horario), len(horario[0]), base['especialistas'],
+                                            dict(base.get('preferencias', [])))
+    elif datos.get('horario'):
+        horario = datos['horario']
+        motor = datos.get('motor') or 'ag'
+        instancia = _instancia_desde_datos(datos, len(horario), len(horario[0]))
+    else:
+        return jsonify({'success': False, 'error': 'Falta session_id u horario'}), 400
+    
+    if motor not in MOTORES:
+        return jsonify({'success': False, 'error': f"Motor desconocido: {motor}"}), 400
+    
+    try:
+        genes = np.array(horario, dtype=np.int64)
+        if genes.ndim != 2 or genes.min() < 0 or genes.max() >= NUM_TURNOS:
+            raise ValueError('El horario debe ser una matriz de turnos entre 0 y 3')
+        replanificacion = {
+            'horario': genes.astype(np.uint8),
+            'desde_dia': int(datos.get('desde_dia', 0)),
+            'hasta_dia': int(datos['hasta_dia']) if datos.get('hasta_dia') is not None else None,
+            'bloqueadas': [(int(e), int(d)) for e, d in datos.get('bloqueadas', [])],
+            'ausencias': {int(e): [int(d) for d in dias] for e, dias in datos.get('ausencias', {}).items()}
+        }
+        congelar(**replanificacion)  # valida la ventana y las celdas
+        params = {
+            'instancia': instancia,
+            'tamanio_poblacion': _numero(datos, 'poblacion', int, 50, minimo=3),
+            'num_generaciones': _numero(datos, 'generaciones', int, 300, minimo=1),
+            'prob_mutacion': _numero(datos, 'mutacion', float, 0.03, minimo=0, maximo=1),
+            'motor': motor,
+            'busqueda_local': _numero(datos, 'busqueda_local', int, 2, minimo=0),
+            'tiempo_maximo': _numero(datos, 'tiempo_maximo', float, 1.0, mayor_que=0),
+            'semilla': _semilla(datos),
+            'replanificacion': replanificacion
+        }
+        tiempo_limite = _numero(datos, 'tiempo_limite', float, mayor_que=0)
+    except (ValueError, IndexError, TypeError) as error:
+        return jsonify({'success': False, 'error': str(error)}), 400
+    
+    return _encolar(params, tiempo_limite)
+
+
+def _progreso_desde_resultado(resultado):
+    """Progreso de una sesión ya terminada cuyo progreso expiró"""
+    generaciones = len(resultado['evoluciones'])
+    return {
+        'estado': _estado_final(resultado),
+        'posicion_cola': None,
+        'generacion_actual': generaciones,
+        'total_generaciones': generaciones,
+        'porcentaje': 100.0,
+        'mejor_aptitud': float(resultado['aptitud']),
+        'penalizacion_dura': int(resultado['penalizacion_dura']),
+        'penalizacion_blanda': int(resultado['penalizacion_blanda']),
+        'completado': True,
+        'error': None
+    }
+
+
+def _posicion_cola(progreso):
+    return obtener_planificador().posicion(progreso.session_id) if progreso.estado == 'en_cola' else None
+
+
 @app.route('/obtener_progreso/<session_id>')
 def obtener_progreso(session_id):
     """Retorna el progreso actual del AG"""
-    if session_id not in progreso_sesiones:
-        return jsonify({'error': 'Sesión no encontrada'}), 404
+    progreso = progreso_sesiones.get(session_id)
+    if progreso is None:
+        # El progreso pudo expirar (o perderse en un reinicio) con el resultado ya guardado
+        resultado = resultados_sesiones.get(session_id)
+        if resultado is None:
+            return jsonify({'error': 'Sesión no encontrada'}), 404
+        return jsonify(_progreso_desde_resultado(resultado))
     
-    progreso = progreso_sesiones[session_id]
+    return jsonify(progreso.como_dict(_posicion_cola(progreso)))
+
+
+@app.route('/flujo_progreso/<session_id>')
+def flujo_progreso(session_id):
+    """
+    Progreso en vivo con Server-Sent Events.
     
-    return jsonify({
-        'generacion_actual': int(progreso.generacion_actual),
-        'total_generaciones': int(progreso.total_generaciones),
-        'porcentaje': float((progreso.generacion_actual / progreso.total_generaciones * 100) if progreso.total_generaciones > 0 else 0),
-        'mejor_aptitud': float(progreso.mejor_aptitud),
-        'penalizacion_dura': int(progreso.penalizacion_dura),
-        'penalizacion_blanda': int(progreso.penalizacion_blanda),
-        'completado': progreso.completado,
-        'error': progreso.error
-    })
+    Envía un evento solo cuando cambia algún campo del progreso. Con
+    `?evoluciones=1` cada evento incluye además `evoluciones_nuevas`: las
+    aptitudes de las generaciones que no se habían enviado. El flujo termina
+    al completarse la ejecución.
+    """
+    progreso = progreso_sesiones.get(session_id)
+    if progreso is None:
+        resultado = resultados_sesiones.get(session_id)
+        if resultado is None:
+            return jsonify({'error': 'Sesión no encontrada'}), 404
+        datos = _progreso_desde_resultado(resultado)
+        respuesta = Response(f"data: {json.dumps(datos)}\n\n", mimetype='text/event-stream')
+        respuesta.headers['Cache-Control'] = 'no-cache'
+        return respuesta
+    
+    incluir_evoluciones = request.args.get('evoluciones') in ('1', 'true')
+    
+    def generar():
+        version = -1
+        enviadas = 0
+        anterior = None
+        expirado = False
+        while True:
+            # En cola (o sin progreso) se revisa cada segundo, porque no llegan avisos
+            espera = 1.0 if progreso.estado == 'en_cola' or expirado else INTERVALO_LATIDO
+            nueva_version = progreso.esperar_cambio(version, espera)
+            datos = progreso.como_dict(_posicion_cola(progreso))
+            
+            if not datos['completado'] and progreso_sesiones.get(session_id) is not progreso:
+                # El progreso se descartó (LRU/TTL) y ya no se actualiza: se cierra
+                # con el resultado o, si el trabajo ya no existe, con un error
+                expirado = True
+                resultado = resultados_sesiones.get(session_id)
+                if resultado is not None:
+                    yield f"data: {json.dumps(_progreso_desde_resultado(resultado))}\n\n"
+                    return
+                if obtener_planificador().posicion(session_id) is None:
+                    datos.update(estado='error', posicion_cola=None, completado=True,
+                                 error='La sesión expiró antes de terminar')
+                    yield f"data: {json.dumps(datos)}\n\n"
+                    return
+            
+            if datos != anterior or (incluir_evoluciones and enviadas < len(progreso.evoluciones)):
+                anterior = dict(datos)
+                if incluir_evoluciones:
+                    nuevas = progreso.evoluciones[enviadas:]
+                    enviadas += len(nuevas)
+                    datos['evoluciones_nuevas'] = [float(x) for x in nuevas]
+                yield f"data: {json.dumps(datos)}\n\n"
+            elif nueva_version == version:
+                yield ": latido\n\n"
+            
+            if datos['completado']:
+                return
+            version = nueva_version
+            time.sleep(INTERVALO_MIN_EVENTOS)  # agrupa cambios muy seguidos en un solo evento
+    
+    respuesta = Response(stream_with_context(generar()), mimetype='text/event-stream')
+    respuesta.headers['Cache-Control'] = 'no-cache'
+    respuesta.headers['X-Accel-Buffering'] = 'no'  # evita que un proxy nginx acumule los eventos
+    return respuesta
+
+
+@app.route('/cancelar/<session_id>', methods=['POST'])
+def cancelar(session_id):
+    """Cancela una ejecución en cola o en curso"""
+    if not obtener_planificador().cancelar(session_id):
+        return jsonify({'error': 'Sesión no encontrada o ya terminada'}), 404
+    return jsonify({'success': True})
+
+
+@app.route('/metricas')
+def exportar_metricas():
+    """Métricas del servidor en el formato de texto de Prometheus"""
+    if _planificador is not None:
+        estadisticas = _planificador.estadisticas()
+        metricas.fijar('ag_trabajos', estadisticas['en_ejecucion'], estado='ejecutando')
+        metricas.fijar('ag_trabajos', estadisticas['en_cola'], estado='en_cola')
+    
+    with _lock_metricas:
+        for nombre, almacen in (('progreso', progreso_sesiones), ('resultados', resultados_sesiones)):
+            datos = almacen.metricas()
+            metricas.fijar('ag_almacen_elementos', datos.pop('elementos'), almacen=nombre)
+            # Los almacenes llevan totales propios: al contador se le suma lo nuevo
+            for operacion, cantidad in datos.items():
+                anterior = _operaciones_informadas.get((nombre, operacion), 0)
+                metricas.sumar('ag_almacen_operaciones_total', cantidad - anterior,
+                               almacen=nombre, operacion=operacion)
+                _operaciones_informadas[(nombre, operacion)] = cantidad
+    
+    return Response(metricas.texto(), mimetype='text/plain; version=0.0.4')
 
 
 @app.route('/obtener_resultado/<session_id>')
 def obtener_resultado(session_id):
     """Retorna el resultado final del AG"""
-    if session_id not in resultados_sesiones:
+    compacto = resultados_sesiones.get(session_id)
+    if compacto is None:
         return jsonify({'error': 'Resultado no disponible'}), 404
     
-    resultado = resultados_sesiones[session_id]
+    resultado = expandir_resultado(compacto)
     
     # Convertir horario a formato legible
     turnos_nombres = {0: 'Libre', 1: 'Mañana', 2: 'Tarde', 3: 'Noche'}
@@ -221,7 +697,12 @@ def obtener_resultado(session_id):
         horario_formateado.append(fila)
     
     # Obtener información de especialistas
-    especialistas_info = [idx + 1 for idx in ESPECIALISTAS] if ESPECIALISTAS else []
+    especialistas_info = [idx + 1 for idx in resultado['especialistas']]
+    
+    # Óptimo según las restricciones del motor con que se ejecutó
+    motor = resultado.get('motor', 'ag')
+    dura, blanda = int(resultado['penalizacion_dura']), int(resultado['penalizacion_blanda'])
+    es_optimo = bool(MOTORES[motor][0].es_optima(dura, blanda)) if motor in MOTORES else False
     
     return jsonify({
         'horario': horario_formateado,
@@ -231,9 +712,15 @@ def obtener_resultado(session_id):
         'evoluciones': [float(x) for x in resultado['evoluciones']],
         'violaciones_duras': resultado.get('violaciones_duras', {}),
         'violaciones_blandas': resultado.get('violaciones_blandas', {}),
-        'es_optimo': int(resultado['penalizacion_dura']) == 0 and int(resultado['penalizacion_blanda']) < 20,
-        'es_aceptable': int(resultado['penalizacion_dura']) == 0,
-        'especialistas': especialistas_info
+        'es_optimo': es_optimo,
+        'es_aceptable': dura == 0,
+        'especialistas': especialistas_info,
+        'motor': motor,
+        'metodo': resultado.get('metodo', 'ag'),
+        'exacto': resultado.get('exacto'),
+        'motivo_parada': resultado.get('motivo_parada'),
+        'estadisticas': resultado.get('estadisticas', {}),
+        'semilla': resultado.get('semilla')
     })
 
 
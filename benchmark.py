@@ -0,0 +1,319 @@
+"""
+Banco de pruebas de rendimiento de los dos motores del AG.
+
+Recorre combinaciones de enfermeras, días y tamaño de población y mide:
+
+- aptitud: evaluaciones por segundo del evaluador vectorizado que usa el
+  Solucionador (y, como referencia, de calcular_aptitud e
+  Individuo.calcular_aptitud, horario por horario)
+- operadores: generaciones por segundo de selección + cruce + mutación
+- ag: ejecución completa con Solucionador.resolver y el mismo presupuesto
+  de tiempo para ambos motores (evaluaciones/s, incluidas las de la
+  búsqueda local, generaciones/s y segundos hasta penalización dura 0)
+
+además de la memoria máxima de cada caso. Los resultados se guardan en JSON
+para compararlos con una ejecución anterior:
+
+    python benchmark.py --salida base.json
+    python benchmark.py --enfermeras 10,100,500 --dias 7,90,365 --comparar base.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import replace
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+import algoritmo_genetico as ag
+import main_2
+from busqueda_local import BusquedaLocal
+from instancia import InstanciaProblema
+from restricciones import RESTRICCIONES_POR_DEFECTO
+from solucionador import Solucionador, CriteriosParada, ESTRATEGIA_AG, ESTRATEGIA_TURNOS
+
+MOTORES = ('ag', 'main_2')
+PRUEBAS = ('aptitud', 'operadores', 'ag')
+
+# ============================================
+# DATOS DE PRUEBA
+# ============================================
+
+
+def crear_problema(num_enfermeras: int, num_dias: int, semilla: int):
+    """Mismo problema para ambos motores: 30% de especialistas y 2-3 días preferidos libres."""
+    rng = np.random.default_rng(semilla)
+    num_especialistas = max(1, num_enfermeras * 3 // 10)
+    preferencias = {
+        enfermera: sorted(rng.choice(num_dias, size=min(num_dias, rng.integers(2, 4)), replace=False).tolist())
+        for enfermera in range(num_enfermeras)
+    }
+
+    instancia = InstanciaProblema.crear(num_enfermeras, num_dias,
+                                        range(num_especialistas), preferencias)
+    config = main_2.ConfiguracionTurnos(num_enfermeras=num_enfermeras, num_dias=num_dias,
+                                        num_especialistas=num_especialistas)
+    enfermeras = [
+        main_2.Enfermera(id=enfermera, es_especialista=enfermera < num_especialistas,
+                         preferencias_libres=preferencias[enfermera])
+        for enfermera in range(num_enfermeras)
+    ]
+    return instancia, config, enfermeras
+
+
+def configurar_motor(motor: str, config, enfermeras, fraccion_voraz: float = 0.0):
+    """Restricciones y estrategia con que el Solucionador ejecuta cada motor en este problema."""
+    if motor == 'ag':
+        return RESTRICCIONES_POR_DEFECTO, replace(ESTRATEGIA_AG, fraccion_voraz=fraccion_voraz)
+    return (main_2.restricciones_desde_configuracion(config, enfermeras),
+            replace(ESTRATEGIA_TURNOS, fraccion_voraz=fraccion_voraz))
+
+
+# ============================================
+# MEDICIÓN
+# ============================================
+
+
+def _por_segundo(funcion: Callable, tiempo_min: float) -> float:
+    """Llama a `funcion` hasta acumular `tiempo_min` segundos y retorna llamadas/s."""
+    llamadas = 0
+    inicio = time.perf_counter()
+    while True:
+        funcion()
+        llamadas += 1
+        transcurrido = time.perf_counter() - inicio
+        if transcurrido >= tiempo_min:
+            return llamadas / transcurrido
+
+
+def _memoria_pico_mb(funcion: Callable) -> float:
+    """Memoria máxima reservada (Python + NumPy) durante una llamada, en MB."""
+    tracemalloc.start()
+    try:
+        funcion()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+# ============================================
+# PRUEBAS
+# ============================================
+
+
+def prueba_aptitud(motor, instancia, config, enfermeras, poblacion, opciones) -> Dict:
+    rng = np.random.default_rng(opciones.semilla)
+    genes = rng.integers(0, ag.NUM_TURNOS, size=(poblacion, instancia.num_enfermeras,
+                                                 instancia.num_dias), dtype=ag.TIPO_GENES)
+    restricciones, _ = configurar_motor(motor, config, enfermeras)
+
+    if motor == 'ag':
+        horarios = [ag.Horario(g) for g in genes]
+
+        def escalar():
+            for horario in horarios:
+                ag.calcular_aptitud(horario, instancia)
+    else:
+        individuos = []
+        for g in genes:
+            individuo = main_2.Individuo(config, enfermeras)
+            individuo.cromosoma = g
+            individuos.append(individuo)
+
+        def escalar():
+            for individuo in individuos:
+                individuo.calcular_aptitud()
+
+    def vectorizada():
+        restricciones(genes, instancia)
+
+    return {
+        'evaluaciones_por_segundo_escalar': _por_segundo(escalar, opciones.tiempo_min) * poblacion,
+        'evaluaciones_por_segundo': _por_segundo(vectorizada, opciones.tiempo_min) * poblacion,
+        'memoria_pico_mb': _memoria_pico_mb(vectorizada)
+    }
+
+
+def prueba_operadores(motor, instancia, config, enfermeras, poblacion, opciones) -> Dict:
+    rng = np.random.default_rng(opciones.semilla)
+    genes = rng.integers(0, ag.NUM_TURNOS, size=(poblacion, instancia.num_enfermeras,
+                                                 instancia.num_dias), dtype=ag.TIPO_GENES)
+    aptitudes = rng.random(poblacion)
+    _, estrategia = configurar_motor(motor, config, enfermeras)
+    num_hijos = poblacion - estrategia.elitismo
+
+    def generacion():
+        estrategia.generar_hijos(genes, aptitudes, num_hijos, rng)
+
+    return {
+        'generaciones_por_segundo': _por_segundo(generacion, opciones.tiempo_min),
+        'memoria_pico_mb': _memoria_pico_mb(generacion)
+    }
+
+
+def prueba_ag(motor, instancia, config, enfermeras, poblacion, opciones) -> Dict:
+    restricciones, estrategia = configurar_motor(motor, config, enfermeras, opciones.voraz)
+    busqueda_local = BusquedaLocal(mejores=opciones.busqueda_local) if opciones.busqueda_local > 0 else None
+
+    def ejecutar(num_generaciones):
+        hasta_cero_duras = None
+        inicio = time.perf_counter()
+
+        def al_generar(generacion, genes, duras, blandas, aptitudes):
+            nonlocal hasta_cero_duras
+            if hasta_cero_duras is None and duras[0] == 0:
+                hasta_cero_duras = time.perf_counter() - inicio
+
+        with Solucionador(instancia, restricciones, estrategia, busqueda_local=busqueda_local) as solucionador:
+            resultado = solucionador.resolver(poblacion, num_generaciones, np.random.default_rng(opciones.semilla),
+                                              al_generar=al_generar,
+                                              parada=CriteriosParada(tiempo_maximo=opciones.tiempo_max))
+        return resultado, hasta_cero_duras
+
+    resultado, hasta_cero_duras = ejecutar(opciones.generaciones)
+    return {
+        'segundos': resultado.segundos,
+        'generaciones': resultado.generaciones,
+        'generaciones_por_segundo': resultado.generaciones / resultado.segundos,
+        'evaluaciones_por_segundo': resultado.evaluaciones / resultado.segundos,
+        'segundos_hasta_cero_duras': hasta_cero_duras,
+        'motivo_parada': resultado.motivo_parada,
+        'memoria_pico_mb': _memoria_pico_mb(lambda: ejecutar(min(opciones.generaciones, 3)))
+    }
+
+
+FUNCIONES_PRUEBA = {
+    'aptitud': prueba_aptitud,
+    'operadores': prueba_operadores,
+    'ag': prueba_ag
+}
+
+
+# ============================================
+# BARRIDO Y COMPARACIÓN
+# ============================================
+
+
+def ejecutar_barrido(opciones) -> List[Dict]:
+    resultados = []
+    for num_enfermeras in opciones.enfermeras:
+        for num_dias in opciones.dias:
+            instancia, config, enfermeras = crear_problema(num_enfermeras, num_dias, opciones.semilla)
+            for poblacion in opciones.poblaciones:
+                for prueba in opciones.pruebas:
+                    for motor in opciones.motores:
+                        medicion = FUNCIONES_PRUEBA[prueba](motor, instancia, config, enfermeras,
+                                                            poblacion, opciones)
+                        fila = dict(motor=motor, prueba=prueba, enfermeras=num_enfermeras,
+                                    dias=num_dias, poblacion=poblacion, **medicion)
+                        resultados.append(fila)
+                        print(_formatear(fila), flush=True)
+    return resultados
+
+
+def _clave(fila: Dict):
+    return fila['motor'], fila['prueba'], fila['enfermeras'], fila['dias'], fila['poblacion']
+
+
+def _formatear(fila: Dict) -> str:
+    partes = [f"{fila['motor']:>6} {fila['prueba']:<10} N={fila['enfermeras']:<4} "
+              f"D={fila['dias']:<4} P={fila['poblacion']:<5}"]
+    if 'evaluaciones_por_segundo' in fila:
+        partes.append(f"{fila['evaluaciones_por_segundo']:12.0f} eval/s")
+    if 'generaciones_por_segundo' in fila:
+        partes.append(f"{fila['generaciones_por_segundo']:9.2f} gen/s")
+    if fila.get('segundos_hasta_cero_duras') is not None:
+        partes.append(f"duras=0 en {fila['segundos_hasta_cero_duras']:.2f}s")
+    partes.append(f"{fila['memoria_pico_mb']:8.1f} MB")
+    return ' | '.join(partes)
+
+
+def comparar(resultados: List[Dict], base: List[Dict], tolerancia: float) -> List[str]:
+    """Casos cuya velocidad cayó más de `tolerancia` (fracción) respecto de la base."""
+    anteriores = {_clave(fila): fila for fila in base}
+    regresiones = []
+    for fila in resultados:
+        anterior = anteriores.get(_clave(fila))
+        if anterior is None:
+            continue
+        for metrica in ('evaluaciones_por_segundo', 'generaciones_por_segundo'):
+            if metrica in fila and anterior.get(metrica):
+                razon = fila[metrica] / anterior[metrica]
+                print(f"{_clave(fila)} {metrica}: x{razon:.2f}")
+                if razon < 1 - tolerancia:
+                    regresiones.append(f"{_clave(fila)} {metrica} cayó a x{razon:.2f}")
+    return regresiones
+
+
+def _lista_enteros(texto: str) -> List[int]:
+    return [int(valor) for valor in texto.split(',') if valor]
+
+
+def _lista_opciones(validas):
+    def convertir(texto: str) -> List[str]:
+        valores = [valor for valor in texto.split(',') if valor]
+        for valor in valores:
+            if valor not in validas:
+                raise argparse.ArgumentTypeError(f"'{valor}' no es válido (opciones: {', '.join(validas)})")
+        return valores
+    return convertir
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark de los motores del algoritmo genético')
+    parser.add_argument('--enfermeras', type=_lista_enteros, default=[10, 50, 100])
+    parser.add_argument('--dias', type=_lista_enteros, default=[7, 30, 90])
+    parser.add_argument('--poblaciones', type=_lista_enteros, default=[50, 200])
+    parser.add_argument('--motores', type=_lista_opciones(MOTORES), default=list(MOTORES))
+    parser.add_argument('--pruebas', type=_lista_opciones(PRUEBAS), default=list(PRUEBAS))
+    parser.add_argument('--generaciones', type=int, default=50,
+                        help='Generaciones de cada ejecución completa')
+    parser.add_argument('--tiempo-min', type=float, default=0.5,
+                        help='Segundos mínimos de medición por caso (aptitud, operadores)')
+    parser.add_argument('--tiempo-max', type=float, default=60,
+                        help='Segundos máximos por ejecución completa (ambos motores)')
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--voraz', type=float, default=0.0,
+                        help='Fracción de la población inicial construida de forma voraz')
+    parser.add_argument('--busqueda-local', type=int, default=0,
+                        help='Mejores individuos mejorados con búsqueda local en cada generación')
+    parser.add_argument('--salida', help='Archivo JSON donde guardar los resultados')
+    parser.add_argument('--comparar', help='JSON de una ejecución anterior (línea base)')
+    parser.add_argument('--tolerancia', type=float, default=0.2,
+                        help='Caída de velocidad aceptada al comparar (0.2 = 20%%)')
+    opciones = parser.parse_args(argv)
+
+    resultados = ejecutar_barrido(opciones)
+
+    if opciones.salida:
+        with open(opciones.salida, 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'maquina': platform.platform(),
+                'parametros': {k: v for k, v in vars(opciones).items() if k not in ('salida', 'comparar')},
+                'resultados': resultados
+            }, archivo, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en {opciones.salida}")
+
+    if opciones.comparar:
+        with open(opciones.comparar, encoding='utf-8') as archivo:
+            base = json.load(archivo)['resultados']
+        print(f"\nComparación con {opciones.comparar}:")
+        regresiones = comparar(resultados, base, opciones.tolerancia)
+        if regresiones:
+            print("\nREGRESIONES:")
+            for regresion in regresiones:
+                print(f"  {regresion}")
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,186 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from evaluacion_incremental import EvaluadorIncremental
+from instancia import InstanciaProblema
+from operadores import obtener_generador
+from restricciones import ConjuntoRestricciones, RESTRICCIONES_POR_DEFECTO
+
+# ============================================
+# BÚSQUEDA LOCAL (ETAPA MEMÉTICA)
+# ============================================
+#
+# Un movimiento es una tupla de cambios (enfermera, dia, nuevo_turno):
+# - intercambio: dos enfermeras intercambian sus turnos de un mismo día
+#   (la cobertura del día no cambia)
+# - cambio: una celda pasa a otro turno
+
+Movimiento = Tuple[Tuple[int, int, int], ...]
+
+
+class _VecindarioIncremental:
+    """Prueba movimientos con EvaluadorIncremental (restricciones por defecto)"""
+
+    def __init__(self, genes: np.ndarray, instancia: InstanciaProblema):
+        self.evaluador = EvaluadorIncremental(genes, instancia)
+        self.genes = self.evaluador.genes
+
+    @property
+    def aptitud(self):
+        return self.evaluador.aptitud
+
+    @property
+    def penalizaciones(self):
+        return self.evaluador.penalizacion_dura, self.evaluador.penalizacion_blanda
+
+    def probar(self, movimientos: List[Movimiento]) -> np.ndarray:
+        return np.array([self.evaluador.probar_cambios(movimiento) for movimiento in movimientos])
+
+    def aplicar(self, movimiento: Movimiento):
+        self.evaluador.aplicar_cambios(movimiento)
+
+
+class _VecindarioPorLotes:
+    """
+    Prueba todos los movimientos de una iteración con una sola llamada al
+    evaluador vectorizado (para restricciones sin evaluador incremental).
+    """
+
+    def __init__(self, genes: np.ndarray, instancia: InstanciaProblema,
+                 restricciones: ConjuntoRestricciones):
+        self.genes = np.array(genes, dtype=np.uint8)
+        self.instancia = instancia
+        self.restricciones = restricciones
+        self._evaluar()
+
+    def _evaluar(self):
+        duras, blandas = self.restricciones(self.genes, self.instancia)
+        self.penalizaciones = (duras[0].item(), blandas[0].item())
+        self.aptitud = self.restricciones.aptitud(*self.penalizaciones)
+
+    def probar(self, movimientos: List[Movimiento]) -> np.ndarray:
+        candidatos = np.repeat(self.genes[np.newaxis], len(movimientos), axis=0)
+        for indice, movimiento in enumerate(movimientos):
+            for enfermera, dia, turno in movimiento:
+                candidatos[indice, enfermera, dia] = turno
+        return self.restricciones.aptitud(*self.restricciones(candidatos, self.instancia))
+
+    def aplicar(self, movimiento: Movimiento):
+        for enfermera, dia, turno in movimiento:
+            self.genes[enfermera, dia] = turno
+        self._evaluar()
+
+
+@dataclass
+class BusquedaLocal:
+    """
+    Etapa memética: mejora los `mejores` individuos de la población cada
+    `cada` generaciones.
+
+    En cada una de las `iteraciones` se sortean `vecinos` movimientos
+    (intercambios con probabilidad `prob_intercambio`, si no cambios de
+    turno) y se aplica el mejor. Con `tenencia_tabu` = 0 es una escalada:
+    solo se aceptan mejoras. Con `tenencia_tabu` > 0 es una búsqueda tabú:
+    se acepta el mejor movimiento aunque empeore, y las celdas que tocó no
+    se vuelven a mover durante `tenencia_tabu` iteraciones (salvo que el
+    movimiento supere a la mejor solución vista). Se conserva siempre la
+    mejor solución vista.
+
+    Con las restricciones por defecto los movimientos se evalúan con
+    EvaluadorIncremental; con otras, por lotes con el evaluador vectorizado.
+    Las celdas marcadas en `fijas` ((N, D) bool) nunca se mueven.
+    """
+    mejores: int = 2
+    iteraciones: int = 30
+    vecinos: int = 16
+    prob_intercambio: float = 0.5
+    tenencia_tabu: int = 0
+    cada: int = 1
+
+    def mejorar_poblacion(self, genes: np.ndarray, duras: np.ndarray, blandas: np.ndarray,
+                          instancia: InstanciaProblema,
+                          restricciones: ConjuntoRestricciones = None,
+                          rng: np.random.Generator = None, fijas: np.ndarray = None) -> int:
+        """
+        Mejora los primeros `mejores` horarios de (genes, duras, blandas)
+        en el lugar (la población debe venir ordenada, la mejor primero).
+        Retorna la cantidad de movimientos evaluados.
+        """
+        evaluaciones = 0
+        for indice in range(min(self.mejores, len(genes))):
+            genes[indice], duras[indice], blandas[indice], probados = self.mejorar(
+                genes[indice], instancia, restricciones, rng, fijas
+            )
+            evaluaciones += probados
+        return evaluaciones
+
+    def mejorar(self, genes: np.ndarray, instancia: InstanciaProblema,
+                restricciones: ConjuntoRestricciones = None,
+                rng: np.random.Generator = None, fijas: np.ndarray = None):
+        """Retorna (genes, dura, blanda, movimientos evaluados) de la mejor solución vista"""
+        rng = obtener_generador(rng)
+        restricciones = restricciones or RESTRICCIONES_POR_DEFECTO
+        if restricciones is RESTRICCIONES_POR_DEFECTO:
+            vecindario = _VecindarioIncremental(genes, instancia)
+        else:
+            vecindario = _VecindarioPorLotes(genes, instancia, restricciones)
+
+        actual = vecindario.aptitud
+        mejor = (actual, vecindario.genes.copy(), vecindario.penalizaciones)
+        tabu_hasta = np.zeros(vecindario.genes.shape, dtype=np.int64)
+        libres = None if fijas is None else np.flatnonzero(~np.asarray(fijas))
+        evaluaciones = 0
+        if libres is not None and len(libres) == 0:
+            return mejor[1], *mejor[2], evaluaciones
+
+        for iteracion in range(self.iteraciones):
+            movimientos = self._sortear_movimientos(vecindario.genes, rng, fijas, libres)
+            if not movimientos:
+                continue
+            aptitudes = vecindario.probar(movimientos)
+            evaluaciones += len(movimientos)
+
+            # Movimientos tabú solo si superan a la mejor solución vista (aspiración)
+            permitidos = np.array([
+                aptitud > mejor[0] or all(tabu_hasta[e, d] <= iteracion for e, d, _ in movimiento)
+                for movimiento, aptitud in zip(movimientos, aptitudes)
+            ])
+            if not permitidos.any():
+                continue
+            elegido = int(np.argmax(np.where(permitidos, aptitudes, -np.inf)))
+            if self.tenencia_tabu == 0 and aptitudes[elegido] <= actual:
+                continue
+
+            vecindario.aplicar(movimientos[elegido])
+            actual = aptitudes[elegido]
+            for enfermera, dia, _ in movimientos[elegido]:
+                tabu_hasta[enfermera, dia] = iteracion + 1 + self.tenencia_tabu
+            if actual > mejor[0]:
+                mejor = (actual, vecindario.genes.copy(), vecindario.penalizaciones)
+
+        _, genes_mejor, (dura, blanda) = mejor
+        return genes_mejor, dura, blanda, evaluaciones
+
+    def _sortear_movimientos(self, genes: np.ndarray, rng: np.random.Generator,
+                             fijas: np.ndarray = None, libres: np.ndarray = None) -> List[Movimiento]:
+        """`libres`: índices planos de las celdas que no están en `fijas`"""
+        num_enfermeras, num_dias = genes.shape
+        enfermeras = rng.integers(0, num_enfermeras, size=(self.vecinos, 2))
+        if libres is None:
+            dias = rng.integers(0, num_dias, size=self.vecinos)
+        else:
+            # La primera celda se sortea entre las libres
+            enfermeras[:, 0], dias = np.divmod(rng.choice(libres, size=self.vecinos), num_dias)
+        desplazamientos = rng.integers(1, 4, size=self.vecinos)
+        intercambios = rng.random(self.vecinos) < self.prob_intercambio
+
+        movimientos = []
+        for (a, b), dia, desplazamiento, intercambio in zip(enfermeras, dias, desplazamientos, intercambios):
+            a, b, dia = int(a), int(b), int(dia)
+            turno_a, turno_b = int(genes[a, dia]), int(genes[b, dia])
+            if not intercambio:
+                movimientos.append(((a, dia, (turno_a + int(desplazamiento)) % 4),))
+            elif turno_a != turno_b and (fijas is None or not fijas[b, dia]):
+                movimientos.append(((a, dia, turno_b), (b, dia, turno_a)))
+        return movimientos
@@ -0,0 +1,87 @@
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+import algoritmo_genetico
+from instancia import InstanciaProblema
+
+# ============================================
+# CACHÉ DE APTITUD (MEMOIZACIÓN POR GENOMA)
+# ============================================
+
+
+class CacheAptitud:
+    """
+    Evaluador que recuerda las penalizaciones de los horarios ya evaluados.
+
+    Con elitismo, copias sin cruce y tasas de mutación bajas, muchos hijos son
+    idénticos a horarios ya evaluados. La clave es un hash blake2b de los
+    genes empaquetados a 2 bits; solo los horarios nuevos (sin repetir dentro
+    del lote) pasan al `evaluador` envuelto. Guarda como máximo
+    `max_elementos` entradas y descarta las usadas hace más tiempo.
+
+    Las penalizaciones dependen de la instancia, así que si se llama con otra
+    instancia el caché se vacía.
+    """
+
+    def __init__(self, max_elementos: int = 10000, evaluador: Callable = None):
+        self.max_elementos = max_elementos
+        self.evaluador = evaluador or algoritmo_genetico.calcular_penalizaciones_poblacion
+        self._datos = OrderedDict()  # clave -> (dura, blanda)
+        self._instancia = None
+        self._contadores = {'aciertos': 0, 'fallos': 0, 'expulsiones_lru': 0}
+
+    def __call__(self, genes: np.ndarray,
+                 instancia: InstanciaProblema) -> Tuple[np.ndarray, np.ndarray]:
+        if genes.ndim == 2:
+            duras, blandas = self(genes[np.newaxis], instancia)
+            return duras[0], blandas[0]
+
+        if instancia is not self._instancia:
+            self._datos.clear()
+            self._instancia = instancia
+
+        claves = [hashlib.blake2b(fila.tobytes(), digest_size=16).digest()
+                  for fila in algoritmo_genetico.empaquetar_poblacion(genes)]
+
+        # Índices a evaluar: la primera aparición de cada clave desconocida
+        nuevos: Dict[bytes, int] = {}
+        for indice, clave in enumerate(claves):
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self._contadores['aciertos'] += 1
+            elif clave in nuevos:
+                self._contadores['aciertos'] += 1
+            else:
+                nuevos[clave] = indice
+                self._contadores['fallos'] += 1
+
+        if nuevos:
+            duras_nuevas, blandas_nuevas = self.evaluador(genes[list(nuevos.values())], instancia)
+            for clave, dura, blanda in zip(nuevos, duras_nuevas, blandas_nuevas):
+                self._datos[clave] = (dura, blanda)
+
+        # Los valores guardados conservan el tipo del evaluador (enteros o
+        # flotantes: las blandas de main_2 no se truncan)
+        valores = [self._datos[clave] for clave in claves]
+        self._purgar()
+        return np.array([dura for dura, _ in valores]), np.array([blanda for _, blanda in valores])
+
+    def metricas(self) -> Dict[str, float]:
+        """Aciertos, fallos, expulsiones, tamaño actual y tasa de aciertos"""
+        consultas = self._contadores['aciertos'] + self._contadores['fallos']
+        return dict(
+            self._contadores,
+            elementos=len(self._datos),
+            tasa_aciertos=self._contadores['aciertos'] / consultas if consultas else 0.0
+        )
+
+    def limpiar(self):
+        self._datos.clear()
+
+    def _purgar(self):
+        while len(self._datos) > self.max_elementos:
+            self._datos.popitem(last=False)
+            self._contadores['expulsiones_lru'] += 1
@@ -0,0 +1,199 @@
+import numpy as np
+from typing import Iterable, Tuple
+
+from algoritmo_genetico import Horario, NUM_TURNOS
+from instancia import InstanciaProblema
+from restricciones import desviacion_desde_momentos, _longitud_rachas
+
+# ============================================
+# EVALUACIÓN INCREMENTAL (DELTA) DE LA APTITUD
+# ============================================
+
+MAX_DIAS_CONSECUTIVOS = 6
+COBERTURA_MINIMA = 2
+
+
+def _exceso_racha(longitud: int) -> int:
+    """Días que una racha de trabajo supera el máximo permitido."""
+    return max(0, longitud - MAX_DIAS_CONSECUTIVOS)
+
+
+class EvaluadorIncremental:
+    """
+    Mantiene las estadísticas de un horario ya evaluado (cobertura por día y
+    turno, especialistas presentes, días trabajados y noches por enfermera,
+    rachas de trabajo y preferencias) para recalcular su aptitud tras cambiar
+    unas pocas celdas en O(cambios) en lugar de O(NUM_ENFERMERAS * NUM_DIAS).
+
+    Produce exactamente las mismas penalizaciones que calcular_aptitud.
+    """
+
+    def __init__(self, genes: np.ndarray, instancia: InstanciaProblema):
+        self.genes = np.array(genes, dtype=np.uint8)
+        self.num_enfermeras = instancia.num_enfermeras
+        self.num_dias = instancia.num_dias
+        self.es_especialista = instancia.mascara_especialistas
+        self.preferencia = instancia.mascara_preferencias
+
+        trabajando = self.genes != 0
+        noches = self.genes == 3
+
+        # Conteos por día y turno (columna 0 = libres, no se penaliza)
+        self.cobertura = np.zeros((self.num_dias, NUM_TURNOS), dtype=np.int64)
+        self.especialistas_turno = np.zeros((self.num_dias, NUM_TURNOS), dtype=np.int64)
+        for turno in range(NUM_TURNOS):
+            en_turno = self.genes == turno
+            self.cobertura[:, turno] = en_turno.sum(axis=0)
+            self.especialistas_turno[:, turno] = en_turno[self.es_especialista].sum(axis=0)
+
+        self.dias_trabajados = trabajando.sum(axis=1).astype(np.int64)
+        self.noches = noches.sum(axis=1).astype(np.int64)
+
+        # Totales de cada restricción
+        self.noche_manana = int(np.count_nonzero(noches[:, :-1] & (self.genes[:, 1:] == 1)))
+        self.exceso_consecutivos = int(np.count_nonzero(
+            _longitud_rachas(trabajando) > MAX_DIAS_CONSECUTIVOS))
+        self.turnos_sin_especialista = int(np.count_nonzero(self.especialistas_turno[:, 1:] == 0))
+        self.faltantes_cobertura = int(np.maximum(COBERTURA_MINIMA - self.cobertura[:, 1:], 0).sum())
+        self.preferencias_violadas = int(np.count_nonzero(self.preferencia & trabajando))
+
+        self.suma_dias = int(self.dias_trabajados.sum())
+        self.suma_cuadrados_dias = int((self.dias_trabajados ** 2).sum())
+        self.suma_noches = int(self.noches.sum())
+        self.suma_cuadrados_noches = int((self.noches ** 2).sum())
+
+    @classmethod
+    def desde_horario(cls, horario: Horario, instancia: InstanciaProblema) -> 'EvaluadorIncremental':
+        """Construye el evaluador a partir de un Horario."""
+        return cls(horario.genes, instancia)
+
+    # -------- PENALIZACIONES --------
+
+    @property
+    def penalizacion_dura(self) -> int:
+        return (self.noche_manana * 50 + self.exceso_consecutivos * 30 +
+                self.turnos_sin_especialista * 40 + self.faltantes_cobertura * 20)
+
+    @property
+    def penalizacion_blanda(self) -> int:
+        desviacion_dias = desviacion_desde_momentos(
+            self.num_enfermeras, self.suma_dias, self.suma_cuadrados_dias)
+        desviacion_noches = desviacion_desde_momentos(
+            self.num_enfermeras, self.suma_noches, self.suma_cuadrados_noches)
+        return (self.preferencias_violadas * 5 +
+                int(desviacion_dias * 3) + int(desviacion_noches * 5))
+
+    @property
+    def aptitud(self) -> int:
+        return -(self.penalizacion_dura * 100 + self.penalizacion_blanda)
+
+    def aplicar_a(self, horario: Horario):
+        """Copia genes y penalizaciones actuales al Horario."""
+        horario.genes = self.genes.copy()
+        horario.penalizacion_dura = self.penalizacion_dura
+        horario.penalizacion_blanda = self.penalizacion_blanda
+        horario.aptitud = self.aptitud
+
+    # -------- CAMBIOS --------
+
+    def aplicar_cambios(self, cambios: Iterable[Tuple[int, int, int]]) -> int:
+        """
+        Aplica cambios (enfermera, dia, nuevo_turno) y retorna la nueva aptitud.
+        """
+        for enfermera, dia, turno in cambios:
+            self._cambiar_celda(enfermera, dia, turno)
+        return self.aptitud
+
+    def actualizar(self, genes: np.ndarray, celdas: Iterable[Tuple[int, int]]) -> int:
+        """
+        Sincroniza con `genes`, sabiendo que solo difieren en `celdas`
+        (lista de (enfermera, dia), p. ej. las que cambió una mutación).
+        """
+        return self.aplicar_cambios((e, d, genes[e, d]) for e, d in celdas)
+
+    def probar_cambios(self, cambios: Iterable[Tuple[int, int, int]]) -> int:
+        """
+        Retorna la aptitud que tendría el horario con los cambios aplicados,
+        dejando el evaluador en su estado original.
+        """
+        deshacer = [(e, d, self._cambiar_celda(e, d, turno)) for e, d, turno in cambios]
+        aptitud = self.aptitud
+        for enfermera, dia, turno in reversed(deshacer):
+            self._cambiar_celda(enfermera, dia, turno)
+        return aptitud
+
+    def _cambiar_celda(self, enfermera: int, dia: int, nuevo: int) -> int:
+        """Asigna un turno a una celda actualizando los totales. Retorna el turno anterior."""
+        fila = self.genes[enfermera]
+        viejo = int(fila[dia])
+        nuevo = int(nuevo)
+        if viejo == nuevo:
+            return viejo
+
+        # Noche -> Mañana con el día anterior y el siguiente
+        self.noche_manana -= self._noche_manana_alrededor(fila, dia)
+        fila[dia] = nuevo
+        self.noche_manana += self._noche_manana_alrededor(fila, dia)
+        fila[dia] = viejo
+
+        # Cobertura y especialistas del día
+        self.faltantes_cobertura -= self._faltantes_dia(dia)
+        self.turnos_sin_especialista -= self._sin_especialista_dia(dia)
+        self.cobertura[dia, viejo] -= 1
+        self.cobertura[dia, nuevo] += 1
+        if self.es_especialista[enfermera]:
+            self.especialistas_turno[dia, viejo] -= 1
+            self.especialistas_turno[dia, nuevo] += 1
+        self.faltantes_cobertura += self._faltantes_dia(dia)
+        self.turnos_sin_especialista += self._sin_especialista_dia(dia)
+
+        # Noches por enfermera
+        delta_noches = (nuevo == 3) - (viejo == 3)
+        if delta_noches:
+            noches = int(self.noches[enfermera])
+            self.noches[enfermera] = noches + delta_noches
+            self.suma_noches += delta_noches
+            self.suma_cuadrados_noches += (noches + delta_noches) ** 2 - noches ** 2
+
+        # Días trabajados, rachas y preferencias
+        if (viejo != 0) != (nuevo != 0):
+            delta = 1 if nuevo != 0 else -1
+            dias = int(self.dias_trabajados[enfermera])
+            self.dias_trabajados[enfermera] = dias + delta
+            self.suma_dias += delta
+            self.suma_cuadrados_dias += (dias + delta) ** 2 - dias ** 2
+            self.preferencias_violadas += delta * int(self.preferencia[enfermera, dia])
+
+            izquierda, derecha = self._rachas_vecinas(fila, dia)
+            separadas = _exceso_racha(izquierda) + _exceso_racha(derecha)
+            unidas = _exceso_racha(izquierda + 1 + derecha)
+            self.exceso_consecutivos += delta * (unidas - separadas)
+
+        fila[dia] = nuevo
+        return viejo
+
+    def _noche_manana_alrededor(self, fila: np.ndarray, dia: int) -> int:
+        cuenta = 0
+        if dia > 0 and fila[dia - 1] == 3 and fila[dia] == 1:
+            cuenta += 1
+        if dia < self.num_dias - 1 and fila[dia] == 3 and fila[dia + 1] == 1:
+            cuenta += 1
+        return cuenta
+
+    # Tres turnos por día: aritmética de Python, más rápida que numpy en arreglos tan chicos
+    def _faltantes_dia(self, dia: int) -> int:
+        return sum(max(COBERTURA_MINIMA - cantidad, 0) for cantidad in self.cobertura[dia, 1:].tolist())
+
+    def _sin_especialista_dia(self, dia: int) -> int:
+        return self.especialistas_turno[dia, 1:].tolist().count(0)
+
+    @staticmethod
+    def _rachas_vecinas(fila: np.ndarray, dia: int) -> Tuple[int, int]:
+        """Días trabajados seguidos justo antes y justo después de `dia`."""
+        izquierda = 0
+        while dia - izquierda - 1 >= 0 and fila[dia - izquierda - 1] != 0:
+            izquierda += 1
+        derecha = 0
+        while dia + derecha + 1 < len(fila) and fila[dia + derecha + 1] != 0:
+            derecha += 1
+        return izquierda, derecha
@@ -0,0 +1,81 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Tuple
+
+import algoritmo_genetico
+from instancia import InstanciaProblema
+
+# ============================================
+# EVALUACIÓN PARALELA DE LA POBLACIÓN
+# ============================================
+
+
+def _evaluar_bloque(nombre: str, forma: Tuple[int, ...], dtype: str, inicio: int, fin: int,
+                    instancia: InstanciaProblema, evaluador: Callable) -> Tuple[np.ndarray, np.ndarray]:
+    """Evalúa los horarios [inicio, fin) de la población en memoria compartida."""
+    # Los procesos del pool comparten el resource_tracker del padre, que es
+    # quien libera el bloque con unlink()
+    memoria = shared_memory.SharedMemory(name=nombre)
+    genes = np.ndarray(forma, dtype=dtype, buffer=memoria.buf)
+    try:
+        return evaluador(genes[inicio:fin], instancia)
+    finally:
+        del genes
+        memoria.close()
+
+
+class EvaluadorParalelo:
+    """
+    Reparte la evaluación de una población entre varios procesos.
+
+    Los genes se copian una vez por llamada a un bloque de memoria compartida
+    y cada proceso evalúa un rango contiguo de horarios, así que solo viajan
+    entre procesos los vectores de penalizaciones y la instancia. La
+    evaluación no consume números aleatorios, por lo que el resultado es
+    idéntico al serial.
+
+    `evaluador` es la función (genes, instancia) -> (duras, blandas) que
+    corre en cada proceso (por defecto calcular_penalizaciones_poblacion;
+    p. ej. un ConjuntoRestricciones). Debe poder serializarse con pickle.
+    """
+
+    def __init__(self, num_procesos: int, evaluador: Callable = None):
+        self.num_procesos = num_procesos
+        self.evaluador = evaluador or algoritmo_genetico.calcular_penalizaciones_poblacion
+        self._executor = ProcessPoolExecutor(max_workers=num_procesos)
+
+    def __call__(self, genes: np.ndarray,
+                 instancia: InstanciaProblema) -> Tuple[np.ndarray, np.ndarray]:
+        genes = np.ascontiguousarray(genes)
+        num_bloques = min(self.num_procesos, len(genes))
+        if num_bloques <= 1:
+            return self.evaluador(genes, instancia)
+
+        memoria = shared_memory.SharedMemory(create=True, size=genes.nbytes)
+        try:
+            np.ndarray(genes.shape, dtype=genes.dtype, buffer=memoria.buf)[:] = genes
+            limites = np.linspace(0, len(genes), num_bloques + 1).astype(int)
+            futuros = [
+                self._executor.submit(_evaluar_bloque, memoria.name, genes.shape,
+                                      genes.dtype.str, inicio, fin, instancia, self.evaluador)
+                for inicio, fin in zip(limites[:-1], limites[1:])
+            ]
+            resultados = [futuro.result() for futuro in futuros]
+        finally:
+            memoria.close()
+            memoria.unlink()
+
+        duras = np.concatenate([duras for duras, _ in resultados])
+        blandas = np.concatenate([blandas for _, blandas in resultados])
+        return duras, blandas
+
+    def cerrar(self):
+        """Termina los procesos del pool."""
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
@@ -0,0 +1,444 @@
+import importlib.util
+import threading
+import time
+import numpy as np
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Callable, Optional, Tuple
+
+from instancia import InstanciaProblema
+from operadores import LIBRE, MANANA, TARDE, NOCHE, obtener_generador, mutacion_poblacion
+from restricciones import (ConjuntoRestricciones, NocheManana, DiasConsecutivos, EspecialistasPorTurno,
+                           CoberturaMinima, MaxNoches, PreferenciasLibres, EquidadCarga, DistribucionNoches,
+                           RESTRICCIONES_POR_DEFECTO)
+
+# ============================================
+# SOLUCIONADOR EXACTO (INSTANCIAS PEQUEÑAS)
+# ============================================
+#
+# Busca un horario sin penalizaciones duras con las mismas restricciones
+# duras del ConjuntoRestricciones. Hay dos métodos:
+#
+# - 'ramificacion': búsqueda en profundidad día por día en Python puro. Cada
+#   día se asigna exactamente el mínimo de cada turno (Noche, Mañana, Tarde)
+#   y el resto queda Libre: pasar a Libre a alguien que sobra nunca agrega
+#   violaciones duras, así que si existe un horario sin penalizaciones duras
+#   existe uno de esta forma y agotar la búsqueda prueba que no lo hay. Se
+#   poda con la capacidad que les queda a las enfermeras (rachas y noches)
+#   frente a la demanda de los días que faltan.
+# - 'cpsat': el modelo CP-SAT de OR-Tools, si está instalado
+#   (pip install ortools), que además minimiza una aproximación lineal de las
+#   blandas (preferencias y diferencia entre la más y la menos cargada) y
+#   usa todo su tiempo salvo que pruebe el óptimo de esa aproximación.
+#
+# 'auto' prueba primero la ramificación (suele encontrar un horario en
+# milisegundos) y pasa a CP-SAT, si está, cuando se le agota su mitad del
+# tiempo.
+#
+# Las blandas exactas (desviaciones estándar) quedan para el AG: el
+# resultado siembra la población inicial (ver sembrar_poblacion).
+
+# Instancias con hasta estas celdas (enfermeras x días) usan el método exacto en modo 'auto'
+MAX_CELDAS_EXACTO = 600
+
+# Segundos entre consultas a `debe_detenerse` (puede ser una llamada entre procesos)
+INTERVALO_DETENCION = 0.1
+
+ORDEN_TURNOS = (NOCHE, MANANA, TARDE)
+
+
+def cpsat_disponible() -> bool:
+    return importlib.util.find_spec('ortools') is not None
+
+
+def es_instancia_pequena(instancia: InstanciaProblema, max_celdas: int = MAX_CELDAS_EXACTO) -> bool:
+    return instancia.num_enfermeras * instancia.num_dias <= max_celdas
+
+
+@dataclass(frozen=True)
+class ModeloDuro:
+    """Las restricciones duras de un ConjuntoRestricciones en la forma que usan los métodos exactos"""
+    minimos: Tuple[int, int, int]         # enfermeras por turno (Mañana, Tarde, Noche)
+    min_especialistas: int = 0
+    solo_turnos_ocupados: bool = False
+    max_consecutivos: Optional[int] = None
+    noche_manana: bool = False
+    max_noches: Optional[Tuple[int, ...]] = None   # uno por enfermera
+
+    @classmethod
+    def desde_restricciones(cls, restricciones: ConjuntoRestricciones, num_enfermeras: int) -> 'ModeloDuro':
+        conocidas = (NocheManana, DiasConsecutivos, EspecialistasPorTurno, CoberturaMinima, MaxNoches)
+        otras = [r.nombre for r in restricciones.duras if not isinstance(r, conocidas)]
+        if otras:
+            raise ValueError(f"El método exacto no admite las restricciones duras: {', '.join(otras)}")
+
+        cobertura = restricciones.buscar(CoberturaMinima)
+        especialistas = restricciones.buscar(EspecialistasPorTurno)
+        consecutivos = restricciones.buscar(DiasConsecutivos)
+        noches = restricciones.buscar(MaxNoches)
+        return cls(
+            minimos=tuple(int(m) for m in cobertura.minimos) if cobertura else (0, 0, 0),
+            min_especialistas=especialistas.minimo if especialistas else 0,
+            solo_turnos_ocupados=especialistas.solo_turnos_ocupados if especialistas else False,
+            max_consecutivos=consecutivos.maximo if consecutivos else None,
+            noche_manana=restricciones.buscar(NocheManana) is not None,
+            max_noches=(tuple(int(m) for m in np.broadcast_to(noches.maximos, num_enfermeras))
+                        if noches else None)
+        )
+
+    def requeridas(self, turno: int) -> Tuple[int, int]:
+        """(enfermeras, especialistas) que hay que asignar a `turno` cada día"""
+        minimo = self.minimos[turno - MANANA]
+        especialistas = self.min_especialistas if minimo > 0 or not self.solo_turnos_ocupados else 0
+        return max(minimo, especialistas), especialistas
+
+
+@dataclass
+class ResultadoExacto:
+    genes: Optional[np.ndarray]   # (N, D); con 'sin_solucion', válido en los primeros dias_asignados días
+    estado: str                   # 'factible', 'infactible' (probado) o 'sin_solucion' (se agotó el tiempo)
+    metodo: str
+    segundos: float
+    dias_asignados: int = 0
+    nodos: int = 0
+
+    def como_dict(self) -> dict:
+        return {'estado': self.estado, 'metodo': self.metodo, 'segundos': round(self.segundos, 3),
+                'dias_asignados': self.dias_asignados, 'nodos': self.nodos}
+
+
+# ============================================
+# RAMIFICACIÓN Y PODA
+# ============================================
+
+
+class _Interrumpida(Exception):
+    """Se agotó el tiempo o `debe_detenerse` pidió terminar"""
+
+
+def _capacidad(racha: int, dias: int, maximo: Optional[int]) -> int:
+    """Días que puede trabajar en los próximos `dias` alguien que lleva `racha` días seguidos"""
+    if maximo is None:
+        return dias
+    primero = min(maximo - racha, dias)
+    resto = dias - primero
+    if resto == 0:
+        return primero
+    resto -= 1  # el día libre que corta la racha
+    return primero + (resto // (maximo + 1)) * maximo + min(resto % (maximo + 1), maximo)
+
+
+class _RamificacionYPoda:
+    """Búsqueda en profundidad día por día (ver el comentario del módulo)"""
+
+    def __init__(self, modelo: ModeloDuro, instancia: InstanciaProblema, limite: float,
+                 debe_detenerse: Callable[[], Optional[str]] = None):
+        self.modelo = modelo
+        self.num_enfermeras, self.num_dias = instancia.num_enfermeras, instancia.num_dias
+        self.especialista = instancia.mascara_especialistas.tolist()
+        self.prefiere_libre = instancia.mascara_preferencias.T.tolist()  # [día][enfermera]
+        self.max_noches = modelo.max_noches
+        self.requeridas = {turno: modelo.requeridas(turno) for turno in ORDEN_TURNOS}
+        self.demanda = sum(total for total, _ in self.requeridas.values())
+        self.demanda_especialistas = sum(esp for _, esp in self.requeridas.values())
+        self.limite = limite
+        self.debe_detenerse = debe_detenerse
+        self._proxima_consulta = 0.0
+        self.nodos = 0
+
+        self.genes = np.zeros((self.num_enfermeras, self.num_dias), dtype=np.uint8)
+        self.parcial = self.genes.copy()
+        self.dias_parcial = 0
+        # Estado de cada enfermera al terminar el último día asignado
+        self.racha = [0] * self.num_enfermeras
+        self.ultimo = [LIBRE] * self.num_enfermeras
+        self.noches = [0] * self.num_enfermeras
+        self.trabajados = [0] * self.num_enfermeras
+
+    def resolver(self) -> bool:
+        return self._cota(0) and self._dia(0)
+
+    def _dia(self, dia: int) -> bool:
+        if dia == self.num_dias:
+            return True
+        for asignacion in self._asignaciones(dia):
+            ahora = time.perf_counter()
+            if ahora > self.limite:
+                raise _Interrumpida
+            if self.debe_detenerse is not None and ahora >= self._proxima_consulta:
+                self._proxima_consulta = ahora + INTERVALO_DETENCION
+                if self.debe_detenerse():
+                    raise _Interrumpida
+            self.nodos += 1
+            anterior = self._aplicar(dia, asignacion)
+            if dia + 1 > self.dias_parcial:
+                self.dias_parcial = dia + 1
+                self.parcial[:, :dia + 1] = self.genes[:, :dia + 1]
+            if self._cota(dia + 1) and self._dia(dia + 1):
+                return True
+            self.racha, self.ultimo, self.noches, self.trabajados = anterior
+        return False
+
+    def _puede(self, enfermera: int, turno: int) -> bool:
+        modelo = self.modelo
+        if modelo.max_consecutivos is not None and self.racha[enfermera] >= modelo.max_consecutivos:
+            return False
+        if turno == NOCHE and self.max_noches is not None:
+            return self.noches[enfermera] < self.max_noches[enfermera]
+        if turno == MANANA and modelo.noche_manana:
+            return self.ultimo[enfermera] != NOCHE
+        return True
+
+    def _costo(self, enfermera: int, turno: int, dia: int):
+        """Orden de las candidatas: respetar preferencias, repartir la carga y cortar rachas largas"""
+        carga = self.trabajados[enfermera] + (self.noches[enfermera] if turno == NOCHE else 0)
+        return self.prefiere_libre[dia][enfermera], carga, self.racha[enfermera]
+
+    def _asignaciones(self, dia: int):
+        """Asignaciones {enfermera: turno} del día que cubren exactamente los mínimos"""
+        usadas = set()
+
+        def elegir(indice):
+            if indice == len(ORDEN_TURNOS):
+                yield {}
+                return
+            turno = ORDEN_TURNOS[indice]
+            total, especialistas = self.requeridas[turno]
+            candidatas = sorted((e for e in range(self.num_enfermeras) if e not in usadas and self._puede(e, turno)),
+                                key=lambda e: self._costo(e, turno, dia))
+            for grupo in combinations(candidatas, total):
+                if sum(self.especialista[e] for e in grupo) < especialistas:
+                    continue
+                usadas.update(grupo)
+                for resto in elegir(indice + 1):
+                    resto.update(dict.fromkeys(grupo, turno))
+                    yield resto
+                usadas.difference_update(grupo)
+
+        return elegir(0)
+
+    def _aplicar(self, dia: int, asignacion: dict):
+        """Asigna el día y retorna el estado anterior para deshacerlo"""
+        anterior = self.racha, self.ultimo, self.noches, self.trabajados
+        self.racha, self.ultimo = self.racha.copy(), self.ultimo.copy()
+        self.noches, self.trabajados = self.noches.copy(), self.trabajados.copy()
+        columna = self.genes[:, dia]
+        for enfermera in range(self.num_enfermeras):
+            turno = asignacion.get(enfermera, LIBRE)
+            columna[enfermera] = turno
+            self.ultimo[enfermera] = turno
+            if turno == LIBRE:
+                self.racha[enfermera] = 0
+            else:
+                self.racha[enfermera] += 1
+                self.trabajados[enfermera] += 1
+                self.noches[enfermera] += turno == NOCHE
+        return anterior
+
+    def _cota(self, dia: int) -> bool:
+        """¿Alcanza la capacidad que queda para la demanda de los días que faltan?"""
+        restantes = self.num_dias - dia
+        if restantes == 0:
+            return True
+        capacidad = [_capacidad(racha, restantes, self.modelo.max_consecutivos) for racha in self.racha]
+        # Mañana: enfermeras (y especialistas) que pueden trabajar
+        manana = [_capacidad(racha, 1, self.modelo.max_consecutivos) for racha in self.racha]
+        if sum(manana) < self.demanda or \
+                sum(m for m, es in zip(manana, self.especialista) if es) < self.demanda_especialistas:
+            return False
+        if sum(capacidad) < self.demanda * restantes:
+            return False
+        if self.demanda_especialistas and sum(c for c, es in zip(capacidad, self.especialista)
+                                              if es) < self.demanda_especialistas * restantes:
+            return False
+        if self.max_noches is not None:
+            noches = [min(c, maximo - usadas) for c, maximo, usadas
+                      in zip(capacidad, self.max_noches, self.noches)]
+            total, especialistas = self.requeridas[NOCHE]
+            if sum(noches) < total * restantes or \
+                    sum(n for n, es in zip(noches, self.especialista) if es) < especialistas * restantes:
+                return False
+        return True
+
+
+def _resolver_ramificacion(modelo: ModeloDuro, instancia: InstanciaProblema, tiempo_maximo: float,
+                           debe_detenerse: Callable[[], Optional[str]] = None) -> ResultadoExacto:
+    inicio = time.perf_counter()
+    busqueda = _RamificacionYPoda(modelo, instancia, inicio + tiempo_maximo, debe_detenerse)
+    try:
+        estado = 'factible' if busqueda.resolver() else 'infactible'
+    except _Interrumpida:
+        estado = 'sin_solucion'
+    segundos = time.perf_counter() - inicio
+
+    if estado == 'factible':
+        return ResultadoExacto(busqueda.genes, estado, 'ramificacion', segundos, instancia.num_dias, busqueda.nodos)
+    if estado == 'infactible':
+        return ResultadoExacto(None, estado, 'ramificacion', segundos, 0, busqueda.nodos)
+    return ResultadoExacto(busqueda.parcial, estado, 'ramificacion', segundos,
+                           busqueda.dias_parcial, busqueda.nodos)
+
+
+# ============================================
+# CP-SAT (OR-TOOLS OPCIONAL)
+# ============================================
+
+
+def _peso_entero(restricciones: ConjuntoRestricciones, tipo: type) -> int:
+    restriccion = restricciones.buscar(tipo)
+    return int(round(restriccion.peso * 10)) if restriccion else 0
+
+
+def _resolver_cpsat(modelo: ModeloDuro, instancia: InstanciaProblema, restricciones: ConjuntoRestricciones,
+                    tiempo_maximo: float, semilla: Optional[int], num_trabajadores: int,
+                    debe_detenerse: Callable[[], Optional[str]] = None) -> ResultadoExacto:
+    try:
+        from ortools.sat.python import cp_model
+    except ImportError as error:
+        raise ImportError("El método 'cpsat' necesita OR-Tools (pip install ortools)") from error
+
+    inicio = time.perf_counter()
+    enfermeras, dias = range(instancia.num_enfermeras), range(instancia.num_dias)
+    especialistas = list(instancia.especialistas)
+    cp = cp_model.CpModel()
+    x = {(e, d, t): cp.NewBoolVar(f"x_{e}_{d}_{t}") for e in enfermeras for d in dias for t in range(4)}
+
+    for e in enfermeras:
+        for d in dias:
+            cp.AddExactlyOne(x[e, d, t] for t in range(4))
+
+    for d in dias:
+        for turno in ORDEN_TURNOS:
+            minimo = modelo.minimos[turno - MANANA]
+            if minimo > 0:
+                cp.Add(sum(x[e, d, turno] for e in enfermeras) >= minimo)
+            if modelo.min_especialistas > 0:
+                cobertura = cp.Add(sum(x[e, d, turno] for e in especialistas) >= modelo.min_especialistas)
+                if modelo.solo_turnos_ocupados:
+                    ocupado = cp.NewBoolVar(f"ocupado_{d}_{turno}")
+                    cp.AddMaxEquality(ocupado, [x[e, d, turno] for e in enfermeras])
+                    cobertura.OnlyEnforceIf(ocupado)
+
+    for e in enfermeras:
+        if modelo.noche_manana:
+            for d in dias[:-1]:
+                cp.AddBoolOr([x[e, d, NOCHE].Not(), x[e, d + 1, MANANA].Not()])
+        if modelo.max_consecutivos is not None:
+            ventana = modelo.max_consecutivos + 1
+            for d in range(instancia.num_dias - ventana + 1):
+                cp.AddBoolOr([x[e, d + k, LIBRE] for k in range(ventana)])
+        if modelo.max_noches is not None:
+            cp.Add(sum(x[e, d, NOCHE] for d in dias) <= modelo.max_noches[e])
+
+    # Aproximación lineal de las blandas
+    objetivo = []
+    peso = _peso_entero(restricciones, PreferenciasLibres)
+    if peso:
+        objetivo += [peso * (1 - x[e, d, LIBRE]) for e, d in np.argwhere(instancia.mascara_preferencias).tolist()]
+    for tipo, turno in ((EquidadCarga, None), (DistribucionNoches, NOCHE)):
+        peso = _peso_entero(restricciones, tipo)
+        if peso:
+            conteos = [(instancia.num_dias - sum(x[e, d, LIBRE] for d in dias)) if turno is None
+                       else sum(x[e, d, turno] for d in dias) for e in enfermeras]
+            mayor = cp.NewIntVar(0, instancia.num_dias, f"mayor_{tipo.nombre}")
+            menor = cp.NewIntVar(0, instancia.num_dias, f"menor_{tipo.nombre}")
+            for conteo in conteos:
+                cp.Add(mayor >= conteo)
+                cp.Add(menor <= conteo)
+            objetivo.append(peso * (mayor - menor))
+    if objetivo:
+        cp.Minimize(sum(objetivo))
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = float(tiempo_maximo)
+    solver.parameters.num_workers = max(1, num_trabajadores)
+    if semilla is not None:
+        solver.parameters.random_seed = int(semilla) % 2 ** 31
+    estado = _resolver_vigilando(solver, cp, debe_detenerse)
+    segundos = time.perf_counter() - inicio
+    nodos = int(solver.NumBranches())
+
+    if estado in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        genes = np.zeros((instancia.num_enfermeras, instancia.num_dias), dtype=np.uint8)
+        for (e, d, t), variable in x.items():
+            if t != LIBRE and solver.BooleanValue(variable):
+                genes[e, d] = t
+        return ResultadoExacto(genes, 'factible', 'cpsat', segundos, instancia.num_dias, nodos)
+    if estado == cp_model.INFEASIBLE:
+        return ResultadoExacto(None, 'infactible', 'cpsat', segundos, 0, nodos)
+    return ResultadoExacto(None, 'sin_solucion', 'cpsat', segundos, 0, nodos)
+
+
+def _resolver_vigilando(solver, cp, debe_detenerse: Callable[[], Optional[str]] = None):
+    """solver.Solve(cp) deteniendo la búsqueda (StopSearch) en cuanto `debe_detenerse` retorne un motivo"""
+    if debe_detenerse is None:
+        return solver.Solve(cp)
+    terminado = threading.Event()
+
+    def vigilar():
+        while not terminado.wait(INTERVALO_DETENCION):
+            if debe_detenerse():
+                solver.StopSearch()
+                return
+
+    vigia = threading.Thread(target=vigilar, daemon=True)
+    vigia.start()
+    try:
+        return solver.Solve(cp)
+    finally:
+        terminado.set()
+        vigia.join()
+
+
+# ============================================
+# API
+# ============================================
+
+
+def resolver_exacto(instancia: InstanciaProblema, restricciones: ConjuntoRestricciones = None,
+                    tiempo_maximo: float = 5.0, metodo: str = 'auto', semilla: int = None,
+                    num_trabajadores: int = 1,
+                    debe_detenerse: Callable[[], Optional[str]] = None) -> ResultadoExacto:
+    """
+    Busca un horario sin penalizaciones duras en a lo sumo `tiempo_maximo`
+    segundos. `metodo`: 'ramificacion', 'cpsat' o 'auto' (ver el comentario
+    del módulo). Si `debe_detenerse()` retorna un motivo la búsqueda termina
+    antes, como si se agotara el tiempo. Lanza ValueError si `restricciones`
+    tiene restricciones duras que los métodos exactos no conocen.
+    """
+    restricciones = restricciones or RESTRICCIONES_POR_DEFECTO
+    modelo = ModeloDuro.desde_restricciones(restricciones, instancia.num_enfermeras)
+    if metodo == 'auto':
+        if not cpsat_disponible():
+            return _resolver_ramificacion(modelo, instancia, tiempo_maximo, debe_detenerse)
+        ramificacion = _resolver_ramificacion(modelo, instancia, tiempo_maximo / 2, debe_detenerse)
+        if ramificacion.estado != 'sin_solucion' or (debe_detenerse is not None and debe_detenerse()):
+            return ramificacion
+        cpsat = _resolver_cpsat(modelo, instancia, restricciones, tiempo_maximo - ramificacion.segundos,
+                                semilla, num_trabajadores, debe_detenerse)
+        # Sin solución de CP-SAT queda el horario parcial de la ramificación
+        mejor = ramificacion if cpsat.estado == 'sin_solucion' else cpsat
+        mejor.segundos = ramificacion.segundos + cpsat.segundos
+        return mejor
+    if metodo == 'ramificacion':
+        return _resolver_ramificacion(modelo, instancia, tiempo_maximo, debe_detenerse)
+    if metodo == 'cpsat':
+        return _resolver_cpsat(modelo, instancia, restricciones, tiempo_maximo, semilla, num_trabajadores,
+                               debe_detenerse)
+    raise ValueError(f"Método exacto desconocido: {metodo} (opciones: auto, ramificacion, cpsat)")
+
+
+def sembrar_poblacion(poblacion: np.ndarray, resultado: ResultadoExacto, prob_mutacion: float = 0.05,
+                      rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Siembra la mitad de `poblacion` (en el lugar) con los días que asignó el
+    método exacto: el primer individuo los lleva tal cual y el resto con
+    mutaciones (probabilidad `prob_mutacion`). La otra mitad no cambia.
+    """
+    if resultado.genes is None or resultado.dias_asignados == 0:
+        return poblacion
+    rng = obtener_generador(rng)
+    mitad = max(1, len(poblacion) // 2)
+    poblacion[:mitad, :, :resultado.dias_asignados] = resultado.genes[:, :resultado.dias_asignados]
+    mutacion_poblacion(poblacion[1:mitad], prob_mutacion, rng=rng)
+    return poblacion
@@ -0,0 +1,32 @@
+from typing import Optional
+
+# ============================================
+# GRÁFICOS (MATPLOTLIB OPCIONAL)
+# ============================================
+#
+# matplotlib se importa recién al graficar: el servidor y los procesos de
+# trabajo no lo cargan nunca. Con un archivo la figura se dibuja sin pyplot
+# (no se abre ninguna ventana ni se elige un backend gráfico).
+
+
+def nueva_figura(archivo: Optional[str] = None):
+    """(figura, ejes) para graficar; con `archivo`, una figura sin ventana."""
+    try:
+        if archivo is not None:
+            from matplotlib.figure import Figure
+            figura = Figure(figsize=(10, 6))
+        else:
+            import matplotlib.pyplot as plt
+            figura = plt.figure(figsize=(10, 6))
+    except ImportError as error:
+        raise ImportError("Se necesita matplotlib para graficar (pip install matplotlib)") from error
+    return figura, figura.add_subplot()
+
+
+def mostrar_o_guardar(figura, archivo: Optional[str] = None):
+    """Guarda la figura en `archivo` (formato según la extensión: .png, .svg, ...) o la muestra."""
+    if archivo is not None:
+        figura.savefig(archivo, bbox_inches='tight')
+    else:
+        import matplotlib.pyplot as plt
+        plt.show()
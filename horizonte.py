@@ -0,0 +1,166 @@
+import copy
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+from busqueda_local import BusquedaLocal
+from instancia import InstanciaProblema
+from operadores import NOCHE, obtener_generador
+from replanificacion import CeldasFijas
+from restricciones import ConjuntoRestricciones, DiasConsecutivos, MaxNoches, RESTRICCIONES_POR_DEFECTO
+from solucionador import Solucionador, EstrategiaGenetica, CriteriosParada, ESTRATEGIA_AG
+
+# ============================================
+# HORIZONTE RODANTE (PERÍODOS LARGOS POR VENTANAS)
+# ============================================
+#
+# En lugar de un cromosoma con todos los días, el horizonte se resuelve en
+# ventanas de `dias_ventana` días que se solapan `solape` días: de cada
+# ventana se fijan los primeros dias_ventana - solape días y los del solape
+# se vuelven a optimizar (sembrados con la solución anterior) en la
+# siguiente. Cada ventana lleva delante, como celdas fijas, los últimos
+# días ya fijados (tantos como el máximo de días consecutivos), así que las
+# rachas y los pares Noche→Mañana que cruzan el borde se penalizan igual que
+# en el horario completo. El costo por ventana es constante: el tiempo crece
+# linealmente con el número de días.
+#
+# El máximo de noches es para todo el horizonte: cada ventana lo recibe
+# descontando las noches ya fijadas antes de su contexto. Las demás
+# restricciones globales (equidad y distribución) se evalúan dentro de cada
+# ventana; el resultado final se evalúa sobre todo el horizonte.
+
+
+@dataclass
+class ResultadoHorizonte:
+    """Horario completo (N, D), su evaluación sobre todo el horizonte y el detalle por ventana"""
+    genes: np.ndarray
+    dura: float
+    blanda: float
+    aptitud: float
+    ventanas: List[Dict] = field(default_factory=list)
+
+    @property
+    def generaciones(self) -> int:
+        return sum(ventana['generaciones'] for ventana in self.ventanas)
+
+    @property
+    def motivo_parada(self) -> str:
+        """Motivos de parada de las ventanas, sin repetir y separados por comas"""
+        return ','.join(dict.fromkeys(ventana['motivo_parada'] for ventana in self.ventanas))
+
+
+def ventanas_horizonte(num_dias: int, dias_ventana: int = 28, solape: int = 7) -> List[Tuple[int, int, int]]:
+    """(inicio, fin, fin_fijado) de cada ventana: se optimiza [inicio, fin) y se fija [inicio, fin_fijado)"""
+    if not 0 <= solape < dias_ventana:
+        raise ValueError(f"El solape ({solape}) debe ser menor que la ventana ({dias_ventana})")
+    ventanas = []
+    inicio = 0
+    while inicio < num_dias:
+        fin = min(inicio + dias_ventana, num_dias)
+        fin_fijado = fin if fin == num_dias else fin - solape
+        ventanas.append((inicio, fin, fin_fijado))
+        inicio = fin_fijado
+    return ventanas
+
+
+def subinstancia(instancia: InstanciaProblema, desde: int, hasta: int) -> InstanciaProblema:
+    """La instancia restringida a los días [desde, hasta) (renumerados desde 0)"""
+    preferencias = {enfermera: [dia - desde for dia in dias if desde <= dia < hasta]
+                    for enfermera, dias in instancia.preferencias}
+    return InstanciaProblema.crear(instancia.num_enfermeras, hasta - desde,
+                                   instancia.especialistas, preferencias)
+
+
+def restricciones_ventana(restricciones: ConjuntoRestricciones,
+                          noches_previas: np.ndarray) -> ConjuntoRestricciones:
+    """Las restricciones con el máximo de noches de cada enfermera reducido en `noches_previas` (N,)"""
+    max_noches = restricciones.buscar(MaxNoches)
+    if max_noches is None or not np.any(noches_previas):
+        return restricciones
+    restante = copy.copy(max_noches)
+    restante.maximos = np.maximum(np.asarray(max_noches.maximos) - noches_previas, 0)
+    return ConjuntoRestricciones(
+        [restante if r is max_noches else r for r in restricciones.restricciones],
+        restricciones.peso_duras, restricciones.peso_blandas, restricciones.umbral_optimo
+    )
+
+
+def resolver_por_ventanas(instancia: InstanciaProblema,
+                          restricciones: ConjuntoRestricciones = None,
+                          estrategia: EstrategiaGenetica = None,
+                          dias_ventana: int = 28,
+                          solape: int = 7,
+                          tamanio_poblacion: int = 100,
+                          num_generaciones: int = 200,
+                          rng: np.random.Generator = None,
+                          busqueda_local: BusquedaLocal = None,
+                          parada: CriteriosParada = None,
+                          instrumentacion=None,
+                          al_terminar_ventana: Callable = None) -> ResultadoHorizonte:
+    """
+    Resuelve el horizonte de `instancia` ventana por ventana con un
+    Solucionador (mismas restricciones, estrategia, búsqueda local y
+    criterios de parada en cada ventana).
+
+    `al_terminar_ventana(ventana)` recibe el detalle de cada ventana al
+    terminarla (inicio, fin, generaciones, segundos, motivo_parada).
+    """
+    rng = obtener_generador(rng)
+    restricciones = restricciones or RESTRICCIONES_POR_DEFECTO
+    estrategia = estrategia or ESTRATEGIA_AG
+    consecutivos = restricciones.buscar(DiasConsecutivos)
+    dias_contexto = max(1, consecutivos.maximo if consecutivos else 1)
+
+    genes = np.zeros((instancia.num_enfermeras, instancia.num_dias), dtype=np.uint8)
+    resultado = ResultadoHorizonte(genes, 0, 0, 0)
+    anterior = None  # (fin, mejor horario de la ventana anterior)
+
+    for inicio, fin, fin_fijado in ventanas_horizonte(instancia.num_dias, dias_ventana, solape):
+        # La ventana empieza con los últimos días ya fijados como contexto
+        desde = max(0, inicio - dias_contexto)
+        contexto = inicio - desde
+        mascara = np.zeros((instancia.num_enfermeras, fin - desde), dtype=bool)
+        mascara[:, :contexto] = True
+        valores = np.zeros(mascara.shape, dtype=np.uint8)
+        valores[:, :contexto] = genes[:, desde:inicio]
+        fijas = CeldasFijas(mascara, valores)
+        sub = subinstancia(instancia, desde, fin)
+        # Las noches del contexto ya cuentan dentro de la ventana
+        de_ventana = restricciones_ventana(restricciones, (genes[:, :desde] == NOCHE).sum(axis=1))
+
+        comienzo = time.perf_counter()
+        with Solucionador(sub, de_ventana, estrategia, instrumentacion=instrumentacion,
+                          busqueda_local=busqueda_local, fijas=fijas) as solucionador:
+            poblacion = estrategia.crear_poblacion(tamanio_poblacion, sub, de_ventana, rng)
+            if anterior is not None:
+                # La mitad de la población parte del solape ya optimizado
+                fin_anterior, mejor_anterior = anterior
+                dias_solape = fin_anterior - inicio
+                poblacion[:tamanio_poblacion // 2, :, contexto:contexto + dias_solape] = \
+                    mejor_anterior[:, -dias_solape:]
+            fijas.aplicar(poblacion)
+            ventana = solucionador.resolver(tamanio_poblacion, num_generaciones, rng,
+                                            poblacion=(poblacion, *solucionador.evaluar(poblacion)),
+                                            parada=parada)
+
+        mejor = ventana.genes[0]
+        genes[:, inicio:fin_fijado] = mejor[:, contexto:contexto + fin_fijado - inicio]
+        anterior = (fin, mejor)
+        detalle = {
+            'inicio': inicio,
+            'fin': fin,
+            'generaciones': ventana.generaciones,
+            'segundos': time.perf_counter() - comienzo,
+            'motivo_parada': ventana.motivo_parada,
+            'penalizacion_dura': float(ventana.duras[0]),
+            'penalizacion_blanda': float(ventana.blandas[0])
+        }
+        resultado.ventanas.append(detalle)
+        if al_terminar_ventana is not None:
+            al_terminar_ventana(detalle)
+
+    duras, blandas = restricciones(genes, instancia)
+    resultado.dura, resultado.blanda = duras[0].item(), blandas[0].item()
+    resultado.aptitud = restricciones.aptitud(resultado.dura, resultado.blanda)
+    return resultado
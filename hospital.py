@@ -0,0 +1,370 @@
+"""
+Descomposición por unidades: un hospital con varias unidades (cada una con
+sus enfermeras, especialistas y mínimos de ConfiguracionTurnos) que solo
+comparten un pool de enfermeras volantes.
+
+1. Subproblemas: cada unidad se resuelve en su propio proceso con sus
+   enfermeras más todo el pool.
+2. Acoplamiento: una volante asignada el mismo día en varias unidades se
+   queda en la que más pierde sin ella y se libera en las demás; luego se
+   reparan sobre su horario combinado (todas las unidades) los Noche→Mañana,
+   las rachas y las noches por encima del máximo.
+3. Reoptimización: cada unidad vuelve a optimizarse (en paralelo, sembrada
+   con su horario) con las filas del pool fijas, para cubrir con su
+   personal lo que se liberó.
+
+    python hospital.py hospital.json --salida resultado.json --procesos 8
+
+El JSON tiene "num_dias", "unidades" (problemas como los de lote.py) y
+"pool" (enfermeras como las de "enfermeras", con id 0..P-1).
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from lote import problema_desde_dict
+from main_2 import (ConfiguracionTurnos, Enfermera, instancia_desde_enfermeras,
+                    restricciones_desde_configuracion)
+from instancia import InstanciaProblema
+from operadores import LIBRE, MANANA, NOCHE
+from replanificacion import CeldasFijas, poblacion_desde_horario
+from restricciones import (ConjuntoRestricciones, DiasConsecutivos, MaxNoches, NocheManana,
+                           _longitud_rachas)
+from solucionador import Solucionador, BusquedaLocal, CriteriosParada, ESTRATEGIA_TURNOS
+
+# ============================================
+# MODELO
+# ============================================
+
+
+@dataclass
+class Unidad:
+    """Una unidad (servicio) con sus enfermeras propias (id 0..n-1)"""
+    nombre: str
+    config: ConfiguracionTurnos
+    enfermeras: List[Enfermera]
+
+    def con_pool(self, pool: List[Enfermera]) -> Tuple[ConfiguracionTurnos, List[Enfermera]]:
+        """Configuración y enfermeras de la unidad con el pool agregado al final"""
+        propias = len(self.enfermeras)
+        config = replace(self.config, num_enfermeras=propias + len(pool))
+        return config, self.enfermeras + [replace(e, id=propias + e.id) for e in pool]
+
+
+@dataclass
+class ProblemaHospital:
+    unidades: List[Unidad]
+    pool: List[Enfermera] = field(default_factory=list)  # volantes, id 0..P-1
+
+    def __post_init__(self):
+        dias = {unidad.config.num_dias for unidad in self.unidades}
+        if len(dias) != 1:
+            raise ValueError(f"Todas las unidades deben tener los mismos días (hay {sorted(dias)})")
+        if sorted(e.id for e in self.pool) != list(range(len(self.pool))):
+            raise ValueError(f"Los id del pool deben ser 0..{len(self.pool) - 1}")
+        self.pool = sorted(self.pool, key=lambda e: e.id)
+
+    @property
+    def num_dias(self) -> int:
+        return self.unidades[0].config.num_dias
+
+    def restricciones_pool(self) -> ConjuntoRestricciones:
+        """Restricciones personales de las volantes sobre su horario combinado"""
+        return ConjuntoRestricciones([
+            NocheManana(),
+            DiasConsecutivos(min(u.config.max_dias_consecutivos for u in self.unidades)),
+            MaxNoches([e.max_turnos_noche for e in self.pool])
+        ], umbral_optimo=None)
+
+
+@dataclass
+class ResultadoHospital:
+    horarios: Dict[str, np.ndarray]                     # unidad -> (propias, D)
+    pool: np.ndarray                                    # (P, D) turno de cada volante
+    unidad_pool: np.ndarray                             # (P, D) índice de la unidad (-1 = libre)
+    penalizaciones: Dict[str, Tuple[float, float]]      # unidad (y 'pool') -> (dura, blanda)
+    conflictos: int = 0
+    reparaciones: int = 0
+    segundos: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def dura(self) -> float:
+        return sum(dura for dura, _ in self.penalizaciones.values())
+
+    @property
+    def blanda(self) -> float:
+        return sum(blanda for _, blanda in self.penalizaciones.values())
+
+
+# ============================================
+# SUBPROBLEMAS
+# ============================================
+
+
+def _resolver_unidad(config: ConfiguracionTurnos, enfermeras: List[Enfermera], opciones: Dict,
+                     semilla: np.random.SeedSequence, fijas: CeldasFijas = None) -> np.ndarray:
+    """Mejor horario de una unidad (en un proceso); con `fijas`, sembrado con ese horario"""
+    instancia = instancia_desde_enfermeras(config, enfermeras)
+    restricciones = restricciones_desde_configuracion(config, enfermeras)
+    estrategia = replace(ESTRATEGIA_TURNOS, fraccion_voraz=opciones['voraz'])
+    busqueda_local = BusquedaLocal(mejores=opciones['busqueda_local']) if opciones['busqueda_local'] > 0 else None
+    rng = np.random.default_rng(semilla)
+
+    with Solucionador(instancia, restricciones, estrategia, busqueda_local=busqueda_local,
+                      fijas=fijas) as solucionador:
+        poblacion = None
+        if fijas is not None:
+            genes = poblacion_desde_horario(opciones['poblacion'], fijas, rng=rng)
+            poblacion = (genes, *solucionador.evaluar(genes))
+        resultado = solucionador.resolver(opciones['poblacion'], opciones['generaciones'], rng,
+                                          poblacion=poblacion,
+                                          parada=CriteriosParada(tiempo_maximo=opciones['tiempo_maximo'],
+                                                                 paciencia=opciones['paciencia']))
+    return resultado.genes[0]
+
+
+def _en_paralelo(funcion: Callable, tareas: List[Tuple], num_procesos: int) -> List:
+    if num_procesos <= 1:
+        return [funcion(*tarea) for tarea in tareas]
+    with ProcessPoolExecutor(max_workers=num_procesos) as pool:
+        return list(pool.map(funcion, *zip(*tareas)))
+
+
+# ============================================
+# ACOPLAMIENTO
+# ============================================
+
+
+def _perdida_al_liberar(unidad: Unidad, pool: List[Enfermera], horario: np.ndarray,
+                        celdas: List[Tuple[int, int]]) -> np.ndarray:
+    """Aptitud que pierde la unidad si cada celda (volante, día) pasa a Libre (una a la vez)"""
+    config, enfermeras = unidad.con_pool(pool)
+    instancia = instancia_desde_enfermeras(config, enfermeras)
+    restricciones = restricciones_desde_configuracion(config, enfermeras)
+    propias = len(unidad.enfermeras)
+
+    candidatos = np.repeat(horario[np.newaxis], len(celdas) + 1, axis=0)
+    for indice, (volante, dia) in enumerate(celdas, 1):
+        candidatos[indice, propias + volante, dia] = LIBRE
+    aptitudes = restricciones.aptitud(*restricciones(candidatos, instancia))
+    return aptitudes[0] - aptitudes[1:]
+
+
+def reparar_acoplamiento(problema: ProblemaHospital, horarios: List[np.ndarray]) -> Tuple[int, int]:
+    """
+    Deja a cada volante en a lo sumo una unidad por día y repara su horario
+    combinado (en el lugar). Retorna (conflictos resueltos, celdas liberadas
+    por las restricciones personales).
+    """
+    num_pool, num_dias = len(problema.pool), problema.num_dias
+    propias = [len(unidad.enfermeras) for unidad in problema.unidades]
+    trabaja = np.stack([horario[n:] != LIBRE for horario, n in zip(horarios, propias)])  # (U, P, D)
+
+    # Conflictos: la volante se queda en la unidad que más pierde sin ella
+    conflictos = np.argwhere(trabaja.sum(axis=0) > 1)
+    if len(conflictos):
+        perdidas = np.full((len(problema.unidades), len(conflictos)), -np.inf)
+        for u, unidad in enumerate(problema.unidades):
+            propios = [i for i, (v, d) in enumerate(conflictos) if trabaja[u, v, d]]
+            if propios:
+                perdidas[u, propios] = _perdida_al_liberar(
+                    unidad, problema.pool, horarios[u], [tuple(conflictos[i]) for i in propios])
+        elegida = np.argmax(perdidas, axis=0)
+        for (volante, dia), ganadora in zip(conflictos, elegida):
+            for u in np.flatnonzero(trabaja[:, volante, dia]):
+                if u != ganadora:
+                    horarios[u][propias[u] + volante, dia] = LIBRE
+
+    def combinado():
+        pool = np.zeros((num_pool, num_dias), dtype=np.uint8)
+        unidad = np.full((num_pool, num_dias), -1)
+        for u, (horario, n) in enumerate(zip(horarios, propias)):
+            ocupado = horario[n:] != LIBRE
+            pool[ocupado] = horario[n:][ocupado]
+            unidad[ocupado] = u
+        return pool, unidad
+
+    def liberar(volante, dia):
+        horarios[unidad[volante, dia]][propias[unidad[volante, dia]] + volante, dia] = LIBRE
+
+    # Restricciones personales sobre el horario combinado
+    reparaciones = 0
+    consecutivos = problema.restricciones_pool().buscar(DiasConsecutivos).maximo
+    while True:
+        pool, unidad = combinado()
+        noche_manana = np.argwhere((pool[:, :-1] == NOCHE) & (pool[:, 1:] == MANANA))
+        if len(noche_manana):
+            for volante, dia in noche_manana:
+                liberar(volante, dia + 1)
+            reparaciones += len(noche_manana)
+            continue
+        # Primer día de cada fila que excede la racha máxima
+        exceso = _longitud_rachas(pool != LIBRE) > consecutivos
+        filas = np.flatnonzero(exceso.any(axis=1))
+        if len(filas):
+            for volante in filas:
+                liberar(volante, int(np.argmax(exceso[volante])))
+            reparaciones += len(filas)
+            continue
+        break
+
+    for volante, enfermera in enumerate(problema.pool):
+        noches = np.flatnonzero(pool[volante] == NOCHE)
+        for dia in noches[enfermera.max_turnos_noche:]:
+            liberar(volante, dia)
+            reparaciones += 1
+
+    return len(conflictos), reparaciones
+
+
+# ============================================
+# RESOLUCIÓN
+# ============================================
+
+
+def resolver_hospital(problema: ProblemaHospital, num_procesos: int = 1, semilla: int = None,
+                      tamanio_poblacion: int = 100, num_generaciones: int = 300,
+                      tiempo_maximo: float = None, paciencia: int = None,
+                      fraccion_voraz: float = 0.0, busqueda_local: int = 0,
+                      tiempo_reoptimizacion: float = 2.0) -> ResultadoHospital:
+    """
+    Resuelve las unidades en `num_procesos` procesos, repara el pool
+    compartido y reoptimiza cada unidad (a lo sumo `tiempo_reoptimizacion`
+    segundos) con las volantes fijas. Con la misma `semilla` y sin límites
+    de tiempo el resultado no depende de `num_procesos`.
+    """
+    opciones = {
+        'poblacion': tamanio_poblacion,
+        'generaciones': num_generaciones,
+        'tiempo_maximo': tiempo_maximo,
+        'paciencia': paciencia,
+        'voraz': fraccion_voraz,
+        'busqueda_local': busqueda_local
+    }
+    unidades = problema.unidades
+    con_pool = [unidad.con_pool(problema.pool) for unidad in unidades]
+    semillas = np.random.SeedSequence(semilla).spawn(2 * len(unidades))
+    segundos = {}
+
+    inicio = time.perf_counter()
+    horarios = _en_paralelo(_resolver_unidad, [(config, enfermeras, opciones, semillas[u])
+                                               for u, (config, enfermeras) in enumerate(con_pool)],
+                            num_procesos)
+    segundos['subproblemas'] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    horarios = [np.array(horario) for horario in horarios]
+    conflictos, reparaciones = reparar_acoplamiento(problema, horarios)
+    segundos['acoplamiento'] = time.perf_counter() - inicio
+
+    # Reoptimización con las filas del pool fijas
+    inicio = time.perf_counter()
+    tareas = []
+    for u, (unidad, (config, enfermeras)) in enumerate(zip(unidades, con_pool)):
+        mascara = np.zeros(horarios[u].shape, dtype=bool)
+        mascara[len(unidad.enfermeras):] = True
+        tareas.append((config, enfermeras, dict(opciones, tiempo_maximo=tiempo_reoptimizacion),
+                       semillas[len(unidades) + u], CeldasFijas(mascara, horarios[u])))
+    horarios = _en_paralelo(_resolver_unidad, tareas, num_procesos)
+    segundos['reoptimizacion'] = time.perf_counter() - inicio
+
+    # Resultado: horario propio de cada unidad y horario combinado del pool
+    num_pool = len(problema.pool)
+    pool = np.zeros((num_pool, problema.num_dias), dtype=np.uint8)
+    unidad_pool = np.full(pool.shape, -1)
+    penalizaciones = {}
+    for u, (unidad, (config, enfermeras)) in enumerate(zip(unidades, con_pool)):
+        propias = len(unidad.enfermeras)
+        ocupado = horarios[u][propias:] != LIBRE
+        pool[ocupado] = horarios[u][propias:][ocupado]
+        unidad_pool[ocupado] = u
+        duras, blandas = restricciones_desde_configuracion(config, enfermeras)(
+            horarios[u], instancia_desde_enfermeras(config, enfermeras))
+        penalizaciones[unidad.nombre] = (duras[0].item(), blandas[0].item())
+    if num_pool:
+        instancia_pool = InstanciaProblema.crear(num_pool, problema.num_dias)
+        duras, blandas = problema.restricciones_pool()(pool, instancia_pool)
+        penalizaciones['pool'] = (duras[0].item(), blandas[0].item())
+
+    return ResultadoHospital(
+        horarios={unidad.nombre: horarios[u][:len(unidad.enfermeras)] for u, unidad in enumerate(unidades)},
+        pool=pool, unidad_pool=unidad_pool, penalizaciones=penalizaciones,
+        conflictos=conflictos, reparaciones=reparaciones, segundos=segundos
+    )
+
+
+# ============================================
+# LÍNEA DE COMANDOS
+# ============================================
+
+
+def problema_hospital_desde_dict(datos: Dict) -> ProblemaHospital:
+    """ProblemaHospital de un JSON: "unidades" como los problemas de lote.py y "pool" de enfermeras"""
+    unidades = []
+    for indice, unidad in enumerate(datos['unidades'], 1):
+        unidad = dict(unidad)
+        unidad.setdefault('nombre', f"unidad-{indice}")
+        if 'num_dias' in datos:
+            unidad.setdefault('num_dias', datos['num_dias'])
+        unidades.append(Unidad(*problema_desde_dict(unidad)))
+    pool = [Enfermera(**dict({'preferencias_libres': []}, **enfermera)) for enfermera in datos.get('pool', [])]
+    return ProblemaHospital(unidades, pool)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Resuelve un hospital por unidades con un pool compartido')
+    parser.add_argument('entrada', help='Archivo JSON con "unidades" y "pool"')
+    parser.add_argument('--salida', required=True, help='Archivo JSON donde guardar el resultado')
+    parser.add_argument('--procesos', type=int, default=1, help='Unidades resueltas a la vez')
+    parser.add_argument('--poblacion', type=int, default=100)
+    parser.add_argument('--generaciones', type=int, default=300)
+    parser.add_argument('--tiempo-maximo', type=float, help='Segundos máximos por unidad')
+    parser.add_argument('--paciencia', type=int, help='Generaciones sin mejora antes de terminar')
+    parser.add_argument('--voraz', type=float, default=0.0,
+                        help='Fracción de la población inicial construida de forma voraz')
+    parser.add_argument('--busqueda-local', type=int, default=0,
+                        help='Mejores individuos mejorados con búsqueda local en cada generación')
+    parser.add_argument('--tiempo-reoptimizacion', type=float, default=2.0,
+                        help='Segundos máximos por unidad después de reparar el pool')
+    parser.add_argument('--semilla', type=int)
+    opciones = parser.parse_args(argv)
+
+    with open(opciones.entrada, encoding='utf-8') as archivo:
+        problema = problema_hospital_desde_dict(json.load(archivo))
+    print(f"{len(problema.unidades)} unidades, {len(problema.pool)} volantes, {problema.num_dias} días")
+
+    resultado = resolver_hospital(problema, opciones.procesos, opciones.semilla, opciones.poblacion,
+                                  opciones.generaciones, opciones.tiempo_maximo, opciones.paciencia,
+                                  opciones.voraz, opciones.busqueda_local, opciones.tiempo_reoptimizacion)
+
+    for nombre, (dura, blanda) in resultado.penalizaciones.items():
+        print(f"{nombre:<24} duras={dura:<6.0f} blandas={blanda:.1f}")
+    print(f"{resultado.conflictos} conflictos del pool resueltos, {resultado.reparaciones} celdas reparadas | "
+          + ' | '.join(f"{etapa} {s:.2f}s" for etapa, s in resultado.segundos.items()))
+
+    nombres = [unidad.nombre for unidad in problema.unidades]
+    with open(opciones.salida, 'w', encoding='utf-8') as archivo:
+        json.dump({
+            'penalizacion_dura': resultado.dura,
+            'penalizacion_blanda': resultado.blanda,
+            'penalizaciones': {nombre: {'dura': dura, 'blanda': blanda}
+                               for nombre, (dura, blanda) in resultado.penalizaciones.items()},
+            'horarios': {nombre: horario.tolist() for nombre, horario in resultado.horarios.items()},
+            'pool': [[{'turno': int(turno), 'unidad': nombres[u] if u >= 0 else None}
+                      for turno, u in zip(turnos, unidades)]
+                     for turnos, unidades in zip(resultado.pool, resultado.unidad_pool)],
+            'conflictos': resultado.conflictos,
+            'reparaciones': resultado.reparaciones,
+            'segundos': resultado.segundos
+        }, archivo, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
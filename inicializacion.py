@@ -0,0 +1,94 @@
+import numpy as np
+
+from instancia import InstanciaProblema
+from operadores import MANANA, NOCHE, obtener_generador
+from restricciones import (TURNOS_TRABAJO, ConjuntoRestricciones, RESTRICCIONES_POR_DEFECTO,
+                           CoberturaMinima, DiasConsecutivos, EspecialistasPorTurno, MaxNoches)
+
+# ============================================
+# INICIALIZACIÓN VORAZ (HORARIOS CASI FACTIBLES)
+# ============================================
+#
+# Construye horarios día por día: primero un especialista en cada turno
+# (si hay uno que pueda trabajar sin romper una racha ni un Noche→Mañana) y
+# luego el personal mínimo de cada turno, eligiendo siempre a la enfermera
+# disponible con menos carga. Lo que violaría una restricción se evita
+# mientras haya otra candidata, con este orden de prioridad (de lo más a lo
+# menos grave): Noche→Mañana, días consecutivos, máximo de noches y días
+# preferidos libres. Quien no es elegida queda Libre.
+
+_COSTO_NOCHE_MANANA = 1e6
+_COSTO_RACHA = 1e5
+_COSTO_MAX_NOCHES = 1e4
+_COSTO_PREFERENCIA = 1e3
+
+
+def inicializacion_voraz(tamanio: int, instancia: InstanciaProblema,
+                         restricciones: ConjuntoRestricciones = None, ruido: float = 2.0,
+                         rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Población (tamanio, num_enfermeras, num_dias) de horarios construidos
+    de forma voraz (todos los horarios a la vez, un día por paso).
+
+    Los mínimos de cobertura y de especialistas, el máximo de días
+    consecutivos y de noches se toman de `restricciones` (por defecto las
+    de calcular_aptitud). `ruido` (en días de carga) desempata al azar entre
+    enfermeras con carga parecida, para que los horarios sean distintos.
+    """
+    rng = obtener_generador(rng)
+    restricciones = restricciones or RESTRICCIONES_POR_DEFECTO
+    cobertura = restricciones.buscar(CoberturaMinima)
+    especialistas = restricciones.buscar(EspecialistasPorTurno)
+    consecutivos = restricciones.buscar(DiasConsecutivos)
+    max_noches = restricciones.buscar(MaxNoches)
+    minimos = cobertura.minimos if cobertura else (0,) * len(TURNOS_TRABAJO)
+    min_especialistas = especialistas.minimo if especialistas else 0
+    limite_noches = np.broadcast_to(
+        np.asarray(max_noches.maximos if max_noches else np.inf, dtype=float),
+        (instancia.num_enfermeras,)
+    )
+
+    filas = np.arange(tamanio)
+    forma = (tamanio, instancia.num_enfermeras)
+    genes = np.zeros(forma + (instancia.num_dias,), dtype=np.uint8)
+    dias_trabajados = np.zeros(forma)
+    noches = np.zeros(forma)
+    racha = np.zeros(forma, dtype=np.int64)
+    desempate = rng.random(genes.shape) * ruido
+
+    for dia in range(instancia.num_dias):
+        disponible = np.ones(forma, dtype=bool)
+        costo_dia = (dias_trabajados + desempate[:, :, dia] +
+                     _COSTO_PREFERENCIA * instancia.mascara_preferencias[:, dia])
+        if consecutivos is not None:
+            costo_dia += _COSTO_RACHA * (racha >= consecutivos.maximo)
+
+        costos = {turno: costo_dia.copy() for turno in TURNOS_TRABAJO}
+        if dia > 0:
+            costos[MANANA] += _COSTO_NOCHE_MANANA * (genes[:, :, dia - 1] == NOCHE)
+        costos[NOCHE] += noches + _COSTO_MAX_NOCHES * (noches >= limite_noches)
+
+        def asignar(turno, candidatas, horarios=True, costo_maximo=np.inf):
+            """Una enfermera más en `turno` para cada horario indicado"""
+            costo = np.where(disponible & candidatas, costos[turno], np.inf)
+            elegida = np.argmin(costo, axis=1)
+            valido = (costo[filas, elegida] < costo_maximo) & horarios
+            genes[filas[valido], elegida[valido], dia] = turno
+            disponible[filas[valido], elegida[valido]] = False
+
+        # Especialistas primero, para que no los ocupe la cobertura de otro
+        # turno. Un especialista que rompería la racha o un Noche→Mañana
+        # descansa: si faltan especialistas, el turno queda sin uno
+        for _ in range(min_especialistas):
+            for turno in TURNOS_TRABAJO:
+                asignar(turno, instancia.mascara_especialistas, costo_maximo=_COSTO_RACHA)
+        for turno, minimo in zip(TURNOS_TRABAJO, minimos):
+            for _ in range(minimo):
+                asignar(turno, True, np.count_nonzero(genes[:, :, dia] == turno, axis=1) < minimo)
+
+        trabajando = ~disponible
+        dias_trabajados += trabajando
+        noches += genes[:, :, dia] == NOCHE
+        racha = np.where(trabajando, racha + 1, 0)
+
+    return genes
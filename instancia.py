@@ -0,0 +1,64 @@
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping, Tuple
+
+# ============================================
+# INSTANCIA DEL PROBLEMA (INMUTABLE)
+# ============================================
+
+
+def _solo_lectura(arreglo: np.ndarray) -> np.ndarray:
+    arreglo.flags.writeable = False
+    return arreglo
+
+
+@dataclass(frozen=True)
+class InstanciaProblema:
+    """
+    Datos de un problema de turnos: número de enfermeras y de días,
+    especialistas y días preferidos libres.
+
+    Es inmutable y precalcula las máscaras que usan las funciones de aptitud,
+    así que varias ejecuciones del AG pueden compartirla sin bloqueos.
+    Usar InstanciaProblema.crear para construirla desde listas y diccionarios.
+    """
+    num_enfermeras: int
+    num_dias: int
+    especialistas: Tuple[int, ...]
+    # ((id_enfermera, (días preferidos libres...)), ...)
+    preferencias: Tuple[Tuple[int, Tuple[int, ...]], ...]
+
+    # Máscaras precalculadas
+    mascara_especialistas: np.ndarray = field(init=False, repr=False, compare=False)  # (N,) bool
+    mascara_preferencias: np.ndarray = field(init=False, repr=False, compare=False)   # (N, D) bool
+
+    def __post_init__(self):
+        especialistas = np.zeros(self.num_enfermeras, dtype=bool)
+        especialistas[list(self.especialistas)] = True
+
+        preferencias = np.zeros((self.num_enfermeras, self.num_dias), dtype=bool)
+        for enfermera, dias in self.preferencias:
+            preferencias[enfermera, list(dias)] = True
+
+        object.__setattr__(self, 'mascara_especialistas', _solo_lectura(especialistas))
+        object.__setattr__(self, 'mascara_preferencias', _solo_lectura(preferencias))
+
+    @classmethod
+    def crear(cls, num_enfermeras: int, num_dias: int,
+              especialistas: Iterable[int] = (),
+              preferencias: Mapping[int, Iterable[int]] = None) -> 'InstanciaProblema':
+        """
+        Construye la instancia normalizando los datos: descarta enfermeras y
+        días fuera de rango y elimina duplicados.
+        """
+        especialistas = tuple(sorted({int(e) for e in especialistas
+                                      if 0 <= int(e) < num_enfermeras}))
+
+        normalizadas = []
+        for enfermera, dias in sorted((preferencias or {}).items()):
+            enfermera = int(enfermera)
+            dias = tuple(sorted({int(d) for d in dias if 0 <= int(d) < num_dias}))
+            if 0 <= enfermera < num_enfermeras and dias:
+                normalizadas.append((enfermera, dias))
+
+        return cls(num_enfermeras, num_dias, especialistas, tuple(normalizadas))
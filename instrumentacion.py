@@ -0,0 +1,156 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List
+
+# ============================================
+# TIEMPOS POR FASE DEL AG
+# ============================================
+
+FASES = ('orden', 'busqueda_local', 'seleccion', 'cruce', 'mutacion', 'aptitud', 'contabilidad')
+
+
+class Instrumentacion:
+    """
+    Registra cuánto tiempo pasa cada generación en cada fase del AG
+    (FASES) y cuánto tarda cada restricción de la función de aptitud.
+
+    Uso:
+        with instrumentacion.fase('cruce'):
+            ...
+        instrumentacion.cerrar_generacion()
+    """
+
+    def __init__(self):
+        self.totales: Dict[str, float] = defaultdict(float)
+        self.restricciones: Dict[str, float] = defaultdict(float)
+        self.evaluaciones = 0
+        self.generaciones = 0
+        self.por_generacion: Dict[str, List[float]] = defaultdict(list)
+        self._generacion_actual: Dict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def fase(self, nombre: str):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.agregar(nombre, time.perf_counter() - inicio)
+
+    @contextmanager
+    def restriccion(self, nombre: str):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.restricciones[nombre] += time.perf_counter() - inicio
+
+    def agregar(self, fase: str, segundos: float):
+        self.totales[fase] += segundos
+        self._generacion_actual[fase] += segundos
+
+    def contar_evaluaciones(self, cantidad: int):
+        self.evaluaciones += cantidad
+
+    def cerrar_generacion(self):
+        """Guarda los tiempos de la generación en curso y empieza otra"""
+        for fase in set(FASES) | set(self._generacion_actual):
+            self.por_generacion[fase].append(self._generacion_actual.get(fase, 0.0))
+        self._generacion_actual.clear()
+        self.generaciones += 1
+
+    def resumen(self, por_generacion: bool = False) -> Dict:
+        """
+        Totales (s) y promedios por generación (ms). Con `por_generacion`
+        agrega la serie de cada fase (ms), que crece con las generaciones.
+        """
+        generaciones = max(self.generaciones, 1)
+        resumen = {
+            'generaciones': self.generaciones,
+            'evaluaciones': self.evaluaciones,
+            'fases_segundos': {fase: round(total, 6) for fase, total in self.totales.items()},
+            'fases_ms_por_generacion': {fase: round(total * 1000 / generaciones, 4)
+                                        for fase, total in self.totales.items()},
+            'restricciones_segundos': {nombre: round(total, 6)
+                                       for nombre, total in self.restricciones.items()}
+        }
+        if por_generacion:
+            resumen['por_generacion_ms'] = {fase: [round(s * 1000, 4) for s in serie]
+                                            for fase, serie in self.por_generacion.items()}
+        return resumen
+
+
+class _InstrumentacionNula:
+    """Misma interfaz que Instrumentacion sin medir nada (instrumentación desactivada)."""
+
+    @contextmanager
+    def fase(self, nombre: str):
+        yield
+
+    @contextmanager
+    def restriccion(self, nombre: str):
+        yield
+
+    def agregar(self, fase: str, segundos: float):
+        pass
+
+    def contar_evaluaciones(self, cantidad: int):
+        pass
+
+    def cerrar_generacion(self):
+        pass
+
+
+SIN_INSTRUMENTACION = _InstrumentacionNula()
+
+
+# ============================================
+# MÉTRICAS DEL SERVIDOR (FORMATO PROMETHEUS)
+# ============================================
+
+
+class RegistroMetricas:
+    """
+    Contadores y medidores con etiquetas, exportables en el formato de
+    texto de Prometheus. Seguro para usar desde varios hilos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metricas = {}  # nombre -> (tipo, ayuda, {etiquetas: valor})
+
+    def definir(self, nombre: str, tipo: str, ayuda: str):
+        """tipo: 'counter' o 'gauge'"""
+        with self._lock:
+            self._metricas.setdefault(nombre, (tipo, ayuda, {}))
+
+    def sumar(self, nombre: str, valor: float = 1, **etiquetas):
+        with self._lock:
+            valores = self._metricas[nombre][2]
+            clave = tuple(sorted(etiquetas.items()))
+            valores[clave] = valores.get(clave, 0) + valor
+
+    def fijar(self, nombre: str, valor: float, **etiquetas):
+        with self._lock:
+            self._metricas[nombre][2][tuple(sorted(etiquetas.items()))] = valor
+
+    def texto(self) -> str:
+        lineas = []
+        with self._lock:
+            for nombre, (tipo, ayuda, valores) in self._metricas.items():
+                lineas.append(f"# HELP {nombre} {ayuda}")
+                lineas.append(f"# TYPE {nombre} {tipo}")
+                for etiquetas, valor in valores.items():
+                    lineas.append(f"{nombre}{_formatear_etiquetas(etiquetas)} {float(valor)!r}")
+        return '\n'.join(lineas) + '\n'
+
+
+def _formatear_etiquetas(etiquetas) -> str:
+    if not etiquetas:
+        return ''
+    partes = []
+    for clave, valor in etiquetas:
+        valor = str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        partes.append(f'{clave}="{valor}"')
+    return '{' + ','.join(partes) + '}'
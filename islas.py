@@ -0,0 +1,162 @@
+import multiprocessing
+import random
+import numpy as np
+from typing import Dict, List, Optional
+
+from main_2 import AlgoritmoGeneticoTurnos, ConfiguracionTurnos, Enfermera, Individuo
+
+# ==================== MODELO DE ISLAS ====================
+
+TOPOLOGIAS = ('anillo', 'completa')
+
+
+def _proceso_isla(conexion, config: ConfiguracionTurnos, enfermeras: List[Enfermera],
+                  tam_poblacion: int, parametros: Dict, semilla: np.random.SeedSequence):
+    """Evoluciona una isla en su propio proceso, atendiendo órdenes del coordinador"""
+    ag = AlgoritmoGeneticoTurnos(config, enfermeras, semilla)
+    ag.inicializar_poblacion(tam_poblacion)
+
+    while True:
+        orden, argumento = conexion.recv()
+
+        if orden == 'evolucionar':
+            num_generaciones, num_migrantes = argumento
+            ag.evolucionar(num_generaciones, mostrar_progreso=False, **parametros)
+            conexion.send(ag.emigrantes(num_migrantes))
+        elif orden == 'inmigrar':
+            ag.recibir_inmigrantes(argumento)
+        elif orden == 'terminar':
+            conexion.send((ag.mejor_individuo, ag.historial_aptitud))
+            break
+
+    conexion.close()
+
+
+class ModeloIslas(AlgoritmoGeneticoTurnos):
+    """
+    Algoritmo genético con modelo de islas.
+
+    K subpoblaciones evolucionan de forma independiente, cada una en su propio
+    proceso, y cada `intervalo_migracion` generaciones envían copias de sus
+    mejores individuos a sus vecinas según la topología ('anillo' o
+    'completa'), donde reemplazan a los peores.
+    """
+
+    def __init__(self, config: ConfiguracionTurnos, enfermeras: List[Enfermera],
+                 num_islas: int = 4, intervalo_migracion: int = 25,
+                 num_migrantes: int = 2, topologia: str = 'anillo',
+                 semilla: Optional[int] = None):
+        if topologia not in TOPOLOGIAS:
+            raise ValueError(f"Topología desconocida: {topologia} (opciones: {', '.join(TOPOLOGIAS)})")
+
+        super().__init__(config, enfermeras, semilla)
+        self.num_islas = num_islas
+        self.intervalo_migracion = intervalo_migracion
+        self.num_migrantes = num_migrantes
+        self.topologia = topologia
+        self.tam_poblacion_isla = 0
+        self.historial_islas: List[List[float]] = []
+
+    def inicializar_poblacion(self, tam_poblacion: int = 100):
+        """Define el tamaño de cada isla (las poblaciones se crean en cada proceso)"""
+        self.tam_poblacion_isla = tam_poblacion
+
+    def destinos(self, isla: int) -> List[int]:
+        """Islas que reciben los emigrantes de `isla`"""
+        if self.topologia == 'anillo':
+            return [(isla + 1) % self.num_islas] if self.num_islas > 1 else []
+        return [otra for otra in range(self.num_islas) if otra != isla]
+
+    def evolucionar(self, num_generaciones: int = 500, prob_cruce: float = 0.8,
+                    prob_mutacion: float = 0.1, elitismo: int = 2,
+                    mostrar_progreso: bool = True):
+        """Ejecuta las islas en paralelo con migraciones periódicas"""
+        parametros = {
+            'prob_cruce': prob_cruce,
+            'prob_mutacion': prob_mutacion,
+            'elitismo': elitismo
+        }
+        # Un flujo independiente por isla, derivado de la semilla del modelo
+        semillas = np.random.SeedSequence(self.semilla).spawn(self.num_islas)
+
+        conexiones = []
+        procesos = []
+        for isla in range(self.num_islas):
+            extremo_padre, extremo_hijo = multiprocessing.Pipe()
+            proceso = multiprocessing.Process(
+                target=_proceso_isla,
+                args=(extremo_hijo, self.config, self.enfermeras,
+                      self.tam_poblacion_isla, parametros, semillas[isla]),
+                daemon=True
+            )
+            proceso.start()
+            extremo_hijo.close()
+            conexiones.append(extremo_padre)
+            procesos.append(proceso)
+
+        try:
+            generacion = 0
+            while generacion < num_generaciones:
+                bloque = min(self.intervalo_migracion, num_generaciones - generacion)
+                for conexion in conexiones:
+                    conexion.send(('evolucionar', (bloque, self.num_migrantes)))
+                emigrantes = [conexion.recv() for conexion in conexiones]
+                generacion += bloque
+
+                if generacion < num_generaciones:
+                    inmigrantes: List[List[Individuo]] = [[] for _ in range(self.num_islas)]
+                    for origen, grupo in enumerate(emigrantes):
+                        for destino in self.destinos(origen):
+                            inmigrantes[destino].extend(ind.copiar() for ind in grupo)
+                    for conexion, grupo in zip(conexiones, inmigrantes):
+                        conexion.send(('inmigrar', grupo))
+
+                if mostrar_progreso:
+                    mejor = min((ind for grupo in emigrantes for ind in grupo),
+                                key=lambda ind: ind.aptitud)
+                    print(f"Generación {generacion}: Aptitud = {mejor.aptitud:.2f} "
+                          f"(Duras: {mejor.penalizacion_dura:.0f}, "
+                          f"Blandas: {mejor.penalizacion_blanda:.2f})")
+
+            for conexion in conexiones:
+                conexion.send(('terminar', None))
+            resultados = [conexion.recv() for conexion in conexiones]
+        finally:
+            for conexion in conexiones:
+                conexion.close()
+            for proceso in procesos:
+                proceso.join()
+
+        # Mejor de cada isla y el global
+        self.poblacion = [mejor for mejor, _ in resultados]
+        self.mejor_individuo = min(self.poblacion, key=lambda ind: ind.aptitud)
+        self.historial_islas = [historial for _, historial in resultados]
+        self.historial_aptitud = np.min(self.historial_islas, axis=0).tolist()
+
+        return self.mejor_individuo
+
+# ==================== EJEMPLO DE USO ====================
+
+if __name__ == "__main__":
+    config = ConfiguracionTurnos(num_enfermeras=10, num_dias=30, num_especialistas=3)
+
+    enfermeras = [
+        Enfermera(
+            id=i,
+            es_especialista=i < config.num_especialistas,
+            preferencias_libres=random.sample(range(30), random.randint(2, 3)),
+            max_turnos_noche=8
+        )
+        for i in range(config.num_enfermeras)
+    ]
+
+    num_islas = multiprocessing.cpu_count()
+    print(f"Modelo de islas: {num_islas} islas x 50 individuos | Generaciones: 500\n")
+
+    ag = ModeloIslas(config, enfermeras, num_islas=num_islas,
+                     intervalo_migracion=25, num_migrantes=2, topologia='anillo')
+    ag.inicializar_poblacion(tam_poblacion=50)
+    ag.evolucionar(num_generaciones=500, prob_cruce=0.8, prob_mutacion=0.15, elitismo=2)
+
+    ag.imprimir_solucion()
+    ag.graficar_evolucion()
@@ -0,0 +1,313 @@
+"""
+Resolución por lotes: planifica muchos servicios (o meses) en una sola
+invocación con el motor de main_2 (AlgoritmoGeneticoTurnos).
+
+Lee problemas de un archivo JSON (un objeto o una lista), de un JSONL (un
+problema por línea) o de un directorio con archivos .json/.jsonl. Cada
+problema tiene los campos de ConfiguracionTurnos más las enfermeras:
+
+    {"nombre": "uci-octubre", "num_enfermeras": 12, "num_dias": 31,
+     "min_enfermeras_manana": 3, "min_enfermeras_tarde": 3, "min_enfermeras_noche": 2,
+     "enfermeras": [{"id": 0, "es_especialista": true, "preferencias_libres": [5, 6]}, ...]}
+
+o, en forma abreviada, "especialistas": [0, 1, 2] y "preferencias":
+{"0": [5, 6], ...} en lugar de "enfermeras". Los problemas se reparten
+entre un pool de procesos y los resultados (horario, penalización de cada
+restricción y tiempos) se guardan en JSON o CSV:
+
+    python lote.py servicios/ --salida resultados/ --procesos 8
+    python lote.py octubre.jsonl --salida resultados/ --formato csv --tiempo-maximo 10
+
+Con --dias-ventana los horizontes largos (p. ej. un año) se resuelven por
+ventanas solapadas (ver horizonte.py); los límites de tiempo y paciencia
+se aplican entonces a cada ventana.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields, replace
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from horizonte import resolver_por_ventanas
+from main_2 import (AlgoritmoGeneticoTurnos, ConfiguracionTurnos, Enfermera,
+                    instancia_desde_enfermeras, restricciones_desde_configuracion)
+from solucionador import BusquedaLocal, CriteriosParada, ESTRATEGIA_TURNOS
+
+LETRAS_TURNOS = ('L', 'M', 'T', 'N')  # Libre, Mañana, Tarde, Noche
+FORMATOS = ('json', 'csv')
+
+# ============================================
+# LECTURA DE PROBLEMAS
+# ============================================
+
+
+def leer_problemas(ruta: str) -> List[Dict]:
+    """Problemas de un archivo .json/.jsonl o de un directorio con ellos (en orden alfabético)"""
+    if os.path.isdir(ruta):
+        archivos = sorted(os.path.join(ruta, nombre) for nombre in os.listdir(ruta)
+                          if nombre.endswith(('.json', '.jsonl')))
+    else:
+        archivos = [ruta]
+
+    problemas = []
+    for archivo in archivos:
+        base = os.path.splitext(os.path.basename(archivo))[0]
+        with open(archivo, encoding='utf-8') as entrada:
+            if archivo.endswith('.jsonl'):
+                leidos = [(f"{base}-{linea}", json.loads(texto))
+                          for linea, texto in enumerate(entrada, 1) if texto.strip()]
+            else:
+                datos = json.load(entrada)
+                if isinstance(datos, list):
+                    leidos = [(f"{base}-{indice}", problema) for indice, problema in enumerate(datos, 1)]
+                else:
+                    leidos = [(base, datos)]
+        for nombre, problema in leidos:
+            problemas.append(dict(problema, nombre=str(problema.get('nombre', nombre))))
+    return problemas
+
+
+def problema_desde_dict(datos: Dict) -> Tuple[str, ConfiguracionTurnos, List[Enfermera]]:
+    """(nombre, configuración, enfermeras) de un problema leído con leer_problemas"""
+    datos = dict(datos)
+    nombre = datos.pop('nombre', 'problema')
+    enfermeras_datos = datos.pop('enfermeras', None)
+    especialistas = datos.pop('especialistas', None)
+    preferencias = {int(e): [int(d) for d in dias] for e, dias in datos.pop('preferencias', {}).items()}
+
+    campos = {campo.name for campo in fields(ConfiguracionTurnos)}
+    desconocidos = set(datos) - campos
+    if desconocidos:
+        raise ValueError(f"{nombre}: campos desconocidos: {', '.join(sorted(desconocidos))}")
+    if enfermeras_datos is not None:
+        datos.setdefault('num_enfermeras', len(enfermeras_datos))
+    config = ConfiguracionTurnos(**datos)
+
+    if enfermeras_datos is not None:
+        enfermeras = [Enfermera(**dict({'max_turnos_noche': config.max_turnos_noche_mes}, **e))
+                      for e in enfermeras_datos]
+    else:
+        if especialistas is None:
+            especialistas = range(config.num_especialistas)
+        enfermeras = [Enfermera(id=i, es_especialista=i in especialistas,
+                                preferencias_libres=preferencias.get(i, []),
+                                max_turnos_noche=config.max_turnos_noche_mes)
+                      for i in range(config.num_enfermeras)]
+
+    if sorted(e.id for e in enfermeras) != list(range(config.num_enfermeras)):
+        raise ValueError(f"{nombre}: los id de las enfermeras deben ser 0..{config.num_enfermeras - 1}")
+    if any(not 0 <= dia < config.num_dias for e in enfermeras for dia in e.preferencias_libres):
+        raise ValueError(f"{nombre}: hay días preferidos fuera de 0..{config.num_dias - 1}")
+    return nombre, config, sorted(enfermeras, key=lambda e: e.id)
+
+
+# ============================================
+# RESOLUCIÓN
+# ============================================
+
+
+def resolver_problema(datos: Dict, opciones: Dict, semilla: np.random.SeedSequence) -> Dict:
+    """Resuelve un problema (en un proceso del pool) y retorna su resultado serializable"""
+    nombre, config, enfermeras = problema_desde_dict(datos)
+    if opciones.get('dias_ventana'):
+        return _resolver_por_ventanas(nombre, config, enfermeras, opciones, semilla)
+    inicio = time.perf_counter()
+    ag = AlgoritmoGeneticoTurnos(config, enfermeras, semilla)
+    ag.inicializar_poblacion(opciones['poblacion'], fraccion_voraz=opciones['voraz'])
+    ag.evolucionar(opciones['generaciones'], mostrar_progreso=False,
+                   busqueda_local=opciones['busqueda_local'],
+                   tiempo_maximo=opciones['tiempo_maximo'], paciencia=opciones['paciencia'])
+    segundos = time.perf_counter() - inicio
+
+    mejor = ag.mejor_individuo
+    penalizaciones = ag.restricciones.penalizaciones(mejor.cromosoma, ag.instancia)
+    return {
+        'nombre': nombre,
+        'enfermeras': config.num_enfermeras,
+        'dias': config.num_dias,
+        'aptitud': float(mejor.aptitud),
+        'penalizacion_dura': float(mejor.penalizacion_dura),
+        'penalizacion_blanda': float(mejor.penalizacion_blanda),
+        'penalizaciones': {restriccion: float(valor[0]) for restriccion, valor in penalizaciones.items()},
+        'motivo_parada': ag.motivo_parada,
+        'generaciones': len(ag.historial_aptitud),
+        'segundos': round(segundos, 3),
+        'horario': mejor.cromosoma.tolist()
+    }
+
+
+def _resolver_por_ventanas(nombre: str, config: ConfiguracionTurnos, enfermeras: List[Enfermera],
+                           opciones: Dict, semilla: np.random.SeedSequence) -> Dict:
+    """Como resolver_problema, pero con horizonte rodante (mismas restricciones y operadores)"""
+    instancia = instancia_desde_enfermeras(config, enfermeras)
+    restricciones = restricciones_desde_configuracion(config, enfermeras)
+    inicio = time.perf_counter()
+    resultado = resolver_por_ventanas(
+        instancia, restricciones, replace(ESTRATEGIA_TURNOS, fraccion_voraz=opciones['voraz']),
+        opciones['dias_ventana'], opciones['solape'], opciones['poblacion'], opciones['generaciones'],
+        np.random.default_rng(semilla),
+        BusquedaLocal(mejores=opciones['busqueda_local']) if opciones['busqueda_local'] > 0 else None,
+        CriteriosParada(tiempo_maximo=opciones['tiempo_maximo'], paciencia=opciones['paciencia'])
+    )
+    segundos = time.perf_counter() - inicio
+
+    penalizaciones = restricciones.penalizaciones(resultado.genes, instancia)
+    return {
+        'nombre': nombre,
+        'enfermeras': config.num_enfermeras,
+        'dias': config.num_dias,
+        'aptitud': float(-resultado.aptitud),  # como Individuo.aptitud: menor es mejor
+        'penalizacion_dura': float(resultado.dura),
+        'penalizacion_blanda': float(resultado.blanda),
+        'penalizaciones': {restriccion: float(valor[0]) for restriccion, valor in penalizaciones.items()},
+        'motivo_parada': resultado.motivo_parada,
+        'generaciones': resultado.generaciones,
+        'ventanas': len(resultado.ventanas),
+        'segundos': round(segundos, 3),
+        'horario': resultado.genes.tolist()
+    }
+
+
+def resolver_lote(problemas: List[Dict], opciones: Dict, num_procesos: int = 1,
+                  semilla: int = None, al_terminar=None) -> List[Dict]:
+    """
+    Resuelve todos los problemas repartidos entre `num_procesos` procesos.
+
+    Cada problema recibe su propia semilla derivada de `semilla`, así que
+    el resultado no depende del número de procesos ni del orden en que
+    terminan. Un problema que falla queda con su 'error' en lugar de
+    detener el lote. Retorna los resultados en el orden de `problemas`.
+    """
+    semillas = np.random.SeedSequence(semilla).spawn(len(problemas))
+    resultados = [None] * len(problemas)
+
+    def terminar(indice, obtener):
+        try:
+            resultados[indice] = obtener()
+        except Exception as error:
+            resultados[indice] = {'nombre': problemas[indice].get('nombre'), 'error': str(error)}
+        if al_terminar is not None:
+            al_terminar(resultados[indice])
+
+    if num_procesos <= 1:
+        for indice, problema in enumerate(problemas):
+            terminar(indice, lambda: resolver_problema(problema, opciones, semillas[indice]))
+        return resultados
+
+    with ProcessPoolExecutor(max_workers=num_procesos) as pool:
+        futuros = {pool.submit(resolver_problema, problema, opciones, semillas[indice]): indice
+                   for indice, problema in enumerate(problemas)}
+        for futuro in as_completed(futuros):
+            terminar(futuros[futuro], futuro.result)
+    return resultados
+
+
+# ============================================
+# SALIDA
+# ============================================
+
+
+def _nombre_archivo(nombre: str) -> str:
+    return re.sub(r'[^\w.-]', '_', nombre)
+
+
+def guardar_json(resultados: List[Dict], directorio: str, parametros: Dict):
+    with open(os.path.join(directorio, 'resultados.json'), 'w', encoding='utf-8') as archivo:
+        json.dump({'parametros': parametros, 'resultados': resultados}, archivo, indent=2, ensure_ascii=False)
+
+
+def guardar_csv(resultados: List[Dict], directorio: str):
+    """resumen.csv (una fila por problema) y <nombre>.csv con el horario de cada uno"""
+    restricciones = list(dict.fromkeys(r for fila in resultados for r in fila.get('penalizaciones', {})))
+    columnas = (['nombre', 'enfermeras', 'dias', 'aptitud', 'penalizacion_dura', 'penalizacion_blanda']
+                + restricciones + ['motivo_parada', 'generaciones', 'segundos', 'error'])
+    with open(os.path.join(directorio, 'resumen.csv'), 'w', newline='', encoding='utf-8') as archivo:
+        escritor = csv.DictWriter(archivo, columnas, extrasaction='ignore')
+        escritor.writeheader()
+        for fila in resultados:
+            escritor.writerow(dict(fila, **fila.get('penalizaciones', {})))
+
+    for fila in resultados:
+        if 'horario' not in fila:
+            continue
+        with open(os.path.join(directorio, _nombre_archivo(fila['nombre']) + '.csv'), 'w',
+                  newline='', encoding='utf-8') as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(['enfermera'] + [f"D{dia + 1}" for dia in range(fila['dias'])])
+            for enfermera, turnos in enumerate(fila['horario']):
+                escritor.writerow([enfermera] + [LETRAS_TURNOS[turno] for turno in turnos])
+
+
+def _formatear(fila: Dict) -> str:
+    if 'error' in fila:
+        return f"{fila['nombre']:<24} ERROR: {fila['error']}"
+    return (f"{fila['nombre']:<24} N={fila['enfermeras']:<4} D={fila['dias']:<4} "
+            f"duras={fila['penalizacion_dura']:<6.0f} blandas={fila['penalizacion_blanda']:<8.1f} "
+            f"{fila['generaciones']:5d} gen ({fila['motivo_parada']}) {fila['segundos']:8.2f}s")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Resuelve un lote de problemas de turnos')
+    parser.add_argument('entrada', help='Archivo .json/.jsonl o directorio con problemas')
+    parser.add_argument('--salida', required=True, help='Directorio donde guardar los resultados')
+    parser.add_argument('--formato', choices=FORMATOS, default='json')
+    parser.add_argument('--procesos', type=int, default=os.cpu_count() or 1,
+                        help='Problemas resueltos a la vez')
+    parser.add_argument('--poblacion', type=int, default=100)
+    parser.add_argument('--generaciones', type=int, default=500)
+    parser.add_argument('--tiempo-maximo', type=float, help='Segundos máximos por problema')
+    parser.add_argument('--paciencia', type=int, help='Generaciones sin mejora antes de terminar')
+    parser.add_argument('--voraz', type=float, default=0.0,
+                        help='Fracción de la población inicial construida de forma voraz')
+    parser.add_argument('--busqueda-local', type=int, default=0,
+                        help='Mejores individuos mejorados con búsqueda local en cada generación')
+    parser.add_argument('--dias-ventana', type=int,
+                        help='Resolver por ventanas de estos días (horizonte rodante)')
+    parser.add_argument('--solape', type=int, default=7,
+                        help='Días de solape entre ventanas consecutivas')
+    parser.add_argument('--semilla', type=int,
+                        help='Semilla del lote (None = al azar; se informa en la salida)')
+    opciones = parser.parse_args(argv)
+
+    problemas = leer_problemas(opciones.entrada)
+    semilla = opciones.semilla if opciones.semilla is not None else np.random.SeedSequence().entropy
+    parametros_ag = {
+        'poblacion': opciones.poblacion,
+        'generaciones': opciones.generaciones,
+        'tiempo_maximo': opciones.tiempo_maximo,
+        'paciencia': opciones.paciencia,
+        'voraz': opciones.voraz,
+        'busqueda_local': opciones.busqueda_local,
+        'dias_ventana': opciones.dias_ventana,
+        'solape': opciones.solape
+    }
+
+    print(f"{len(problemas)} problemas, {opciones.procesos} procesos, semilla {semilla}")
+    inicio = time.perf_counter()
+    resultados = resolver_lote(problemas, parametros_ag, opciones.procesos, semilla,
+                               al_terminar=lambda fila: print(_formatear(fila), flush=True))
+    segundos = time.perf_counter() - inicio
+
+    os.makedirs(opciones.salida, exist_ok=True)
+    if opciones.formato == 'json':
+        guardar_json(resultados, opciones.salida, dict(parametros_ag, semilla=semilla,
+                                                       procesos=opciones.procesos,
+                                                       segundos_totales=round(segundos, 3)))
+    else:
+        guardar_csv(resultados, opciones.salida)
+
+    errores = sum('error' in fila for fila in resultados)
+    print(f"\n{len(resultados) - errores} resueltos, {errores} con error en {segundos:.1f}s "
+          f"-> {opciones.salida}")
+    return 1 if errores else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
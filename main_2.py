@@ -1,8 +1,13 @@
 import numpy as np
 import random
-from dataclasses import dataclass
-from typing import List, Tuple
-import matplotlib.pyplot as plt
+from dataclasses import dataclass, replace
+from typing import List
+
+from graficos import nueva_figura, mostrar_o_guardar
+from instancia import InstanciaProblema
+from operadores import inicializacion_con_libres
+from restricciones import ConjuntoRestricciones, crear_restricciones_turnos, desviacion_conteos
+from solucionador import Solucionador, BusquedaLocal, CriteriosParada, ESTRATEGIA_TURNOS
 
 # ==================== CONFIGURACIÓN DEL PROBLEMA ====================
 
@@ -51,22 +56,15 @@ class Individuo:
         self.config = config
         self.enfermeras = enfermeras
         # Matriz [enfermera][día] = tipo_turno
-        self.cromosoma = np.zeros((config.num_enfermeras, config.num_dias), dtype=int)
+        self.cromosoma = np.zeros((config.num_enfermeras, config.num_dias), dtype=np.uint8)
         self.aptitud = 0.0
         self.penalizacion_dura = 0.0
         self.penalizacion_blanda = 0.0
         
-    def inicializar_aleatorio(self):
+    def inicializar_aleatorio(self, rng: np.random.Generator = None):
         """Genera un horario aleatorio"""
-        for enfermera_id in range(self.config.num_enfermeras):
-            for dia in range(self.config.num_dias):
-                # 30% probabilidad de día libre, resto distribuido entre turnos
-                if random.random() < 0.3:
-                    self.cromosoma[enfermera_id][dia] = self.config.LIBRE
-                else:
-                    self.cromosoma[enfermera_id][dia] = random.randint(
-                        self.config.MANANA, self.config.NOCHE
-                    )
+        # 30% probabilidad de día libre, resto distribuido entre turnos
+        self.cromosoma = inicializacion_con_libres(1, self.cromosoma.shape, 0.3, rng)[0]
     
     def calcular_aptitud(self) -> float:
         """Calcula la aptitud del horario (menor es mejor)"""
@@ -197,8 +195,8 @@ class Individuo:
             dias = np.sum(self.cromosoma[enfermera_id, :] != self.config.LIBRE)
             dias_trabajados.append(dias)
         
-        # Calcular desviación estándar (queremos que sea baja)
-        desviacion = np.std(dias_trabajados)
+        # Calcular desviación estándar (queremos que sea baja), exacta como la vectorizada
+        desviacion = desviacion_conteos(dias_trabajados)
         
         return desviacion
     
@@ -207,140 +205,167 @@ class Individuo:
         nuevo = Individuo(self.config, self.enfermeras)
         nuevo.cromosoma = self.cromosoma.copy()
         nuevo.aptitud = self.aptitud
+        nuevo.penalizacion_dura = self.penalizacion_dura
+        nuevo.penalizacion_blanda = self.penalizacion_blanda
         return nuevo
 
-# ==================== OPERADORES GENÉTICOS ====================
+# ==================== EVALUACIÓN VECTORIZADA ====================
 
-def seleccion_torneo(poblacion: List[Individuo], tam_torneo: int = 3) -> Individuo:
-    """Selecciona un individuo mediante torneo"""
-    competidores = random.sample(poblacion, tam_torneo)
-    return min(competidores, key=lambda ind: ind.aptitud)
-
-def cruce_uniforme(padre1: Individuo, padre2: Individuo) -> Tuple[Individuo, Individuo]:
-    """Cruce uniforme: intercambia días completos entre padres"""
-    hijo1 = padre1.copiar()
-    hijo2 = padre2.copiar()
-    
-    # Por cada día, decidir de qué padre heredar
-    for dia in range(padre1.config.num_dias):
-        if random.random() < 0.5:
-            # Intercambiar columna completa (todos los turnos de ese día)
-            hijo1.cromosoma[:, dia] = padre2.cromosoma[:, dia].copy()
-            hijo2.cromosoma[:, dia] = padre1.cromosoma[:, dia].copy()
-    
-    return hijo1, hijo2
+def instancia_desde_enfermeras(config: ConfiguracionTurnos,
+                               enfermeras: List[Enfermera]) -> InstanciaProblema:
+    """InstanciaProblema (especialistas y preferencias) equivalente a la lista de enfermeras"""
+    return InstanciaProblema.crear(
+        config.num_enfermeras, config.num_dias,
+        especialistas=[e.id for e in enfermeras if e.es_especialista],
+        preferencias={e.id: e.preferencias_libres for e in enfermeras}
+    )
 
-def mutacion_adaptativa(individuo: Individuo, prob_mutacion: float):
-    """Mutación que cambia turnos aleatorios"""
-    for enfermera_id in range(individuo.config.num_enfermeras):
-        for dia in range(individuo.config.num_dias):
-            if random.random() < prob_mutacion:
-                # Cambiar a un turno aleatorio
-                individuo.cromosoma[enfermera_id][dia] = random.randint(0, 3)
 
-def mutacion_inteligente(individuo: Individuo):
-    """Mutación dirigida a corregir restricciones duras"""
-    # Corregir noche-mañana consecutivos
-    for enfermera_id in range(individuo.config.num_enfermeras):
-        for dia in range(individuo.config.num_dias - 1):
-            if (individuo.cromosoma[enfermera_id][dia] == individuo.config.NOCHE and
-                individuo.cromosoma[enfermera_id][dia + 1] == individuo.config.MANANA):
-                # Cambiar el turno de mañana a libre o tarde
-                individuo.cromosoma[enfermera_id][dia + 1] = random.choice(
-                    [individuo.config.LIBRE, individuo.config.TARDE]
-                )
+def restricciones_desde_configuracion(config: ConfiguracionTurnos,
+                                      enfermeras: List[Enfermera]) -> ConjuntoRestricciones:
+    """Las restricciones de Individuo.calcular_aptitud para evaluar poblaciones completas"""
+    return crear_restricciones_turnos(
+        min_enfermeras=(config.min_enfermeras_manana, config.min_enfermeras_tarde,
+                        config.min_enfermeras_noche),
+        min_especialistas=config.min_especialistas_turno,
+        max_dias_consecutivos=config.max_dias_consecutivos,
+        max_noches=[e.max_turnos_noche for e in enfermeras],
+        peso_dura=config.peso_restriccion_dura,
+        peso_blanda=config.peso_restriccion_blanda
+    )
 
 # ==================== ALGORITMO GENÉTICO PRINCIPAL ====================
 
 class AlgoritmoGeneticoTurnos:
-    """Clase principal del Algoritmo Genético"""
+    """
+    Clase principal del Algoritmo Genético.
     
-    def __init__(self, config: ConfiguracionTurnos, enfermeras: List[Enfermera]):
+    Las generaciones las ejecuta solucionador.Solucionador con las
+    restricciones de Individuo.calcular_aptitud (evaluadas para toda la
+    población a la vez) y los operadores de ESTRATEGIA_TURNOS.
+    
+    Toda la aleatoriedad sale de `self.rng`, creado a partir de `semilla`
+    (un entero o un np.random.SeedSequence): con la misma semilla la
+    ejecución es reproducible.
+    """
+    
+    def __init__(self, config: ConfiguracionTurnos, enfermeras: List[Enfermera],
+                 semilla=None):
         self.config = config
         self.enfermeras = enfermeras
+        self.semilla = semilla
+        self.rng = np.random.default_rng(semilla)
+        self.instancia = instancia_desde_enfermeras(config, enfermeras)
+        self.restricciones = restricciones_desde_configuracion(config, enfermeras)
+        self.estrategia = ESTRATEGIA_TURNOS
         self.poblacion: List[Individuo] = []
         self.mejor_individuo: Individuo = None
         self.historial_aptitud = []
+        self.motivo_parada = None
+    
+    def _crear_individuo(self, cromosoma: np.ndarray, dura, blanda) -> Individuo:
+        """Individuo con las penalizaciones ya calculadas por el evaluador vectorizado"""
+        individuo = Individuo(self.config, self.enfermeras)
+        individuo.cromosoma = cromosoma
+        individuo.penalizacion_dura = float(dura)
+        individuo.penalizacion_blanda = float(blanda)
+        individuo.aptitud = float(-self.restricciones.aptitud(dura, blanda))
+        return individuo
+    
+    def _actualizar_mejor(self, candidato: Individuo):
+        if self.mejor_individuo is None or candidato.aptitud < self.mejor_individuo.aptitud:
+            self.mejor_individuo = candidato.copiar()
         
-    def inicializar_poblacion(self, tam_poblacion: int = 100):
-        """Crea la población inicial"""
-        self.poblacion = []
-        for _ in range(tam_poblacion):
-            individuo = Individuo(self.config, self.enfermeras)
-            individuo.inicializar_aleatorio()
-            individuo.calcular_aptitud()
-            self.poblacion.append(individuo)
+    def inicializar_poblacion(self, tam_poblacion: int = 100, fraccion_voraz: float = 0.0):
+        """
+        Crea la población inicial. Una fracción `fraccion_voraz` se construye
+        de forma voraz (personal mínimo, especialistas y preferencias
+        respetados) y el resto al azar.
+        """
+        estrategia = replace(self.estrategia, fraccion_voraz=fraccion_voraz)
+        cromosomas = estrategia.crear_poblacion(tam_poblacion, self.instancia, self.restricciones, self.rng)
+        duras, blandas = self.restricciones(cromosomas, self.instancia)
+        self.poblacion = [self._crear_individuo(c, d, b) for c, d, b in zip(cromosomas, duras, blandas)]
         
         self.mejor_individuo = min(self.poblacion, key=lambda ind: ind.aptitud)
     
     def evolucionar(self, num_generaciones: int = 500, prob_cruce: float = 0.8, 
-                    prob_mutacion: float = 0.1, elitismo: int = 2):
-        """Ejecuta el algoritmo genético"""
+                    prob_mutacion: float = 0.1, elitismo: int = 2,
+                    mostrar_progreso: bool = True, instrumentacion=None,
+                    busqueda_local: int = 0, tiempo_maximo: float = None,
+                    max_evaluaciones: int = None, paciencia: int = None):
+        """
+        Ejecuta el algoritmo genético.
+        Con `instrumentacion` (ver instrumentacion.py) registra el tiempo de cada fase.
+        Con `busqueda_local` > 0 mejora esa cantidad de mejores individuos con
+        búsqueda local en cada generación (AG memético).
+        `tiempo_maximo` (segundos), `max_evaluaciones` y `paciencia`
+        (generaciones sin mejora) terminan antes; el motivo queda en
+        `self.motivo_parada`.
+        """
+        estrategia = replace(self.estrategia, prob_cruce=prob_cruce,
+                             prob_mutacion=prob_mutacion, elitismo=elitismo)
         
-        for generacion in range(num_generaciones):
-            nueva_poblacion = []
-            
-            # Elitismo: mantener los mejores
-            self.poblacion.sort(key=lambda ind: ind.aptitud)
-            for i in range(elitismo):
-                nueva_poblacion.append(self.poblacion[i].copiar())
-            
-            # Generar resto de la población
-            while len(nueva_poblacion) < len(self.poblacion):
-                # Selección
-                padre1 = seleccion_torneo(self.poblacion)
-                padre2 = seleccion_torneo(self.poblacion)
-                
-                # Cruce
-                if random.random() < prob_cruce:
-                    hijo1, hijo2 = cruce_uniforme(padre1, padre2)
-                else:
-                    hijo1, hijo2 = padre1.copiar(), padre2.copiar()
-                
-                # Mutación
-                mutacion_adaptativa(hijo1, prob_mutacion)
-                mutacion_adaptativa(hijo2, prob_mutacion)
-                
-                # Mutación inteligente ocasional
-                if random.random() < 0.1:
-                    mutacion_inteligente(hijo1)
-                if random.random() < 0.1:
-                    mutacion_inteligente(hijo2)
-                
-                # Calcular aptitud
-                hijo1.calcular_aptitud()
-                hijo2.calcular_aptitud()
-                
-                nueva_poblacion.extend([hijo1, hijo2])
-            
-            # Reemplazar población
-            self.poblacion = nueva_poblacion[:len(self.poblacion)]
-            
-            # Actualizar mejor individuo
-            mejor_actual = min(self.poblacion, key=lambda ind: ind.aptitud)
-            if mejor_actual.aptitud < self.mejor_individuo.aptitud:
-                self.mejor_individuo = mejor_actual.copiar()
-            
-            # Guardar historial
+        def registrar(generacion, cromosoma, dura, blanda):
+            # Mejor de la población que dejó la generación `generacion`
+            self._actualizar_mejor(self._crear_individuo(cromosoma, dura, blanda))
             self.historial_aptitud.append(self.mejor_individuo.aptitud)
             
-            # Mostrar progreso
-            if generacion % 50 == 0:
+            if mostrar_progreso and generacion % 50 == 0:
                 print(f"Generación {generacion}: Aptitud = {self.mejor_individuo.aptitud:.2f} "
                       f"(Duras: {self.mejor_individuo.penalizacion_dura:.0f}, "
                       f"Blandas: {self.mejor_individuo.penalizacion_blanda:.2f})")
         
+        def al_generar(generacion, genes, duras, blandas, aptitudes):
+            if generacion > 0:
+                registrar(generacion - 1, genes[0], duras[0], blandas[0])
+        
+        poblacion = (np.stack([ind.cromosoma for ind in self.poblacion]),
+                     np.array([ind.penalizacion_dura for ind in self.poblacion]),
+                     np.array([ind.penalizacion_blanda for ind in self.poblacion]))
+        
+        with Solucionador(self.instancia, self.restricciones, estrategia,
+                          instrumentacion=instrumentacion,
+                          busqueda_local=BusquedaLocal(mejores=busqueda_local) if busqueda_local > 0 else None
+                          ) as solucionador:
+            resultado = solucionador.resolver(len(self.poblacion), num_generaciones, self.rng,
+                                              poblacion=poblacion, al_generar=al_generar,
+                                              parada=CriteriosParada(tiempo_maximo, max_evaluaciones,
+                                                                     paciencia))
+        self.motivo_parada = resultado.motivo_parada
+        
+        self.poblacion = [self._crear_individuo(c, d, b)
+                          for c, d, b in zip(resultado.genes, resultado.duras, resultado.blandas)]
+        if num_generaciones > 0:
+            registrar(num_generaciones - 1, resultado.genes[0], resultado.duras[0], resultado.blandas[0])
+        
         return self.mejor_individuo
     
-    def graficar_evolucion(self):
-        """Muestra gráfica de evolución"""
-        plt.figure(figsize=(10, 6))
-        plt.plot(self.historial_aptitud, linewidth=2)
-        plt.xlabel('Generación')
-        plt.ylabel('Aptitud (menor es mejor)')
-        plt.title('Evolución del Algoritmo Genético')
-        plt.grid(True, alpha=0.3)
-        plt.show()
+    def emigrantes(self, cantidad: int) -> List[Individuo]:
+        """Copias de los mejores individuos para enviar a otra población"""
+        mejores = sorted(self.poblacion, key=lambda ind: ind.aptitud)[:cantidad]
+        return [ind.copiar() for ind in mejores]
+    
+    def recibir_inmigrantes(self, inmigrantes: List[Individuo]):
+        """Reemplaza a los peores individuos por los inmigrantes"""
+        self.poblacion.sort(key=lambda ind: ind.aptitud)
+        cantidad = min(len(inmigrantes), len(self.poblacion))
+        for i in range(cantidad):
+            self.poblacion[len(self.poblacion) - 1 - i] = inmigrantes[i]
+        
+        mejor_actual = min(self.poblacion, key=lambda ind: ind.aptitud)
+        if mejor_actual.aptitud < self.mejor_individuo.aptitud:
+            self.mejor_individuo = mejor_actual.copiar()
+    
+    def graficar_evolucion(self, archivo: str = None):
+        """Muestra gráfica de evolución (o la guarda en `archivo`: .png, .svg, ...)"""
+        figura, ejes = nueva_figura(archivo)
+        ejes.plot(self.historial_aptitud, linewidth=2)
+        ejes.set_xlabel('Generación')
+        ejes.set_ylabel('Aptitud (menor es mejor)')
+        ejes.set_title('Evolución del Algoritmo Genético')
+        ejes.grid(True, alpha=0.3)
+        mostrar_o_guardar(figura, archivo)
     
     def imprimir_solucion(self):
         """Imprime el mejor horario encontrado"""
@@ -0,0 +1,126 @@
+import numpy as np
+from typing import Callable, Sequence, Tuple
+
+# ============================================
+# OPERADORES GENÉTICOS VECTORIZADOS (POBLACIÓN COMPLETA)
+# ============================================
+#
+# Trabajan sobre arreglos (P, num_enfermeras, num_dias) y generan todas las
+# máscaras y valores aleatorios de una generación con unas pocas llamadas a
+# un numpy.random.Generator, en lugar de un random.random() por celda.
+
+LIBRE, MANANA, TARDE, NOCHE = 0, 1, 2, 3
+
+# Generador usado cuando no se pasa uno (ejecuciones sin semilla)
+_GENERADOR_POR_DEFECTO = np.random.default_rng()
+
+
+def obtener_generador(rng: np.random.Generator = None) -> np.random.Generator:
+    """`rng` o, si es None, el generador compartido del módulo."""
+    return rng if rng is not None else _GENERADOR_POR_DEFECTO
+
+
+def inicializacion_uniforme(tamanio: int, forma: Tuple[int, int],
+                            rng: np.random.Generator = None) -> np.ndarray:
+    """Población (tamanio, *forma) con todos los turnos equiprobables."""
+    rng = obtener_generador(rng)
+    # Un horario por llamada: la secuencia aleatoria es la de Horario()
+    return np.stack([rng.integers(0, NOCHE + 1, size=forma, dtype=np.uint8)
+                     for _ in range(tamanio)])
+
+
+def inicializacion_con_libres(tamanio: int, forma: Tuple[int, int], prob_libre: float = 0.3,
+                              rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Población (tamanio, *forma) con días libres en proporción `prob_libre` y
+    el resto repartido entre Mañana, Tarde y Noche.
+    """
+    rng = obtener_generador(rng)
+    horarios = []
+    for _ in range(tamanio):
+        libre = rng.random(forma) < prob_libre
+        turnos = rng.integers(MANANA, NOCHE + 1, size=forma, dtype=np.uint8)
+        horarios.append(np.where(libre, np.uint8(LIBRE), turnos))
+    return np.stack(horarios)
+
+
+def seleccion_torneo_poblacion(aptitudes: np.ndarray, cantidad: int, k: int = 3,
+                               rng: np.random.Generator = None) -> np.ndarray:
+    """
+    `cantidad` torneos de tamaño k a la vez (mayor aptitud gana).
+    Los competidores se sortean con reposición. Retorna los índices ganadores.
+    """
+    rng = obtener_generador(rng)
+    candidatos = rng.integers(0, len(aptitudes), size=(cantidad, k))
+    ganador = np.argmax(aptitudes[candidatos], axis=1)
+    return candidatos[np.arange(cantidad), ganador]
+
+
+def cruce_uniforme_poblacion(padres1: np.ndarray, padres2: np.ndarray,
+                             rng: np.random.Generator = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Cruce uniforme por celda para cada pareja (padres1[i], padres2[i])."""
+    mascara = obtener_generador(rng).random(padres1.shape) < 0.5
+    return np.where(mascara, padres1, padres2), np.where(mascara, padres2, padres1)
+
+
+def cruce_columnas_poblacion(padres1: np.ndarray, padres2: np.ndarray,
+                             rng: np.random.Generator = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Cruce por días: cada día completo se intercambia entre los padres con probabilidad 0.5."""
+    num_parejas, _, num_dias = padres1.shape
+    intercambiar = obtener_generador(rng).random((num_parejas, 1, num_dias)) < 0.5
+    return np.where(intercambiar, padres2, padres1), np.where(intercambiar, padres1, padres2)
+
+
+def cruzar_poblacion(padres1: np.ndarray, padres2: np.ndarray, prob_cruce: float,
+                     operador: Callable = cruce_uniforme_poblacion,
+                     rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Cruza cada pareja con probabilidad `prob_cruce` (si no, los hijos son
+    copias de los padres). Retorna los hijos intercalados: hijo1 e hijo2 de
+    la pareja 0, luego los de la pareja 1, etc.
+    """
+    rng = obtener_generador(rng)
+    hijos1, hijos2 = operador(padres1, padres2, rng)
+    sin_cruce = rng.random(len(padres1)) >= prob_cruce
+    hijos1[sin_cruce] = padres1[sin_cruce]
+    hijos2[sin_cruce] = padres2[sin_cruce]
+    return np.stack([hijos1, hijos2], axis=1).reshape((-1,) + padres1.shape[1:])
+
+
+def mutacion_poblacion(genes: np.ndarray, prob_mutacion: float, num_turnos: int = 4,
+                       rng: np.random.Generator = None) -> np.ndarray:
+    """Cambia cada turno por uno al azar con probabilidad `prob_mutacion` (en el lugar)."""
+    rng = obtener_generador(rng)
+    mascara = rng.random(genes.shape) < prob_mutacion
+    genes[mascara] = rng.integers(0, num_turnos, size=np.count_nonzero(mascara), dtype=genes.dtype)
+    return mascara
+
+
+def reparar_noche_manana_poblacion(genes: np.ndarray, prob: float,
+                                   reemplazos: Sequence[int] = (LIBRE, TARDE, NOCHE),
+                                   rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Con probabilidad `prob` por horario, reemplaza cada Mañana que sigue a
+    una Noche por un turno al azar de `reemplazos` (en el lugar). Se repite
+    hasta que no quedan pares Noche→Mañana en los horarios elegidos, igual
+    que un recorrido día a día de cada horario.
+    Retorna los índices de los horarios reparados.
+    """
+    rng = obtener_generador(rng)
+    elegidos = np.flatnonzero(rng.random(len(genes)) < prob)
+    reemplazos = np.asarray(reemplazos, dtype=genes.dtype)
+
+    pendientes = elegidos
+    while len(pendientes):
+        sub = genes[pendientes]
+        violacion = (sub[:, :, :-1] == NOCHE) & (sub[:, :, 1:] == MANANA)
+        if not violacion.any():
+            break
+        destino = np.zeros(sub.shape, dtype=bool)
+        destino[:, :, 1:] = violacion
+        sub[destino] = rng.choice(reemplazos, size=np.count_nonzero(destino))
+        genes[pendientes] = sub
+        # Solo una Noche nueva puede crear otra violación
+        pendientes = pendientes[violacion.any(axis=(1, 2))]
+
+    return elegidos
@@ -0,0 +1,293 @@
+"""
+Modo multiobjetivo (NSGA-II): en lugar de sumar las restricciones blandas
+en una sola aptitud, cada una es un objetivo y una ejecución retorna el
+frente de Pareto (los horarios que no se pueden mejorar en un objetivo sin
+empeorar otro). El planificador elige después el compromiso entre
+preferencias, equidad y noches sin volver a ejecutar con otros pesos.
+
+    python pareto.py --motor ag --generaciones 300 --salida frente.json
+    python pareto.py problema.json --tiempo-maximo 30 --grafico frente.png
+
+Las restricciones duras no son un objetivo: un horario con menos
+penalización dura domina a cualquiera con más (dominancia con
+restricciones de Deb), así que el frente final es factible si el AG
+encontró horarios factibles.
+"""
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from graficos import nueva_figura, mostrar_o_guardar
+from instancia import InstanciaProblema
+from operadores import obtener_generador
+from restricciones import ConjuntoRestricciones, RESTRICCIONES_POR_DEFECTO
+from solucionador import EstrategiaGenetica, CriteriosParada, ESTRATEGIA_AG, MOTORES
+
+# ============================================
+# NSGA-II: ORDENAMIENTO NO DOMINADO Y HACINAMIENTO
+# ============================================
+
+
+def matriz_dominancia(objetivos: np.ndarray, duras: np.ndarray) -> np.ndarray:
+    """
+    (P, P) bool: domina[i, j] si i domina a j. Con menos penalización dura
+    se domina siempre; con la misma, i domina a j si no es peor en ningún
+    objetivo y es mejor en alguno (todos se minimizan).
+    """
+    no_peor = (objetivos[:, np.newaxis, :] <= objetivos[np.newaxis, :, :]).all(axis=2)
+    mejor = (objetivos[:, np.newaxis, :] < objetivos[np.newaxis, :, :]).any(axis=2)
+    misma_dura = duras[:, np.newaxis] == duras[np.newaxis, :]
+    return (duras[:, np.newaxis] < duras[np.newaxis, :]) | (misma_dura & no_peor & mejor)
+
+
+def ordenamiento_no_dominado(objetivos: np.ndarray, duras: np.ndarray) -> np.ndarray:
+    """Rango (P,) de cada individuo: 0 = primer frente (nadie lo domina), 1 = segundo..."""
+    domina = matriz_dominancia(objetivos, duras)
+    dominado_por = np.count_nonzero(domina, axis=0)
+    rangos = np.full(len(objetivos), -1)
+    frente = np.flatnonzero(dominado_por == 0)
+    rango = 0
+    while len(frente):
+        rangos[frente] = rango
+        dominado_por -= np.count_nonzero(domina[frente], axis=0)
+        frente = np.flatnonzero((dominado_por == 0) & (rangos < 0))
+        rango += 1
+    return rangos
+
+
+def distancia_hacinamiento(objetivos: np.ndarray, rangos: np.ndarray) -> np.ndarray:
+    """
+    Distancia de hacinamiento (P,) dentro de cada frente: la suma, por
+    objetivo, del lado del hueco entre sus vecinos (normalizado). Los
+    extremos de cada frente tienen distancia infinita.
+    """
+    distancia = np.zeros(len(objetivos))
+    for rango in np.unique(rangos):
+        frente = np.flatnonzero(rangos == rango)
+        if len(frente) <= 2:
+            distancia[frente] = np.inf
+            continue
+        for valores in objetivos[frente].T:
+            orden = np.argsort(valores, kind='stable')
+            ordenados = valores[orden]
+            distancia[frente[orden[[0, -1]]]] = np.inf
+            amplitud = ordenados[-1] - ordenados[0]
+            if amplitud > 0:
+                distancia[frente[orden[1:-1]]] += (ordenados[2:] - ordenados[:-2]) / amplitud
+    return distancia
+
+
+def orden_nsga(objetivos: np.ndarray, duras: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(orden, rangos): índices de mejor a peor por rango y, a igual rango, mayor hacinamiento"""
+    rangos = ordenamiento_no_dominado(objetivos, duras)
+    distancia = distancia_hacinamiento(objetivos, rangos)
+    return np.lexsort((-distancia, rangos)), rangos
+
+
+# ============================================
+# FRENTE DE PARETO
+# ============================================
+
+
+@dataclass
+class FrentePareto:
+    """Horarios no dominados (sin objetivos repetidos) y datos de la ejecución"""
+    genes: np.ndarray           # (K, N, D)
+    duras: np.ndarray           # (K,)
+    objetivos: np.ndarray       # (K, M) penalización de cada objetivo
+    nombres: Tuple[str, ...]    # nombre de la restricción de cada objetivo
+    motivo_parada: str
+    generaciones: int = 0
+    evaluaciones: int = 0
+    segundos: float = 0.0
+
+    def __len__(self):
+        return len(self.genes)
+
+    def elegir(self, pesos: Dict[str, float] = None) -> int:
+        """
+        Índice del horario con menor suma ponderada de los objetivos (peso 1
+        para los que no se indican): el que habría elegido una ejecución
+        con esos pesos, sin volver a ejecutar.
+        """
+        pesos = pesos or {}
+        vector = np.array([pesos.get(nombre, 1.0) for nombre in self.nombres])
+        return int(np.lexsort((self.objetivos @ vector, self.duras))[0])
+
+    def como_dicts(self) -> List[Dict]:
+        return [dict({'penalizacion_dura': dura.item()},
+                     **{nombre: valor.item() for nombre, valor in zip(self.nombres, objetivos)})
+                for dura, objetivos in zip(self.duras, self.objetivos)]
+
+
+def _objetivos(restricciones: ConjuntoRestricciones, genes: np.ndarray, instancia: InstanciaProblema,
+               nombres: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(duras (P,), objetivos (P, M)) de una población"""
+    penalizaciones = restricciones.penalizaciones(genes, instancia)
+    duras = sum((penalizaciones[r.nombre] for r in restricciones.duras), np.zeros(len(genes), dtype=np.int64))
+    objetivos = np.stack([np.asarray(penalizaciones[nombre], dtype=np.float64) for nombre in nombres], axis=1)
+    return duras, objetivos
+
+
+def resolver_pareto(instancia: InstanciaProblema,
+                    restricciones: ConjuntoRestricciones = None,
+                    estrategia: EstrategiaGenetica = None,
+                    objetivos: Sequence[str] = None,
+                    tamanio_poblacion: int = 100,
+                    num_generaciones: int = 300,
+                    rng: np.random.Generator = None,
+                    parada: CriteriosParada = None) -> FrentePareto:
+    """
+    NSGA-II con los operadores de `estrategia`. `objetivos` son nombres de
+    restricciones de `restricciones` (por defecto, todas las blandas); las
+    duras se suman y deciden la dominancia antes que los objetivos.
+
+    Cada generación se crean tamanio_poblacion hijos por torneo según el
+    orden NSGA-II (rango y hacinamiento) y sobreviven los mejores de padres e
+    hijos juntos. La paciencia de `parada` cuenta las generaciones sin
+    cambios en el primer frente.
+    """
+    rng = obtener_generador(rng)
+    restricciones = restricciones or RESTRICCIONES_POR_DEFECTO
+    estrategia = estrategia or ESTRATEGIA_AG
+    nombres = tuple(objetivos or (r.nombre for r in restricciones.blandas))
+    desconocidos = set(nombres) - {r.nombre for r in restricciones.restricciones}
+    if desconocidos:
+        raise ValueError(f"Objetivos desconocidos: {', '.join(sorted(desconocidos))}")
+
+    inicio = time.perf_counter()
+    genes = estrategia.crear_poblacion(tamanio_poblacion, instancia, restricciones, rng)
+    duras, valores = _objetivos(restricciones, genes, instancia, nombres)
+    evaluaciones = len(genes)
+    orden, rangos = orden_nsga(valores, duras)
+    genes, duras, valores, rangos = genes[orden], duras[orden], valores[orden], rangos[orden]
+
+    motivo = 'generaciones'
+    frente_anterior = None
+    sin_mejora = 0
+    generaciones = 0
+    for _ in range(num_generaciones):
+        frente = set(map(tuple, np.column_stack([duras, valores])[rangos == 0].tolist()))
+        if frente == frente_anterior:
+            sin_mejora += 1
+        else:
+            frente_anterior, sin_mejora = frente, 0
+        if parada is not None:
+            motivo = parada.motivo(time.perf_counter() - inicio, evaluaciones, sin_mejora) or motivo
+            if motivo != 'generaciones':
+                break
+
+        # La población está ordenada: el torneo por posición es la comparación de NSGA-II
+        hijos = estrategia.generar_hijos(genes, -np.arange(len(genes), dtype=np.float64),
+                                         tamanio_poblacion, rng)
+        duras_hijos, valores_hijos = _objetivos(restricciones, hijos, instancia, nombres)
+        evaluaciones += len(hijos)
+
+        genes = np.concatenate([genes, hijos])
+        duras = np.concatenate([duras, duras_hijos])
+        valores = np.concatenate([valores, valores_hijos])
+        orden, rangos = orden_nsga(valores, duras)
+        orden = orden[:tamanio_poblacion]
+        genes, duras, valores, rangos = genes[orden], duras[orden], valores[orden], rangos[orden]
+        generaciones += 1
+
+    # Primer frente sin objetivos repetidos, ordenado por el primer objetivo
+    primero = np.flatnonzero(rangos == 0)
+    _, unicos = np.unique(np.column_stack([duras[primero], valores[primero]]), axis=0, return_index=True)
+    primero = primero[unicos]
+    primero = primero[np.lexsort(valores[primero].T[::-1])]
+    return FrentePareto(genes[primero], duras[primero], valores[primero], nombres, motivo,
+                        generaciones=generaciones, evaluaciones=evaluaciones,
+                        segundos=time.perf_counter() - inicio)
+
+
+def graficar_frente(frente: FrentePareto, archivo: str = None):
+    """Frente de Pareto: los dos primeros objetivos y el tercero (si lo hay) como color"""
+    figura, ejes = nueva_figura(archivo)
+    x, y = frente.objetivos[:, 0], frente.objetivos[:, min(1, len(frente.nombres) - 1)]
+    if len(frente.nombres) > 2:
+        puntos = ejes.scatter(x, y, c=frente.objetivos[:, 2], cmap='viridis')
+        figura.colorbar(puntos, ax=ejes, label=frente.nombres[2])
+    else:
+        ejes.scatter(x, y)
+    ejes.set_xlabel(frente.nombres[0])
+    ejes.set_ylabel(frente.nombres[min(1, len(frente.nombres) - 1)])
+    ejes.set_title(f'Frente de Pareto ({len(frente)} horarios)')
+    ejes.grid(True, alpha=0.3)
+    mostrar_o_guardar(figura, archivo)
+
+
+# ============================================
+# LÍNEA DE COMANDOS
+# ============================================
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Frente de Pareto de las restricciones blandas (NSGA-II)')
+    parser.add_argument('problema', nargs='?',
+                        help='Problema en JSON (formato de lote.py); sin él, la instancia por defecto')
+    parser.add_argument('--motor', choices=list(MOTORES), default='ag',
+                        help='Restricciones y operadores sin archivo de problema')
+    parser.add_argument('--objetivos', help='Restricciones a usar como objetivos, separadas por comas')
+    parser.add_argument('--poblacion', type=int, default=100)
+    parser.add_argument('--generaciones', type=int, default=300)
+    parser.add_argument('--tiempo-maximo', type=float)
+    parser.add_argument('--paciencia', type=int, help='Generaciones sin cambios en el frente antes de terminar')
+    parser.add_argument('--voraz', type=float, default=0.0,
+                        help='Fracción de la población inicial construida de forma voraz')
+    parser.add_argument('--semilla', type=int)
+    parser.add_argument('--salida', help='Archivo JSON donde guardar el frente')
+    parser.add_argument('--grafico', help='Archivo de imagen (.png, .svg...) con el frente')
+    opciones = parser.parse_args(argv)
+
+    if opciones.problema:
+        # Import local: solo se necesitan con un archivo de problema
+        from lote import problema_desde_dict
+        from main_2 import instancia_desde_enfermeras, restricciones_desde_configuracion
+        with open(opciones.problema, encoding='utf-8') as archivo:
+            _, config, enfermeras = problema_desde_dict(json.load(archivo))
+        instancia = instancia_desde_enfermeras(config, enfermeras)
+        restricciones = restricciones_desde_configuracion(config, enfermeras)
+        estrategia = MOTORES['main_2'][1]
+    else:
+        from algoritmo_genetico import INSTANCIA_POR_DEFECTO as instancia
+        restricciones, estrategia = MOTORES[opciones.motor]
+
+    frente = resolver_pareto(
+        instancia, restricciones, replace(estrategia, fraccion_voraz=opciones.voraz),
+        objetivos=opciones.objetivos.split(',') if opciones.objetivos else None,
+        tamanio_poblacion=opciones.poblacion, num_generaciones=opciones.generaciones,
+        rng=np.random.default_rng(opciones.semilla),
+        parada=CriteriosParada(tiempo_maximo=opciones.tiempo_maximo, paciencia=opciones.paciencia)
+    )
+
+    print(f"{len(frente)} horarios en el frente | {frente.generaciones} generaciones | "
+          f"{frente.segundos:.2f}s | {frente.motivo_parada}")
+    print('  '.join(f"{nombre:>12}" for nombre in ('dura',) + frente.nombres))
+    for dura, objetivos in zip(frente.duras, frente.objetivos):
+        print('  '.join(f"{valor:>12g}" for valor in (dura, *objetivos)))
+    print(f"Con los pesos actuales: horario {frente.elegir()}")
+
+    if opciones.salida:
+        with open(opciones.salida, 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'objetivos': list(frente.nombres),
+                'frente': [dict(valores, horario=genes.tolist())
+                           for valores, genes in zip(frente.como_dicts(), frente.genes)],
+                'generaciones': frente.generaciones,
+                'evaluaciones': frente.evaluaciones,
+                'segundos': frente.segundos,
+                'motivo_parada': frente.motivo_parada
+            }, archivo, indent=2, ensure_ascii=False)
+    if opciones.grafico:
+        graficar_frente(frente, opciones.grafico)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+# ============================================
+# PLANIFICADOR DE TRABAJOS (COLA + POOL DE PROCESOS)
+# ============================================
+
+
+# Error con que termina un trabajo cancelado antes de empezar
+ERROR_CANCELADO = 'Trabajo cancelado'
+
+
+class ColaLlena(Exception):
+    """La cola de trabajos pendientes alcanzó su capacidad máxima."""
+
+
+def _ejecutar_trabajo(funcion: Callable, trabajo_id: str, parametros: Dict,
+                      eventos, cancelados, tiempo_limite: Optional[float]):
+    """
+    Corre `funcion` en un proceso del pool. Le entrega dos callbacks:
+    `reportar(datos)` para enviar progreso al servidor y `debe_detenerse()`,
+    que retorna el motivo ('cancelado', 'tiempo_limite') si debe parar.
+    """
+    inicio = time.monotonic()
+
+    def reportar(datos: Dict):
+        eventos.put((trabajo_id, datos))
+
+    def debe_detenerse() -> Optional[str]:
+        if cancelados.get(trabajo_id):
+            return 'cancelado'
+        if tiempo_limite is not None and time.monotonic() - inicio > tiempo_limite:
+            return 'tiempo_limite'
+        return None
+
+    return funcion(reportar=reportar, debe_detenerse=debe_detenerse, **parametros)
+
+
+class PlanificadorTrabajos:
+    """
+    Ejecuta trabajos de CPU en un número fijo de procesos.
+
+    Como máximo `num_procesos` trabajos corren a la vez; el resto espera en
+    una cola FIFO de hasta `max_en_cola` elementos (más allá se lanza
+    ColaLlena). Los trabajos en cola se pueden cancelar de inmediato y los
+    que están corriendo reciben la orden a través de `debe_detenerse`.
+
+    Args:
+        funcion: Función a ejecutar; recibe los parámetros del trabajo más
+            `reportar` y `debe_detenerse`, y retorna el resultado
+        num_procesos: Trabajos simultáneos
+        max_en_cola: Trabajos que pueden esperar turno
+        tiempo_limite: Segundos máximos por trabajo (None = sin límite)
+        al_progreso: Callback (trabajo_id, datos) en el proceso del servidor
+        al_terminar: Callback (trabajo_id, resultado, error) al finalizar
+    """
+
+    def __init__(self, funcion: Callable, num_procesos: int = 2, max_en_cola: int = 8,
+                 tiempo_limite: Optional[float] = None,
+                 al_progreso: Callable = None, al_terminar: Callable = None):
+        self.funcion = funcion
+        self.num_procesos = num_procesos
+        self.max_en_cola = max_en_cola
+        self.tiempo_limite = tiempo_limite
+        self.al_progreso = al_progreso or (lambda trabajo_id, datos: None)
+        self.al_terminar = al_terminar or (lambda trabajo_id, resultado, error: None)
+
+        # Reentrante: un futuro que ya terminó corre su callback al agregarlo
+        self._lock = threading.RLock()
+        self._pendientes = deque()  # (trabajo_id, parametros, tiempo_limite)
+        self._en_ejecucion = set()
+
+        self._executor = ProcessPoolExecutor(max_workers=num_procesos)
+        self._manager = multiprocessing.Manager()
+        self._eventos = self._manager.Queue()
+        self._cancelados = self._manager.dict()
+
+        self._receptor = threading.Thread(target=self._recibir_eventos, daemon=True)
+        self._receptor.start()
+
+    # -------- API --------
+
+    def enviar(self, trabajo_id: str, parametros: Dict,
+               tiempo_limite: Optional[float] = None) -> int:
+        """
+        Encola un trabajo. Retorna su posición (0 = ya está corriendo).
+        Lanza ColaLlena si no hay lugar.
+        """
+        if self.tiempo_limite is not None:
+            tiempo_limite = min(tiempo_limite or self.tiempo_limite, self.tiempo_limite)
+
+        with self._lock:
+            if len(self._pendientes) >= self.max_en_cola:
+                raise ColaLlena(f"Hay {len(self._pendientes)} trabajos en espera")
+            self._pendientes.append((trabajo_id, parametros, tiempo_limite))
+            fallidos = self._despachar()
+            posicion = self._posicion(trabajo_id)
+
+        self._informar_fallidos(fallidos)
+        return posicion
+
+    def posicion(self, trabajo_id: str) -> Optional[int]:
+        """Posición en la cola (1 = el siguiente), 0 si corre, None si no existe."""
+        with self._lock:
+            return self._posicion(trabajo_id)
+
+    def cancelar(self, trabajo_id: str) -> bool:
+        """Cancela un trabajo en cola o en ejecución. Retorna False si no existe."""
+        with self._lock:
+            for pendiente in self._pendientes:
+                if pendiente[0] == trabajo_id:
+                    self._pendientes.remove(pendiente)
+                    break
+            else:
+                if trabajo_id not in self._en_ejecucion:
+                    return False
+                self._cancelados[trabajo_id] = True
+                return True
+
+        self.al_terminar(trabajo_id, None, ERROR_CANCELADO)
+        return True
+
+    def estadisticas(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'en_ejecucion': len(self._en_ejecucion),
+                'en_cola': len(self._pendientes),
+                'max_en_cola': self.max_en_cola,
+                'num_procesos': self.num_procesos
+            }
+
+    def cerrar(self):
+        """Cancela lo pendiente y detiene los procesos."""
+        with self._lock:
+            self._pendientes.clear()
+            for trabajo_id in self._en_ejecucion:
+                self._cancelados[trabajo_id] = True
+        self._executor.shutdown(wait=True)
+        self._manager.shutdown()
+
+    # -------- INTERNOS --------
+
+    def _posicion(self, trabajo_id: str) -> Optional[int]:
+        if trabajo_id in self._en_ejecucion:
+            return 0
+        for indice, (pendiente_id, _, _) in enumerate(self._pendientes):
+            if pendiente_id == trabajo_id:
+                return indice + 1
+        return None
+
+    def _despachar(self):
+        """
+        Lanza trabajos de la cola mientras haya procesos libres (con el lock
+        tomado). Retorna los (trabajo_id, error) que no se pudieron lanzar.
+        """
+        fallidos = []
+        while self._pendientes and len(self._en_ejecucion) < self.num_procesos:
+            trabajo_id, parametros, tiempo_limite = self._pendientes.popleft()
+            try:
+                futuro = self._lanzar(trabajo_id, parametros, tiempo_limite)
+            except Exception as e:
+                fallidos.append((trabajo_id, str(e) or e.__class__.__name__))
+                continue
+
+            self._en_ejecucion.add(trabajo_id)
+            self.al_progreso(trabajo_id, {'estado': 'ejecutando'})
+            futuro.add_done_callback(
+                lambda futuro, trabajo_id=trabajo_id: self._terminado(trabajo_id, futuro)
+            )
+        return fallidos
+
+    def _lanzar(self, trabajo_id: str, parametros: Dict, tiempo_limite: Optional[float]):
+        argumentos = (_ejecutar_trabajo, self.funcion, trabajo_id, parametros,
+                      self._eventos, self._cancelados, tiempo_limite)
+        try:
+            return self._executor.submit(*argumentos)
+        except BrokenProcessPool:
+            # Murió un proceso (p. ej. sin memoria): el pool ya no acepta trabajos, se reemplaza
+            self._executor.shutdown(wait=False)
+            self._executor = ProcessPoolExecutor(max_workers=self.num_procesos)
+            return self._executor.submit(*argumentos)
+
+    def _terminado(self, trabajo_id: str, futuro):
+        try:
+            resultado, error = futuro.result(), None
+        except BrokenProcessPool:
+            resultado, error = None, 'El proceso del trabajo terminó de forma inesperada'
+        except Exception as e:
+            resultado, error = None, str(e) or e.__class__.__name__
+
+        with self._lock:
+            self._en_ejecucion.discard(trabajo_id)
+            self._cancelados.pop(trabajo_id, None)
+            fallidos = self._despachar()
+
+        self.al_terminar(trabajo_id, resultado, error)
+        self._informar_fallidos(fallidos)
+
+    def _informar_fallidos(self, fallidos):
+        for trabajo_id, error in fallidos:
+            self.al_terminar(trabajo_id, None, error)
+
+    def _recibir_eventos(self):
+        while True:
+            try:
+                trabajo_id, datos = self._eventos.get()
+            except (EOFError, OSError):
+                return  # Manager cerrado
+            self.al_progreso(trabajo_id, datos)
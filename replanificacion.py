@@ -0,0 +1,128 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Iterable, Mapping, Tuple
+
+from instancia import InstanciaProblema
+from operadores import LIBRE, obtener_generador, mutacion_poblacion
+
+# ============================================
+# REPLANIFICACIÓN DESDE UN HORARIO EXISTENTE
+# ============================================
+#
+# Cuando cambia algo a mitad de mes (una enfermera se enferma) no se vuelve
+# a empezar desde genes al azar: se fijan los días pasados, las celdas
+# bloqueadas y las ausencias, y el AG solo reoptimiza la ventana afectada
+# partiendo de una población sembrada con el horario vigente.
+
+
+@dataclass
+class CeldasFijas:
+    """Celdas (enfermera, día) que el AG no puede cambiar y el turno que deben tener"""
+    mascara: np.ndarray  # (N, D) bool, True = fija
+    valores: np.ndarray  # (N, D) turnos (solo cuentan las celdas fijas)
+
+    def aplicar(self, genes: np.ndarray) -> np.ndarray:
+        """Impone las celdas fijas en un horario (N, D) o una población (P, N, D), en el lugar"""
+        genes[..., self.mascara] = self.valores[self.mascara]
+        return genes
+
+    @property
+    def libres(self) -> int:
+        return int(np.count_nonzero(~self.mascara))
+
+
+def congelar(horario: np.ndarray, desde_dia: int = 0, hasta_dia: int = None,
+             bloqueadas: Iterable[Tuple[int, int]] = (),
+             ausencias: Mapping[int, Iterable[int]] = None) -> CeldasFijas:
+    """
+    Celdas fijas para replanificar `horario` solo en los días
+    [desde_dia, hasta_dia) (hasta el final si hasta_dia es None).
+
+    Fuera de la ventana todo queda como está; dentro, quedan además fijas
+    las celdas `bloqueadas` ((enfermera, día) con su turno actual) y las
+    `ausencias` ({enfermera: días}), que pasan a Libre.
+    Lanza ValueError si la ventana o alguna celda queda fuera del horario.
+    """
+    valores = np.array(horario, dtype=np.uint8)
+    num_enfermeras, num_dias = valores.shape
+    hasta_dia = num_dias if hasta_dia is None else hasta_dia
+    if not 0 <= desde_dia < hasta_dia <= num_dias:
+        raise ValueError(f"Ventana inválida [{desde_dia}, {hasta_dia}) para {num_dias} días")
+
+    mascara = np.ones(valores.shape, dtype=bool)
+    mascara[:, desde_dia:hasta_dia] = False
+    for enfermera, dia in bloqueadas:
+        enfermera, dia = _validar_celda('bloqueada', enfermera, dia, num_enfermeras, num_dias)
+        mascara[enfermera, dia] = True
+    for enfermera, dias in (ausencias or {}).items():
+        celdas = [_validar_celda('de ausencia', enfermera, dia, num_enfermeras, num_dias) for dia in dias]
+        for enfermera, dia in celdas:
+            mascara[enfermera, dia] = True
+            valores[enfermera, dia] = LIBRE
+    return CeldasFijas(mascara, valores)
+
+
+def _validar_celda(tipo: str, enfermera, dia, num_enfermeras: int, num_dias: int) -> Tuple[int, int]:
+    """(enfermera, dia) como enteros; ValueError si la celda está fuera del horario"""
+    enfermera, dia = int(enfermera), int(dia)
+    if not (0 <= enfermera < num_enfermeras and 0 <= dia < num_dias):
+        raise ValueError(f"Celda {tipo} ({enfermera}, {dia}) fuera del horario de "
+                         f"{num_enfermeras} enfermeras y {num_dias} días")
+    return enfermera, dia
+
+
+def poblacion_desde_horario(tamanio: int, fijas: CeldasFijas, prob_mutacion: float = 0.05,
+                            rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Población (tamanio, N, D) sembrada con el horario de `fijas`: el primer
+    individuo es el horario tal cual y el resto son copias con las celdas
+    libres mutadas con probabilidad `prob_mutacion`.
+    """
+    rng = obtener_generador(rng)
+    genes = np.repeat(fijas.valores[np.newaxis], tamanio, axis=0)
+    mutacion_poblacion(genes[1:], prob_mutacion, rng=rng)
+    return fijas.aplicar(genes)
+
+
+def replanificar(horario: np.ndarray, instancia: InstanciaProblema,
+                 desde_dia: int = 0, hasta_dia: int = None,
+                 bloqueadas: Iterable[Tuple[int, int]] = (),
+                 ausencias: Mapping[int, Iterable[int]] = None,
+                 motor: str = 'ag',
+                 tamanio_poblacion: int = 50,
+                 num_generaciones: int = 300,
+                 tiempo_maximo: float = 1.0,
+                 busqueda_local: int = 2,
+                 semilla: int = None,
+                 al_generar: Callable = None,
+                 debe_detenerse: Callable = None,
+                 estrategia=None,
+                 parada=None,
+                 **opciones):
+    """
+    Reoptimiza `horario` en la ventana [desde_dia, hasta_dia) con las
+    restricciones y operadores del `motor` (ver solucionador.MOTORES).
+
+    Se detiene a los `tiempo_maximo` segundos (None = sin límite) o al
+    completar `num_generaciones`; `parada` (CriteriosParada) reemplaza a
+    tiempo_maximo y `estrategia` a los operadores del motor. Las demás
+    `opciones` (num_procesos, tamanio_cache, instrumentacion) pasan al
+    Solucionador. Retorna el ResultadoSolucionador (la población final
+    ordenada, la mejor primero).
+    """
+    # Import local: solucionador depende de este módulo
+    from solucionador import Solucionador, BusquedaLocal, CriteriosParada, MOTORES
+
+    restricciones, estrategia_motor = MOTORES[motor]
+    fijas = congelar(horario, desde_dia, hasta_dia, bloqueadas, ausencias)
+    rng = np.random.default_rng(semilla)
+
+    with Solucionador(instancia, restricciones, estrategia or estrategia_motor, fijas=fijas,
+                      busqueda_local=BusquedaLocal(mejores=busqueda_local) if busqueda_local > 0 else None,
+                      **opciones) as solucionador:
+        genes = poblacion_desde_horario(tamanio_poblacion, fijas, rng=rng)
+        duras, blandas = solucionador.evaluar(genes)
+        return solucionador.resolver(tamanio_poblacion, num_generaciones, rng,
+                                     poblacion=(genes, duras, blandas), al_generar=al_generar,
+                                     debe_detenerse=debe_detenerse,
+                                     parada=parada or CriteriosParada(tiempo_maximo=tiempo_maximo))
@@ -0,0 +1,320 @@
+import numpy as np
+from abc import ABC, abstractmethod
+from functools import cached_property
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+from instancia import InstanciaProblema
+from instrumentacion import SIN_INSTRUMENTACION
+from operadores import LIBRE, MANANA, TARDE, NOCHE
+
+# ============================================
+# RESTRICCIONES DECLARATIVAS (EVALUACIÓN VECTORIZADA)
+# ============================================
+#
+# Cada restricción es un objeto con un nombre, un peso y un método que
+# calcula sus violaciones para un lote de horarios (P, num_enfermeras,
+# num_dias). Un ConjuntoRestricciones agrupa las duras y las blandas y se
+# usa directamente como evaluador (genes, instancia) -> (duras, blandas).
+
+TURNOS_TRABAJO = (MANANA, TARDE, NOCHE)
+
+
+def _longitud_rachas(trabajando: np.ndarray) -> np.ndarray:
+    """Para cada celda, días seguidos trabajados hasta ese día (inclusive)."""
+    acumulado = np.cumsum(trabajando, axis=-1)
+    ultimo_libre = np.maximum.accumulate(np.where(trabajando, 0, acumulado), axis=-1)
+    return acumulado - ultimo_libre
+
+
+def desviacion_desde_momentos(n: int, suma, suma_cuadrados):
+    """
+    Desviación estándar poblacional a partir de la suma y la suma de cuadrados.
+    Con conteos enteros el cálculo es exacto hasta la división final, así que
+    la versión escalar y la vectorizada obtienen exactamente el mismo valor.
+    """
+    return np.sqrt((n * suma_cuadrados - suma * suma) / (n * n))
+
+
+def desviacion_conteos(conteos, axis: int = -1):
+    """Desviación estándar poblacional (como np.std) de conteos enteros."""
+    conteos = np.asarray(conteos, dtype=np.int64)
+    return desviacion_desde_momentos(conteos.shape[axis],
+                                     conteos.sum(axis=axis),
+                                     (conteos * conteos).sum(axis=axis))
+
+
+class ContextoEvaluacion:
+    """
+    Arreglos derivados de un lote de horarios que comparten varias
+    restricciones (celdas trabajadas, personal por turno, noches por
+    enfermera...). Cada uno se calcula la primera vez que se pide.
+    """
+
+    def __init__(self, genes: np.ndarray, instancia: InstanciaProblema):
+        self.genes = genes
+        self.instancia = instancia
+        self._en_turno: Dict[int, np.ndarray] = {}
+        self._personal: Dict[int, np.ndarray] = {}
+
+    def en_turno(self, turno: int) -> np.ndarray:
+        """(P, N, D) bool: celdas asignadas a `turno`"""
+        if turno not in self._en_turno:
+            self._en_turno[turno] = self.genes == turno
+        return self._en_turno[turno]
+
+    def personal(self, turno: int) -> np.ndarray:
+        """(P, D): enfermeras asignadas a `turno` cada día"""
+        if turno not in self._personal:
+            self._personal[turno] = np.count_nonzero(self.en_turno(turno), axis=1)
+        return self._personal[turno]
+
+    @cached_property
+    def trabajando(self) -> np.ndarray:
+        return self.genes != LIBRE
+
+    @cached_property
+    def noches(self) -> np.ndarray:
+        return self.en_turno(NOCHE)
+
+    @cached_property
+    def dias_trabajados(self) -> np.ndarray:
+        """(P, N): días trabajados por cada enfermera"""
+        return np.count_nonzero(self.trabajando, axis=2)
+
+    @cached_property
+    def noches_por_enfermera(self) -> np.ndarray:
+        """(P, N): turnos de noche de cada enfermera"""
+        return np.count_nonzero(self.noches, axis=2)
+
+
+class Restriccion(ABC):
+    """
+    Restricción de la función de aptitud.
+
+    `violaciones` retorna un vector (P,) con la medida sin ponderar (cantidad
+    de violaciones, faltantes, desviación...); la penalización es esa medida
+    por `peso`, truncada a entero si `truncar` es verdadero.
+    """
+    nombre = ''
+    dura = True
+
+    def __init__(self, peso: float = 1, truncar: bool = False, nombre: str = None):
+        self.peso = peso
+        self.truncar = truncar
+        if nombre:
+            self.nombre = nombre
+
+    @abstractmethod
+    def violaciones(self, contexto: ContextoEvaluacion) -> np.ndarray:
+        ...
+
+    def penalizacion(self, contexto: ContextoEvaluacion) -> np.ndarray:
+        penalizacion = self.violaciones(contexto) * self.peso
+        return penalizacion.astype(np.int64) if self.truncar else penalizacion
+
+    def __repr__(self):
+        return f"{type(self).__name__}(nombre={self.nombre!r}, peso={self.peso!r})"
+
+
+# -------- RESTRICCIONES DURAS --------
+
+class NocheManana(Restriccion):
+    """Noche seguida de Mañana al día siguiente"""
+    nombre = 'noche_manana'
+
+    def violaciones(self, contexto):
+        return np.count_nonzero(contexto.noches[:, :, :-1] & contexto.en_turno(MANANA)[:, :, 1:],
+                                axis=(1, 2))
+
+
+class DiasConsecutivos(Restriccion):
+    """Cada día trabajado más allá de `maximo` días seguidos"""
+    nombre = 'dias_consecutivos'
+
+    def __init__(self, maximo: int = 6, **opciones):
+        super().__init__(**opciones)
+        self.maximo = maximo
+
+    def violaciones(self, contexto):
+        return np.count_nonzero(_longitud_rachas(contexto.trabajando) > self.maximo, axis=(1, 2))
+
+
+class EspecialistasPorTurno(Restriccion):
+    """
+    Turnos (día, Mañana/Tarde/Noche) con menos de `minimo` especialistas.
+    Con `solo_turnos_ocupados` no se cuentan los turnos sin nadie asignado.
+    """
+    nombre = 'especialistas'
+
+    def __init__(self, minimo: int = 1, solo_turnos_ocupados: bool = False, **opciones):
+        super().__init__(**opciones)
+        self.minimo = minimo
+        self.solo_turnos_ocupados = solo_turnos_ocupados
+
+    def violaciones(self, contexto):
+        especialistas = contexto.instancia.mascara_especialistas
+        total = np.zeros(len(contexto.genes), dtype=np.int64)
+        for turno in TURNOS_TRABAJO:
+            faltan = np.count_nonzero(contexto.en_turno(turno)[:, especialistas, :], axis=1) < self.minimo
+            if self.solo_turnos_ocupados:
+                faltan &= contexto.personal(turno) > 0
+            total += np.count_nonzero(faltan, axis=1)
+        return total
+
+
+class CoberturaMinima(Restriccion):
+    """Enfermeras que faltan para cubrir el mínimo de cada turno (Mañana, Tarde, Noche)"""
+    nombre = 'cobertura'
+
+    def __init__(self, minimos: Sequence[int] = (2, 2, 2), **opciones):
+        super().__init__(**opciones)
+        self.minimos = tuple(minimos)
+
+    def violaciones(self, contexto):
+        total = np.zeros(len(contexto.genes), dtype=np.int64)
+        for turno, minimo in zip(TURNOS_TRABAJO, self.minimos):
+            total += np.maximum(minimo - contexto.personal(turno), 0).sum(axis=1)
+        return total
+
+
+class MaxNoches(Restriccion):
+    """Noches por encima del máximo de cada enfermera (un entero o uno por enfermera)"""
+    nombre = 'max_noches'
+
+    def __init__(self, maximos: Union[int, Sequence[int]] = 8, **opciones):
+        super().__init__(**opciones)
+        self.maximos = maximos
+
+    def violaciones(self, contexto):
+        return np.maximum(contexto.noches_por_enfermera - np.asarray(self.maximos), 0).sum(axis=1)
+
+
+# -------- RESTRICCIONES BLANDAS --------
+
+class PreferenciasLibres(Restriccion):
+    """Días preferidos libres en los que la enfermera trabaja"""
+    nombre = 'preferencias'
+    dura = False
+
+    def violaciones(self, contexto):
+        return np.count_nonzero(contexto.trabajando & contexto.instancia.mascara_preferencias,
+                                axis=(1, 2))
+
+
+class EquidadCarga(Restriccion):
+    """Desviación estándar de los días trabajados entre enfermeras"""
+    nombre = 'equidad'
+    dura = False
+
+    def violaciones(self, contexto):
+        return desviacion_conteos(contexto.dias_trabajados)
+
+
+class DistribucionNoches(Restriccion):
+    """Desviación estándar de las noches entre enfermeras"""
+    nombre = 'noches'
+    dura = False
+
+    def violaciones(self, contexto):
+        return desviacion_conteos(contexto.noches_por_enfermera)
+
+
+# ============================================
+# CONJUNTO DE RESTRICCIONES (EVALUADOR)
+# ============================================
+
+class ConjuntoRestricciones:
+    """
+    Evaluador vectorizado compilado a partir de una lista de restricciones.
+
+    Se llama como cualquier evaluador: (genes, instancia) -> (duras, blandas),
+    las sumas de las penalizaciones de las restricciones duras y blandas. La
+    aptitud (mayor es mejor) es -(duras * peso_duras + blandas * peso_blandas)
+    y una solución es óptima si no tiene penalizaciones duras y las blandas
+    quedan por debajo de `umbral_optimo` (None = nunca se detiene antes).
+    """
+
+    def __init__(self, restricciones: Iterable[Restriccion], peso_duras: float = 100,
+                 peso_blandas: float = 1, umbral_optimo: Optional[float] = 20):
+        self.restricciones = tuple(restricciones)
+        nombres = [restriccion.nombre for restriccion in self.restricciones]
+        if len(set(nombres)) != len(nombres):
+            raise ValueError(f"Nombres de restricciones repetidos: {nombres}")
+        self.duras = tuple(r for r in self.restricciones if r.dura)
+        self.blandas = tuple(r for r in self.restricciones if not r.dura)
+        self.peso_duras = peso_duras
+        self.peso_blandas = peso_blandas
+        self.umbral_optimo = umbral_optimo
+
+    def __call__(self, genes: np.ndarray, instancia: InstanciaProblema,
+                 instrumentacion=None) -> Tuple[np.ndarray, np.ndarray]:
+        contexto = self._contexto(genes, instancia)
+        medir = (instrumentacion or SIN_INSTRUMENTACION).restriccion
+        totales = []
+        for grupo in (self.duras, self.blandas):
+            total = np.zeros(len(contexto.genes), dtype=np.int64)
+            for restriccion in grupo:
+                with medir(restriccion.nombre):
+                    total = total + restriccion.penalizacion(contexto)
+            totales.append(total)
+        return totales[0], totales[1]
+
+    def penalizaciones(self, genes: np.ndarray, instancia: InstanciaProblema) -> Dict[str, np.ndarray]:
+        """Penalización (P,) de cada restricción por separado"""
+        contexto = self._contexto(genes, instancia)
+        return {r.nombre: r.penalizacion(contexto) for r in self.restricciones}
+
+    def buscar(self, tipo: type) -> Optional[Restriccion]:
+        """La primera restricción de la clase `tipo` (o None)"""
+        return next((r for r in self.restricciones if isinstance(r, tipo)), None)
+
+    def aptitud(self, duras, blandas):
+        """Aptitud a partir de las penalizaciones (mayor es mejor)"""
+        return -(duras * self.peso_duras + blandas * self.peso_blandas)
+
+    def es_optima(self, dura, blanda) -> bool:
+        return self.umbral_optimo is not None and dura == 0 and blanda < self.umbral_optimo
+
+    @staticmethod
+    def _contexto(genes, instancia) -> ContextoEvaluacion:
+        genes = np.asarray(genes)
+        if genes.ndim == 2:
+            genes = genes[np.newaxis]
+        return ContextoEvaluacion(genes, instancia)
+
+    def __repr__(self):
+        return (f"ConjuntoRestricciones({list(self.restricciones)!r}, peso_duras={self.peso_duras!r}, "
+                f"peso_blandas={self.peso_blandas!r})")
+
+
+# Restricciones y pesos de algoritmo_genetico.calcular_aptitud
+RESTRICCIONES_POR_DEFECTO = ConjuntoRestricciones([
+    NocheManana(peso=50),
+    DiasConsecutivos(maximo=6, peso=30),
+    EspecialistasPorTurno(minimo=1, peso=40),
+    CoberturaMinima(minimos=(2, 2, 2), peso=20),
+    PreferenciasLibres(peso=5),
+    EquidadCarga(peso=3, truncar=True),
+    DistribucionNoches(peso=5, truncar=True),
+], peso_duras=100, peso_blandas=1, umbral_optimo=20)
+
+
+def crear_restricciones_turnos(min_enfermeras: Sequence[int] = (3, 3, 2), min_especialistas: int = 1,
+                               max_dias_consecutivos: int = 6,
+                               max_noches: Union[int, Sequence[int]] = 8,
+                               peso_dura: float = 1000.0,
+                               peso_blanda: float = 10.0) -> ConjuntoRestricciones:
+    """
+    Restricciones de main_2.Individuo.calcular_aptitud: cada violación vale
+    1 y las sumas se ponderan con peso_dura y peso_blanda (sin parada por
+    solución óptima).
+    """
+    return ConjuntoRestricciones([
+        NocheManana(),
+        DiasConsecutivos(maximo=max_dias_consecutivos),
+        EspecialistasPorTurno(minimo=min_especialistas, solo_turnos_ocupados=True),
+        CoberturaMinima(minimos=min_enfermeras),
+        MaxNoches(maximos=max_noches),
+        PreferenciasLibres(),
+        EquidadCarga(),
+    ], peso_duras=peso_dura, peso_blandas=peso_blanda, umbral_optimo=None)
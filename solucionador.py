@@ -0,0 +1,332 @@
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, List, Optional, Tuple
+
+from busqueda_local import BusquedaLocal
+from cache_aptitud import CacheAptitud
+from evaluacion_paralela import EvaluadorParalelo
+from instancia import InstanciaProblema
+from inicializacion import inicializacion_voraz
+from instrumentacion import SIN_INSTRUMENTACION
+from replanificacion import CeldasFijas
+from operadores import (LIBRE, TARDE, NOCHE, obtener_generador, inicializacion_uniforme,
+                        inicializacion_con_libres, seleccion_torneo_poblacion, cruce_uniforme_poblacion,
+                        cruce_columnas_poblacion, cruzar_poblacion, mutacion_poblacion,
+                        reparar_noche_manana_poblacion)
+from restricciones import ConjuntoRestricciones, RESTRICCIONES_POR_DEFECTO, crear_restricciones_turnos
+
+# ============================================
+# NÚCLEO ÚNICO DEL ALGORITMO GENÉTICO
+# ============================================
+#
+# algoritmo_genetico.py, main_2.py y la aplicación web ejecutan el mismo
+# bucle: un Solucionador con un ConjuntoRestricciones (qué se penaliza) y
+# una EstrategiaGenetica (cómo se crean los hijos).
+
+
+@dataclass
+class EstrategiaGenetica:
+    """
+    Operadores intercambiables del AG.
+
+    inicializar: (tamanio, forma, rng=) -> genes (tamanio, *forma)
+    seleccion: (aptitudes, cantidad, rng=) -> índices de los padres
+    cruce: (padres1, padres2, rng) -> (hijos1, hijos2)
+    Después del cruce se muta cada gen con `prob_mutacion` y se reparan los
+    pares Noche→Mañana de una fracción `prob_reparacion` de los hijos.
+    Una fracción `fraccion_voraz` de la población inicial se construye con
+    inicializacion_voraz (respetando las restricciones) y el resto con
+    `inicializar`.
+    """
+    inicializar: Callable = inicializacion_uniforme
+    seleccion: Callable = seleccion_torneo_poblacion
+    cruce: Callable = cruce_uniforme_poblacion
+    prob_cruce: float = 0.8
+    prob_mutacion: float = 0.02
+    prob_reparacion: float = 0.05
+    reemplazos_reparacion: Tuple[int, ...] = (LIBRE, TARDE, NOCHE)
+    elitismo: int = 2
+    fraccion_voraz: float = 0.0
+
+    def crear_poblacion(self, tamanio: int, instancia: InstanciaProblema,
+                        restricciones: ConjuntoRestricciones = None,
+                        rng: np.random.Generator = None) -> np.ndarray:
+        """Genes (tamanio, num_enfermeras, num_dias) de la población inicial"""
+        rng = obtener_generador(rng)
+        num_voraces = int(round(tamanio * self.fraccion_voraz))
+        partes = []
+        if num_voraces > 0:
+            partes.append(inicializacion_voraz(num_voraces, instancia, restricciones, rng=rng))
+        if num_voraces < tamanio:
+            partes.append(self.inicializar(tamanio - num_voraces,
+                                           (instancia.num_enfermeras, instancia.num_dias), rng=rng))
+        return np.concatenate(partes)
+
+    def generar_hijos(self, genes: np.ndarray, aptitudes: np.ndarray, num_hijos: int,
+                      rng: np.random.Generator = None, instrumentacion=None) -> np.ndarray:
+        """Selección, cruce, mutación y reparación de `num_hijos` hijos"""
+        rng = obtener_generador(rng)
+        instrumentacion = instrumentacion or SIN_INSTRUMENTACION
+        num_parejas = (num_hijos + 1) // 2
+        with instrumentacion.fase('seleccion'):
+            padres1 = genes[self.seleccion(aptitudes, num_parejas, rng=rng)]
+            padres2 = genes[self.seleccion(aptitudes, num_parejas, rng=rng)]
+
+        with instrumentacion.fase('cruce'):
+            hijos = cruzar_poblacion(padres1, padres2, self.prob_cruce, self.cruce, rng)[:num_hijos]
+        with instrumentacion.fase('mutacion'):
+            mutacion_poblacion(hijos, self.prob_mutacion, rng=rng)
+            reparar_noche_manana_poblacion(hijos, self.prob_reparacion, self.reemplazos_reparacion, rng)
+        return hijos
+
+
+# Operadores de algoritmo_genetico.py y de main_2.py
+ESTRATEGIA_AG = EstrategiaGenetica()
+ESTRATEGIA_TURNOS = EstrategiaGenetica(
+    inicializar=inicializacion_con_libres,
+    cruce=cruce_columnas_poblacion,
+    prob_mutacion=0.1,
+    prob_reparacion=0.1,
+    reemplazos_reparacion=(LIBRE, TARDE)
+)
+
+# Motores disponibles: nombre -> (restricciones, estrategia)
+MOTORES = {
+    'ag': (RESTRICCIONES_POR_DEFECTO, ESTRATEGIA_AG),
+    'main_2': (crear_restricciones_turnos(), ESTRATEGIA_TURNOS),
+}
+
+
+@dataclass
+class CriteriosParada:
+    """
+    Presupuestos para terminar antes de `num_generaciones` (None = sin límite).
+
+    tiempo_maximo: Segundos de ejecución
+    max_evaluaciones: Horarios evaluados (incluye los vecinos de la búsqueda local)
+    paciencia: Generaciones seguidas sin mejorar la mejor aptitud
+
+    Se revisan al comienzo de cada generación, así que una generación ya
+    empezada siempre termina.
+    """
+    tiempo_maximo: Optional[float] = None
+    max_evaluaciones: Optional[int] = None
+    paciencia: Optional[int] = None
+
+    def motivo(self, transcurrido: float, evaluaciones: int, sin_mejora: int) -> Optional[str]:
+        """Motivo de parada, o None si ningún presupuesto se agotó"""
+        if self.tiempo_maximo is not None and transcurrido >= self.tiempo_maximo:
+            return 'tiempo_agotado'
+        if self.max_evaluaciones is not None and evaluaciones >= self.max_evaluaciones:
+            return 'evaluaciones_agotadas'
+        if self.paciencia is not None and sin_mejora >= self.paciencia:
+            return 'estancamiento'
+        return None
+
+
+@dataclass
+class ResultadoSolucionador:
+    """Población final (ordenada, la mejor primero) e historial de una ejecución"""
+    genes: np.ndarray
+    duras: np.ndarray
+    blandas: np.ndarray
+    aptitudes: np.ndarray
+    motivo_parada: str
+    evaluaciones: int = 0
+    segundos: float = 0.0
+    mejor_aptitud_por_gen: List[float] = field(default_factory=list)
+    promedio_aptitud_por_gen: List[float] = field(default_factory=list)
+
+    @property
+    def generaciones(self) -> int:
+        return len(self.mejor_aptitud_por_gen)
+
+
+class Solucionador:
+    """
+    Ejecuta el AG sobre una instancia con las restricciones y operadores
+    indicados.
+
+    El evaluador se arma una sola vez: el de `restricciones` (o `evaluador`
+    si se pasa uno), repartido entre `num_procesos` procesos y envuelto en
+    un CacheAptitud si `tamanio_cache` > 0. Usar como contexto (o llamar a
+    cerrar()) para terminar los procesos de evaluación.
+
+    Con `busqueda_local` (ver busqueda_local.py) los mejores individuos se
+    mejoran con búsqueda local antes de cruzarse (AG memético). Con `fijas`
+    (ver replanificacion.py) esas celdas conservan su turno en todos los
+    individuos.
+    """
+
+    def __init__(self, instancia: InstanciaProblema,
+                 restricciones: ConjuntoRestricciones = None,
+                 estrategia: EstrategiaGenetica = None,
+                 num_procesos: int = 1,
+                 tamanio_cache: int = 0,
+                 evaluador: Callable = None,
+                 instrumentacion=None,
+                 busqueda_local: BusquedaLocal = None,
+                 fijas: CeldasFijas = None):
+        self.instancia = instancia
+        self.busqueda_local = busqueda_local
+        self.fijas = fijas
+        self.restricciones = restricciones or RESTRICCIONES_POR_DEFECTO
+        self.estrategia = estrategia or ESTRATEGIA_AG
+        self.instrumentacion = instrumentacion or SIN_INSTRUMENTACION
+        self.evaluaciones = 0
+
+        self._paralelo = None
+        if num_procesos > 1:
+            # Un evaluador propio corre en cada proceso: debe poder serializarse con pickle
+            self._paralelo = evaluador = EvaluadorParalelo(num_procesos, evaluador or self.restricciones)
+        elif evaluador is None:
+            if instrumentacion is not None:
+                evaluador = partial(self.restricciones, instrumentacion=instrumentacion)
+            else:
+                evaluador = self.restricciones
+        self.cache = CacheAptitud(tamanio_cache, evaluador) if tamanio_cache > 0 else None
+        self.evaluador = self.cache or evaluador
+
+    @classmethod
+    def desde_motor(cls, motor: str, instancia: InstanciaProblema, **opciones) -> 'Solucionador':
+        """Solucionador con las restricciones y operadores de MOTORES[motor]"""
+        if motor not in MOTORES:
+            raise ValueError(f"Motor desconocido: {motor} (opciones: {', '.join(MOTORES)})")
+        restricciones, estrategia = MOTORES[motor]
+        opciones.setdefault('estrategia', estrategia)
+        return cls(instancia, restricciones, **opciones)
+
+    def evaluar(self, genes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Penalizaciones (duras, blandas) de una población"""
+        with self.instrumentacion.fase('aptitud'):
+            duras, blandas = self.evaluador(genes, self.instancia)
+        self._contar(len(genes))
+        return duras, blandas
+
+    def _contar(self, evaluaciones: int):
+        self.evaluaciones += evaluaciones
+        self.instrumentacion.contar_evaluaciones(evaluaciones)
+
+    def resolver(self, tamanio_poblacion: int, num_generaciones: int,
+                 rng: np.random.Generator = None,
+                 poblacion: Tuple[np.ndarray, np.ndarray, np.ndarray] = None,
+                 al_generar: Callable = None,
+                 debe_detenerse: Callable[[], Optional[str]] = None,
+                 parada: CriteriosParada = None) -> ResultadoSolucionador:
+        """
+        Ejecuta hasta `num_generaciones` generaciones.
+
+        Args:
+            tamanio_poblacion: Individuos por generación
+            num_generaciones: Máximo de generaciones
+            rng: Generador de números aleatorios de la ejecución
+            poblacion: (genes, duras, blandas) de una población ya evaluada
+                desde la que continuar; None = población inicial nueva
+            al_generar: Llamada al comienzo de cada generación con
+                (generacion, genes, duras, blandas, aptitudes), la población
+                ordenada de mejor a peor
+            debe_detenerse: Retorna un motivo para terminar antes (o None)
+            parada: Presupuestos de tiempo, evaluaciones y paciencia
+
+        Returns:
+            ResultadoSolucionador con motivo_parada 'generaciones',
+            'solucion_optima', el de CriteriosParada.motivo o el que retornó
+            debe_detenerse
+        """
+        rng = obtener_generador(rng)
+        medir = self.instrumentacion
+        elitismo = self.estrategia.elitismo
+        inicio = time.perf_counter()
+        self.evaluaciones = 0
+        mejor_vista = -np.inf
+        sin_mejora = 0
+
+        if poblacion is None:
+            genes = self.estrategia.crear_poblacion(tamanio_poblacion, self.instancia,
+                                                    self.restricciones, rng)
+            if self.fijas is not None:
+                self.fijas.aplicar(genes)
+            duras, blandas = self.evaluar(genes)
+        else:
+            genes, duras, blandas = poblacion
+
+        resultado = ResultadoSolucionador(genes, duras, blandas, None, 'generaciones')
+
+        for generacion in range(num_generaciones):
+            # Ordenar por aptitud
+            with medir.fase('orden'):
+                aptitudes = self.restricciones.aptitud(duras, blandas)
+                orden = np.argsort(-aptitudes, kind='stable')
+                genes, duras, blandas, aptitudes = genes[orden], duras[orden], blandas[orden], aptitudes[orden]
+
+            with medir.fase('contabilidad'):
+                resultado.mejor_aptitud_por_gen.append(aptitudes[0].item())
+                resultado.promedio_aptitud_por_gen.append(np.mean(aptitudes))
+                if al_generar is not None:
+                    al_generar(generacion, genes, duras, blandas, aptitudes)
+
+                if aptitudes[0] > mejor_vista:
+                    mejor_vista, sin_mejora = aptitudes[0], 0
+                elif generacion > 0:
+                    sin_mejora += 1
+
+                # Condición de parada
+                motivo = None
+                if self.restricciones.es_optima(duras[0], blandas[0]):
+                    motivo = 'solucion_optima'
+                elif parada is not None:
+                    motivo = parada.motivo(time.perf_counter() - inicio, self.evaluaciones, sin_mejora)
+                if motivo is None and debe_detenerse is not None:
+                    motivo = debe_detenerse()
+                resultado.motivo_parada = motivo or resultado.motivo_parada
+
+            if resultado.motivo_parada != 'generaciones':
+                medir.cerrar_generacion()
+                break
+
+            # Etapa memética: búsqueda local sobre los mejores
+            if self.busqueda_local is not None and generacion % self.busqueda_local.cada == 0:
+                with medir.fase('busqueda_local'):
+                    self._contar(self.busqueda_local.mejorar_poblacion(
+                        genes, duras, blandas, self.instancia, self.restricciones, rng,
+                        fijas=None if self.fijas is None else self.fijas.mascara
+                    ))
+                    aptitudes = self.restricciones.aptitud(duras, blandas)
+                    orden = np.argsort(-aptitudes, kind='stable')
+                    genes, duras, blandas, aptitudes = genes[orden], duras[orden], blandas[orden], aptitudes[orden]
+
+            # Nueva generación: élite + hijos (evaluados todos de una vez)
+            hijos = self.estrategia.generar_hijos(genes, aptitudes, tamanio_poblacion - elitismo, rng, medir)
+            if self.fijas is not None:
+                self.fijas.aplicar(hijos)
+            duras_hijos, blandas_hijos = self.evaluar(hijos)
+
+            with medir.fase('contabilidad'):
+                genes = np.concatenate([genes[:elitismo], hijos])
+                duras = np.concatenate([duras[:elitismo], duras_hijos])
+                blandas = np.concatenate([blandas[:elitismo], blandas_hijos])
+            medir.cerrar_generacion()
+
+        # Población final ordenada
+        aptitudes = self.restricciones.aptitud(duras, blandas)
+        orden = np.argsort(-aptitudes, kind='stable')
+        resultado.genes, resultado.duras, resultado.blandas, resultado.aptitudes = (
+            genes[orden], duras[orden], blandas[orden], aptitudes[orden]
+        )
+        resultado.evaluaciones = self.evaluaciones
+        resultado.segundos = time.perf_counter() - inicio
+        return resultado
+
+    def cerrar(self):
+        """Termina los procesos de evaluación (si los hay)"""
+        if self._paralelo is not None:
+            self._paralelo.cerrar()
+            self._paralelo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
@@ -1,5 +1,6 @@
 let sessionId = null;
 let intervaloProgreso = null;
+let fuenteProgreso = null;
 let preferencias = [];
 
 // Actualizar valores de sliders
@@ -212,10 +213,20 @@ document.getElementById('formParametros').addEventListener('submit', async (e) =
         });
         
         const resultado = await response.json();
+        
+        // Servidor ocupado: la cola de ejecuciones está llena
+        if (response.status === 429) {
+            alert(resultado.error);
+            document.getElementById('areaProgreso').style.display = 'none';
+            document.getElementById('mensajeInicial').style.display = 'block';
+            document.getElementById('btnGenerar').disabled = false;
+            return;
+        }
+        
         sessionId = resultado.session_id;
         
         // Iniciar monitoreo de progreso
-        intervaloProgreso = setInterval(actualizarProgreso, 500);
+        monitorearProgreso();
         
     } catch (error) {
         console.error('Error:', error);
@@ -224,6 +235,30 @@ document.getElementById('formParametros').addEventListener('submit', async (e) =
     }
 });
 
+// Monitorear progreso: eventos del servidor (SSE) o consultas cada 500 ms si no hay soporte
+function monitorearProgreso() {
+    if (!window.EventSource) {
+        intervaloProgreso = setInterval(actualizarProgreso, 500);
+        return;
+    }
+    
+    fuenteProgreso = new EventSource(`/flujo_progreso/${sessionId}`);
+    fuenteProgreso.onmessage = (evento) => procesarProgreso(JSON.parse(evento.data));
+    fuenteProgreso.onerror = () => {
+        // Conexión perdida: seguir con consultas periódicas
+        detenerMonitoreo();
+        intervaloProgreso = setInterval(actualizarProgreso, 500);
+    };
+}
+
+function detenerMonitoreo() {
+    if (fuenteProgreso) {
+        fuenteProgreso.close();
+        fuenteProgreso = null;
+    }
+    clearInterval(intervaloProgreso);
+}
+
 // Actualizar progreso
 async function actualizarProgreso() {
     if (!sessionId) return;
@@ -231,39 +266,55 @@ async function actualizarProgreso() {
     try {
         const response = await fetch(`/obtener_progreso/${sessionId}`);
         const progreso = await response.json();
-        
-        if (progreso.error) {
-            clearInterval(intervaloProgreso);
-            alert('Error: ' + progreso.error);
-            document.getElementById('btnGenerar').disabled = false;
-            return;
-        }
-        
-        // Actualizar barra de progreso
-        const porcentaje = Math.round(progreso.porcentaje);
-        document.getElementById('barraProgreso').style.width = porcentaje + '%';
-        document.getElementById('barraProgreso').textContent = porcentaje + '%';
-        
-        // Actualizar métricas
-        document.getElementById('genActual').textContent = 
-            `${progreso.generacion_actual}/${progreso.total_generaciones}`;
-        document.getElementById('mejorAptitud').textContent = 
-            progreso.mejor_aptitud.toFixed(2);
-        document.getElementById('penDuras').textContent = progreso.penalizacion_dura;
-        document.getElementById('penBlandas').textContent = progreso.penalizacion_blanda;
-        
-        // Si completó, obtener resultados
-        if (progreso.completado) {
-            clearInterval(intervaloProgreso);
-            await mostrarResultados();
-            document.getElementById('btnGenerar').disabled = false;
-        }
-        
+        await procesarProgreso(progreso);
     } catch (error) {
         console.error('Error al obtener progreso:', error);
     }
 }
 
+async function procesarProgreso(progreso) {
+    if (progreso.error) {
+        detenerMonitoreo();
+        alert('Error: ' + progreso.error);
+        document.getElementById('btnGenerar').disabled = false;
+        return;
+    }
+    
+    // En espera de un proceso libre
+    if (progreso.estado === 'en_cola') {
+        document.getElementById('barraProgreso').style.width = '100%';
+        document.getElementById('barraProgreso').textContent =
+            `En cola (posición ${progreso.posicion_cola})`;
+        return;
+    }
+    
+    // Actualizar barra de progreso
+    const porcentaje = Math.round(progreso.porcentaje);
+    document.getElementById('barraProgreso').style.width = porcentaje + '%';
+    document.getElementById('barraProgreso').textContent = porcentaje + '%';
+    
+    // Actualizar métricas
+    document.getElementById('genActual').textContent = 
+        `${progreso.generacion_actual}/${progreso.total_generaciones}`;
+    document.getElementById('mejorAptitud').textContent = 
+        progreso.mejor_aptitud.toFixed(2);
+    document.getElementById('penDuras').textContent = progreso.penalizacion_dura;
+    document.getElementById('penBlandas').textContent = progreso.penalizacion_blanda;
+    
+    // Si completó, obtener resultados
+    if (progreso.completado) {
+        detenerMonitoreo();
+        await mostrarResultados();
+        document.getElementById('btnGenerar').disabled = false;
+    }
+}
+
+// Cancelar ejecución
+document.getElementById('btnCancelar').addEventListener('click', async () => {
+    if (!sessionId) return;
+    await fetch(`/cancelar/${sessionId}`, { method: 'POST' });
+});
+
 // Mostrar resultados finales
 async function mostrarResultados() {
     try {
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Los módulos del proyecto están en la raíz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instancia import InstanciaProblema  # noqa: E402
+
+
+@pytest.fixture
+def instancia():
+    """Instancia chica con especialistas y preferencias"""
+    return InstanciaProblema.crear(8, 14, especialistas=[0, 1, 2],
+                                   preferencias={0: [1, 2], 3: [5], 6: [10, 11, 12]})
+
+
+@pytest.fixture
+def poblacion(instancia):
+    """Horarios al azar (20, N, D)"""
+    rng = np.random.default_rng(1234)
+    return rng.integers(0, 4, size=(20, instancia.num_enfermeras, instancia.num_dias)).astype(np.uint8)
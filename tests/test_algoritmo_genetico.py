@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+import algoritmo_genetico as ag
+from restricciones import RESTRICCIONES_POR_DEFECTO
+
+
+def test_poblacion_igual_a_calcular_aptitud(instancia, poblacion):
+    duras, blandas = ag.calcular_penalizaciones_poblacion(poblacion, instancia)
+    for genes, dura, blanda in zip(poblacion, duras, blandas):
+        horario = ag.Horario(genes)
+        aptitud = ag.calcular_aptitud(horario, instancia)
+        assert (horario.penalizacion_dura, horario.penalizacion_blanda) == (dura, blanda)
+        assert aptitud == RESTRICCIONES_POR_DEFECTO.aptitud(dura, blanda)
+
+
+def test_poblacion_igual_a_calcular_aptitud_instancia_por_defecto():
+    instancia = ag.INSTANCIA_POR_DEFECTO
+    rng = np.random.default_rng(7)
+    genes = rng.integers(0, ag.NUM_TURNOS, size=(10, instancia.num_enfermeras, instancia.num_dias),
+                         dtype=ag.TIPO_GENES)
+    duras, blandas = ag.calcular_penalizaciones_poblacion(genes, instancia)
+    for i, horario in enumerate(genes):
+        individuo = ag.Horario(horario)
+        ag.calcular_aptitud(individuo, instancia)
+        assert (individuo.penalizacion_dura, individuo.penalizacion_blanda) == (duras[i], blandas[i])
+
+
+@pytest.mark.parametrize('forma', [(8, 14), (7, 3), (1, 1), (3, 5)])
+def test_empaquetar_poblacion_ida_y_vuelta(forma):
+    rng = np.random.default_rng(3)
+    genes = rng.integers(0, ag.NUM_TURNOS, size=(6,) + forma).astype(np.uint8)
+    empaquetado = ag.empaquetar_poblacion(genes)
+    assert empaquetado.shape == (6, -(-forma[0] * forma[1] // 4))
+    np.testing.assert_array_equal(ag.desempaquetar_poblacion(empaquetado, forma), genes)
+    # Cada fila coincide con el empaquetado de un solo horario
+    for fila, horario in zip(empaquetado, genes):
+        assert fila.tobytes() == ag.empaquetar_genes(horario)
+        np.testing.assert_array_equal(ag.desempaquetar_genes(fila.tobytes(), forma), horario)
+
+
+def test_misma_semilla_mismo_resultado(instancia):
+    resultados = [ag.algoritmo_genetico(30, 15, instancia=instancia, semilla=11, mostrar_progreso=False,
+                                        graficar=False, busqueda_local=1)
+                  for _ in range(2)]
+    np.testing.assert_array_equal(resultados[0].genes, resultados[1].genes)
+    assert resultados[0].aptitud == resultados[1].aptitud
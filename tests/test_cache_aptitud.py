@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from cache_aptitud import CacheAptitud
+from solucionador import MOTORES
+
+
+@pytest.mark.parametrize('motor', sorted(MOTORES))
+def test_con_y_sin_cache_dan_lo_mismo(motor, instancia, poblacion):
+    restricciones, _ = MOTORES[motor]
+    cache = CacheAptitud(100, restricciones)
+    # Con repetidos dentro del lote y entre llamadas (aciertos)
+    genes = np.concatenate([poblacion, poblacion[:5]])
+    esperado = restricciones(genes, instancia)
+
+    for _ in range(2):
+        obtenido = cache(genes, instancia)
+        for a, b in zip(obtenido, esperado):
+            assert a.dtype == b.dtype
+            np.testing.assert_array_equal(a, b)
+
+    metricas = cache.metricas()
+    assert metricas['fallos'] == len(poblacion)
+    assert metricas['aciertos'] == len(genes) * 2 - len(poblacion)
+
+
+def test_cache_de_un_horario(instancia, poblacion):
+    restricciones, _ = MOTORES['main_2']
+    cache = CacheAptitud(10, restricciones)
+    dura, blanda = cache(poblacion[0], instancia)
+    esperado = restricciones(poblacion[:1], instancia)
+    assert dura == esperado[0][0] and blanda == esperado[1][0]
+
+
+def test_cache_expulsa_lo_mas_antiguo(instancia, poblacion):
+    restricciones, _ = MOTORES['ag']
+    cache = CacheAptitud(5, restricciones)
+    cache(poblacion, instancia)
+    assert cache.metricas()['elementos'] == 5
+    assert cache.metricas()['expulsiones_lru'] == len(poblacion) - 5
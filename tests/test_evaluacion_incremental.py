@@ -0,0 +1,35 @@
+import numpy as np
+
+import algoritmo_genetico as ag
+from evaluacion_incremental import EvaluadorIncremental
+
+
+def _evaluar(genes, instancia):
+    horario = ag.Horario(genes)
+    ag.calcular_aptitud(horario, instancia)
+    return horario.penalizacion_dura, horario.penalizacion_blanda, horario.aptitud
+
+
+def test_cambios_sucesivos_igual_a_evaluar_de_nuevo(instancia, poblacion):
+    rng = np.random.default_rng(5)
+    evaluador = EvaluadorIncremental(poblacion[0], instancia)
+    for _ in range(300):
+        enfermera = int(rng.integers(instancia.num_enfermeras))
+        dia = int(rng.integers(instancia.num_dias))
+        evaluador.aplicar_cambios([(enfermera, dia, int(rng.integers(ag.NUM_TURNOS)))])
+        assert (evaluador.penalizacion_dura, evaluador.penalizacion_blanda,
+                evaluador.aptitud) == _evaluar(evaluador.genes, instancia)
+
+
+def test_probar_cambios_no_modifica_el_estado(instancia, poblacion):
+    evaluador = EvaluadorIncremental(poblacion[1], instancia)
+    genes, aptitud = evaluador.genes.copy(), evaluador.aptitud
+    cambios = [(0, 0, 3), (0, 1, 1), (4, 7, 0), (7, 13, 2)]
+
+    probada = evaluador.probar_cambios(cambios)
+    np.testing.assert_array_equal(evaluador.genes, genes)
+    assert evaluador.aptitud == aptitud
+
+    for enfermera, dia, turno in cambios:
+        genes[enfermera, dia] = turno
+    assert probada == _evaluar(genes, instancia)[2]
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+import algoritmo_genetico as ag
+from evaluacion_paralela import EvaluadorParalelo
+from solucionador import MOTORES
+
+
+@pytest.mark.parametrize('motor', sorted(MOTORES))
+def test_paralelo_igual_a_serial(motor, instancia, poblacion):
+    restricciones, _ = MOTORES[motor]
+    esperado = restricciones(poblacion, instancia)
+    with EvaluadorParalelo(3, restricciones) as evaluador:
+        obtenido = evaluador(poblacion, instancia)
+        # Menos horarios que procesos
+        pocos = evaluador(poblacion[:2], instancia)
+    for a, b in zip(obtenido, esperado):
+        np.testing.assert_array_equal(a, b)
+    for a, b in zip(pocos, restricciones(poblacion[:2], instancia)):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_evaluador_por_defecto(instancia, poblacion):
+    with EvaluadorParalelo(2) as evaluador:
+        obtenido = evaluador(poblacion, instancia)
+    for a, b in zip(obtenido, ag.calcular_penalizaciones_poblacion(poblacion, instancia)):
+        np.testing.assert_array_equal(a, b)
@@ -0,0 +1,47 @@
+import time
+import numpy as np
+import pytest
+
+from exacto import resolver_exacto, cpsat_disponible, sembrar_poblacion
+from instancia import InstanciaProblema
+from solucionador import MOTORES
+
+METODOS = ['ramificacion', pytest.param('cpsat', marks=pytest.mark.skipif(
+    not cpsat_disponible(), reason='OR-Tools no está instalado'))]
+
+
+@pytest.mark.parametrize('metodo', METODOS)
+@pytest.mark.parametrize('motor', sorted(MOTORES))
+def test_factible_sin_penalizacion_dura(motor, metodo):
+    instancia = InstanciaProblema.crear(10, 14, especialistas=range(5), preferencias={0: [3]})
+    restricciones, _ = MOTORES[motor]
+    resultado = resolver_exacto(instancia, restricciones, tiempo_maximo=10, metodo=metodo, semilla=1)
+    assert resultado.estado == 'factible'
+    duras, _ = restricciones(resultado.genes, instancia)
+    assert duras[0] == 0
+
+
+@pytest.mark.parametrize('metodo', METODOS)
+def test_infactible_sin_especialistas_suficientes(metodo):
+    # Tres especialistas no cubren los tres turnos de todos los días sin pasar de 6 seguidos
+    instancia = InstanciaProblema.crear(8, 14, especialistas=[0, 1, 2])
+    resultado = resolver_exacto(instancia, MOTORES['ag'][0], tiempo_maximo=10, metodo=metodo)
+    assert resultado.estado == 'infactible'
+
+
+def test_sembrar_poblacion_conserva_la_solucion():
+    instancia = InstanciaProblema.crear(10, 14, especialistas=range(5))
+    resultado = resolver_exacto(instancia, metodo='ramificacion')
+    poblacion = np.zeros((6, 10, 14), dtype=np.uint8)
+    sembrada = sembrar_poblacion(poblacion, resultado, rng=np.random.default_rng(0))
+    np.testing.assert_array_equal(sembrada[0], resultado.genes)
+
+
+@pytest.mark.parametrize('metodo', METODOS + ['auto'])
+def test_se_detiene_al_cancelar(metodo):
+    instancia = InstanciaProblema.crear(40, 28, especialistas=range(4))
+    inicio = time.perf_counter()
+    resultado = resolver_exacto(instancia, MOTORES['ag'][0], tiempo_maximo=30, metodo=metodo,
+                                debe_detenerse=lambda: 'cancelado')
+    assert resultado.estado == 'sin_solucion'
+    assert time.perf_counter() - inicio < 5
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from replanificacion import congelar
+
+
+@pytest.fixture
+def horario():
+    return np.random.default_rng(0).integers(0, 4, size=(5, 10)).astype(np.uint8)
+
+
+def test_congelar_fija_fuera_de_ventana_bloqueadas_y_ausencias(horario):
+    fijas = congelar(horario, 3, 6, bloqueadas=[(1, 4)], ausencias={2: [5]})
+    assert fijas.mascara[:, :3].all() and fijas.mascara[:, 6:].all()
+    assert fijas.mascara[1, 4] and fijas.mascara[2, 5]
+    assert fijas.valores[2, 5] == 0
+    assert not fijas.mascara[0, 4]
+
+
+@pytest.mark.parametrize('argumentos', [
+    {'desde_dia': 6, 'hasta_dia': 3},
+    {'hasta_dia': 11},
+    {'bloqueadas': [(-1, 2)]},
+    {'bloqueadas': [(5, 2)]},
+    {'bloqueadas': [(0, 10)]},
+    {'ausencias': {0: [-1]}},
+    {'ausencias': {7: [2]}},
+])
+def test_congelar_rechaza_celdas_fuera_del_horario(horario, argumentos):
+    with pytest.raises(ValueError):
+        congelar(horario, **argumentos)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from busqueda_local import BusquedaLocal
+from solucionador import Solucionador, CriteriosParada, MOTORES
+
+
+def _resolver(motor, instancia, semilla, **opciones):
+    with Solucionador.desde_motor(motor, instancia, busqueda_local=BusquedaLocal(mejores=1),
+                                  **opciones) as solucionador:
+        return solucionador.resolver(30, 12, np.random.default_rng(semilla))
+
+
+@pytest.mark.parametrize('motor', sorted(MOTORES))
+def test_misma_semilla_mismo_resultado(motor, instancia):
+    primero, segundo = _resolver(motor, instancia, 21), _resolver(motor, instancia, 21)
+    np.testing.assert_array_equal(primero.genes, segundo.genes)
+    np.testing.assert_array_equal(primero.aptitudes, segundo.aptitudes)
+    assert primero.mejor_aptitud_por_gen == segundo.mejor_aptitud_por_gen
+
+
+@pytest.mark.parametrize('motor', sorted(MOTORES))
+def test_paralelo_y_cache_no_cambian_el_resultado(motor, instancia):
+    serial = _resolver(motor, instancia, 4)
+    paralelo = _resolver(motor, instancia, 4, num_procesos=2, tamanio_cache=200)
+    np.testing.assert_array_equal(serial.genes, paralelo.genes)
+    np.testing.assert_array_equal(serial.aptitudes, paralelo.aptitudes)
+
+
+def test_poblacion_ordenada_y_evaluada(instancia):
+    with Solucionador.desde_motor('ag', instancia) as solucionador:
+        resultado = solucionador.resolver(20, 5, np.random.default_rng(0),
+                                          parada=CriteriosParada(max_evaluaciones=10 ** 6))
+        duras, blandas = solucionador.restricciones(resultado.genes, instancia)
+    np.testing.assert_array_equal(duras, resultado.duras)
+    np.testing.assert_array_equal(blandas, resultado.blandas)
+    assert list(resultado.aptitudes) == sorted(resultado.aptitudes, reverse=True)